@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프라인 행정구역(시/군/구, 동) 일괄 매핑
+- 로컬 행정동 경계 GeoJSON 로드 (예: HangJeongDong_ver*.geojson, adm_nm = "서울특별시 종로구 사직동")
+- 폴리곤 bbox 를 격자에 등록 → 격자 후보만 NumPy 레이캐스팅으로 point-in-polygon 판정
+- 반올림 좌표 기준 디스크 캐시 → 반복 스냅샷은 새 좌표만 계산
+- 카카오 coord2Address 를 점마다 순차 호출하던 지도 groupByAddress 대체용
+실행: python admin_boundary.py HangJeongDong.geojson room_250803.csv naver_final.csv
+"""
+
+import argparse, json, os, time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+NAME_PROPERTY = "adm_nm"
+CACHE_FILE = "admin_boundary_cache.csv"
+CACHE_DECIMALS = 5  # 약 1m
+GRID_DEG = 0.01  # 약 1km 격자
+POINT_BLOCK = 2_000  # 판정 시 한 번에 올리는 점 수 (점 × 변 행렬 크기 제한)
+ADMIN_COLUMNS = ["admin_sido", "admin_sigungu", "admin_dong"]
+COORD_COLUMNS = [("lat", "lng"), ("위도", "경도")]  # 33m2 / 네이버
+
+
+# 경계 로드 --------------------------------------------------------------------
+def split_admin_name(name: str) -> Tuple[str, str, str]:
+    """'경기도 수원시 장안구 파장동' → ('경기도', '수원시 장안구', '파장동')"""
+    parts = str(name).split()
+    if len(parts) < 2:
+        return (parts[0] if parts else "", "", "")
+    if len(parts) == 2:
+        return parts[0], parts[1], ""
+    return parts[0], " ".join(parts[1:-1]), parts[-1]
+
+
+def polygon_edges(geometry: Dict) -> np.ndarray:
+    """Polygon / MultiPolygon 의 모든 링을 (x1, y1, x2, y2) 변 배열로 변환 (구멍 포함, 짝홀 규칙)"""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return np.empty((0, 4))
+
+    edges = []
+    for rings in polygons:
+        for ring in rings:
+            pts = np.asarray(ring, dtype=float)[:, :2]
+            if len(pts) < 3:
+                continue
+            edges.append(np.hstack([pts, np.roll(pts, -1, axis=0)]))
+    return np.vstack(edges) if edges else np.empty((0, 4))
+
+
+class BoundaryIndex:
+    """행정동 폴리곤 + bbox 격자 인덱스"""
+
+    def __init__(self, geojson_path: str, name_property: str = NAME_PROPERTY):
+        with open(geojson_path, encoding="utf-8") as f:
+            features = json.load(f)["features"]
+
+        self.names: List[Tuple[str, str, str]] = []
+        self.edges: List[np.ndarray] = []
+        self.bboxes: List[Tuple[float, float, float, float]] = []
+        self.grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+        for feature in features:
+            edges = polygon_edges(feature.get("geometry") or {"type": None})
+            if not len(edges):
+                continue
+            pid = len(self.names)
+            self.names.append(split_admin_name(feature["properties"][name_property]))
+            self.edges.append(edges)
+
+            xs, ys = edges[:, [0, 2]], edges[:, [1, 3]]
+            bbox = (xs.min(), ys.min(), xs.max(), ys.max())
+            self.bboxes.append(bbox)
+            for gx in range(int(bbox[0] // GRID_DEG), int(bbox[2] // GRID_DEG) + 1):
+                for gy in range(int(bbox[1] // GRID_DEG), int(bbox[3] // GRID_DEG) + 1):
+                    self.grid[(gx, gy)].append(pid)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def contains(edges: np.ndarray, lng: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """레이캐스팅: 점 × 변 교차 수가 홀수면 내부"""
+        inside = np.zeros(len(lng), dtype=bool)
+        x1, y1, x2, y2 = (edges[:, i][None, :] for i in range(4))
+        for s in range(0, len(lng), POINT_BLOCK):
+            px = lng[s : s + POINT_BLOCK, None]
+            py = lat[s : s + POINT_BLOCK, None]
+            straddle = (y1 > py) != (y2 > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+            crossings = np.count_nonzero(straddle & (px < x_cross), axis=1)
+            inside[s : s + POINT_BLOCK] = crossings % 2 == 1
+        return inside
+
+    def assign(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        """점마다 폴리곤 id 반환 (미매칭 -1)"""
+        result = np.full(len(lat), -1, dtype=np.int64)
+        gx = np.floor(lng / GRID_DEG).astype(np.int64)
+        gy = np.floor(lat / GRID_DEG).astype(np.int64)
+
+        # 격자 셀별로 점을 모은 뒤, 셀에 걸친 폴리곤만 bbox → 레이캐스팅 순으로 판정
+        cell_df = pd.DataFrame({"gx": gx, "gy": gy})
+        for (cx, cy), idx in cell_df.groupby(["gx", "gy"]).indices.items():
+            for pid in self.grid.get((cx, cy), ()):
+                todo = idx[result[idx] < 0]
+                if not len(todo):
+                    break
+                x0, y0, x1, y1 = self.bboxes[pid]
+                px, py = lng[todo], lat[todo]
+                in_box = (px >= x0) & (px <= x1) & (py >= y0) & (py <= y1)
+                if not in_box.any():
+                    continue
+                cand = todo[in_box]
+                hit = self.contains(self.edges[pid], lng[cand], lat[cand])
+                result[cand[hit]] = pid
+        return result
+
+
+# 캐시 -------------------------------------------------------------------------
+class AdminCache:
+    """반올림 좌표 → 행정구역 디스크 캐시"""
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        if os.path.exists(path):
+            table = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+            for c in ("lat_r", "lng_r"):
+                table[c] = pd.to_numeric(table[c], errors="coerce")
+            table = table.dropna(subset=["lat_r", "lng_r"])
+            self.table = table.fillna("").reset_index(drop=True)
+        else:
+            self.table = pd.DataFrame(columns=["lat_r", "lng_r"] + ADMIN_COLUMNS)
+        self.added = 0
+
+    def resolve(self, lat: np.ndarray, lng: np.ndarray, index: BoundaryIndex):
+        keys = pd.DataFrame(
+            {
+                "lat_r": np.round(lat, CACHE_DECIMALS),
+                "lng_r": np.round(lng, CACHE_DECIMALS),
+            }
+        )
+        uniq = keys.drop_duplicates()
+        known = uniq.merge(self.table, on=["lat_r", "lng_r"], how="left")
+        # 좌표 없는 행은 조회/캐시하지 않음 (빈 행정구역)
+        missing = known[ADMIN_COLUMNS[0]].isna() & known[["lat_r", "lng_r"]].notna().all(
+            axis=1
+        )
+
+        if missing.any():
+            todo = known.loc[missing, ["lat_r", "lng_r"]].reset_index(drop=True)
+            pids = index.assign(todo["lat_r"].to_numpy(), todo["lng_r"].to_numpy())
+            names = [index.names[p] if p >= 0 else ("", "", "") for p in pids]
+            todo[ADMIN_COLUMNS] = pd.DataFrame(names, columns=ADMIN_COLUMNS)
+            parts = [self.table, todo] if len(self.table) else [todo]
+            self.table = pd.concat(parts, ignore_index=True)
+            self.added += len(todo)
+
+        result = keys.merge(self.table, on=["lat_r", "lng_r"], how="left")
+        return result[ADMIN_COLUMNS].fillna("")
+
+    def save(self):
+        if self.added:
+            self.table.to_csv(self.path, index=False, encoding="utf-8-sig")
+
+
+# 메인 -------------------------------------------------------------------------
+def annotate_csv(path: str, index: BoundaryIndex, cache: AdminCache) -> str:
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    cols = next((c for c in COORD_COLUMNS if set(c) <= set(df.columns)), None)
+    if cols is None:
+        print(f"⚠️ {path}: 좌표 컬럼 없음 - 건너뜀")
+        return ""
+
+    lat = pd.to_numeric(df[cols[0]], errors="coerce").to_numpy(float)
+    lng = pd.to_numeric(df[cols[1]], errors="coerce").to_numpy(float)
+    admin = cache.resolve(lat, lng, index)
+    df[ADMIN_COLUMNS] = admin.fillna("").to_numpy()
+
+    output = os.path.splitext(path)[0] + "_admin.csv"
+    df.to_csv(output, index=False, encoding="utf-8-sig")
+    matched = (df["admin_dong"] != "").sum()
+    print(
+        f"📍 {os.path.basename(path)}: {len(df):,}행 중 {matched:,}행 매핑 → {output}"
+    )
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 행정구역 일괄 매핑")
+    parser.add_argument("boundary", help="행정동 경계 GeoJSON")
+    parser.add_argument("csvs", nargs="+", help="room/reservation/네이버 CSV")
+    parser.add_argument("--name-property", default=NAME_PROPERTY)
+    parser.add_argument("--cache", default=CACHE_FILE)
+    args = parser.parse_args()
+
+    t0 = time.time()
+    index = BoundaryIndex(args.boundary, args.name_property)
+    cache = AdminCache(args.cache)
+    print(
+        f"🗺️ 경계 {len(index):,}개 | 캐시 좌표 {len(cache.table):,}개 ({time.time() - t0:.2f}초)"
+    )
+
+    for path in args.csvs:
+        annotate_csv(path, index, cache)
+
+    cache.save()
+    print(f"🧠 새로 계산한 좌표: {cache.added:,}개")
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지도 페이지용 컬럼형 바이너리 번들 export
+- CSV 전체 + Papa.parse(dynamicTyping) 대신, 화면에 쓰는 컬럼만 타입 배열로 저장
+- 숫자: Float32/Float64/Int32/Uint8 배열 그대로 (브라우저에서 new Float32Array(buf, offset, n))
+- 문자열: 사전(dictionary) 인코딩 → 코드 배열(Uint16/Uint32, 0 = 빈 값) + '\\0' 구분 UTF-8 문자열 테이블
+- 모든 버퍼를 8바이트 정렬로 이어 붙여 gzip 압축 (<name>.bin.gz), 위치/타입은 <name>.manifest.json
+실행: python binary_export.py room ../next/public/room/room_250803.csv
+      python binary_export.py naver naver_20250808_035438_final.csv
+"""
+
+import argparse, gzip, json, os, time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+OUTPUT_DIR = "../next/public/bundle"
+ALIGN = 8
+
+# 지도(HybridMap / PremiumMap / ProfitMap)가 실제로 읽는 컬럼만 유지
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "room": {
+        "rid": "u4",
+        "room_name": "str",
+        "province": "str",
+        "town": "str",
+        "addr_street": "str",
+        "using_fee": "f4",
+        "pyeong_size": "f4",
+        "room_cnt": "u1",
+        "bathroom_cnt": "u1",
+        "cookroom_cnt": "u1",
+        "sittingroom_cnt": "u1",
+        "longterm_discount_per": "f4",
+        "early_discount_per": "f4",
+        "occupancy_rate_percent": "f4",
+        "lat": "f4",
+        "lng": "f4",
+    },
+    "naver": {
+        "매물ID": "f8",
+        "매물제목": "str",
+        "층수정보": "str",
+        "주소": "str",
+        "건물명": "str",
+        "위도": "f4",
+        "경도": "f4",
+        "보증금": "f4",
+        "월세": "f4",
+        "전용면적": "f4",
+        "동일주소매물수": "u1",
+        "동일주소_최대보증금": "f4",
+        "동일주소_최대월세": "f4",
+        "동일주소_최소보증금": "f4",
+        "동일주소_최소월세": "f4",
+    },
+}
+SCHEMAS["reservation"] = SCHEMAS["room"]
+
+
+# 인코딩 -----------------------------------------------------------------------
+def encode_numeric(series: pd.Series, dtype: str) -> np.ndarray:
+    values = pd.to_numeric(series, errors="coerce")
+    if dtype.startswith("f"):
+        return values.to_numpy(dtype=dtype)  # 결측 → NaN
+    return values.fillna(0).to_numpy().astype(dtype)
+
+
+def encode_strings(series: pd.Series) -> Tuple[np.ndarray, bytes, int]:
+    """(코드 배열, 문자열 테이블, 사전 크기) — 코드 0 은 빈 값"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    codes = codes + 1
+    dtype = np.uint16 if len(uniques) < 0xFFFF else np.uint32
+    table = "\0".join(str(u).replace("\0", "") for u in uniques).encode("utf-8")
+    return codes.astype(dtype), table, len(uniques)
+
+
+def build_bundle(df: pd.DataFrame, schema: Dict[str, str]) -> Tuple[bytes, List[Dict]]:
+    buffers: List[bytes] = []
+    columns: List[Dict] = []
+    offset = 0
+
+    def push(data: bytes) -> Tuple[int, int]:
+        nonlocal offset
+        start = offset
+        pad = (-len(data)) % ALIGN
+        buffers.append(data + b"\0" * pad)
+        offset += len(data) + pad
+        return start, len(data)
+
+    for name, dtype in schema.items():
+        if name not in df.columns:
+            continue
+        if dtype == "str":
+            codes, table, size = encode_strings(df[name])
+            start, length = push(codes.tobytes())
+            t_start, t_length = push(table)
+            columns.append(
+                {
+                    "name": name,
+                    "type": str(codes.dtype),
+                    "offset": start,
+                    "length": length,
+                    "dictionary": {"offset": t_start, "length": t_length, "size": size},
+                }
+            )
+        else:
+            arr = encode_numeric(df[name], dtype)
+            start, length = push(arr.astype(arr.dtype.newbyteorder("<")).tobytes())
+            columns.append(
+                {
+                    "name": name,
+                    "type": str(arr.dtype),
+                    "offset": start,
+                    "length": length,
+                }
+            )
+    return b"".join(buffers), columns
+
+
+def read_bundle(manifest_path: str) -> pd.DataFrame:
+    """번들 → DataFrame (검증 및 파이썬 분석용)"""
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    bin_path = os.path.join(os.path.dirname(manifest_path), manifest["file"])
+    with gzip.open(bin_path, "rb") as f:
+        blob = f.read()
+
+    data = {}
+    for col in manifest["columns"]:
+        arr = np.frombuffer(
+            blob,
+            dtype=np.dtype(col["type"]).newbyteorder("<"),
+            count=manifest["rows"],
+            offset=col["offset"],
+        )
+        if "dictionary" in col:
+            d = col["dictionary"]
+            raw = blob[d["offset"] : d["offset"] + d["length"]].decode("utf-8")
+            words = np.array(
+                [None] + (raw.split("\0") if d["size"] else []), dtype=object
+            )
+            arr = words[arr]
+        data[col["name"]] = arr
+    return pd.DataFrame(data)
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="지도용 컬럼형 바이너리 번들 export")
+    parser.add_argument("kind", choices=sorted(SCHEMAS))
+    parser.add_argument("csv")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--name", help="번들 이름 (기본: CSV 파일명)")
+    args = parser.parse_args()
+
+    schema = SCHEMAS[args.kind]
+    name = args.name or os.path.splitext(os.path.basename(args.csv))[0]
+
+    t0 = time.time()
+    header = pd.read_csv(args.csv, nrows=0, encoding="utf-8-sig").columns
+    df = pd.read_csv(
+        args.csv,
+        usecols=[c for c in schema if c in header],
+        dtype=str,
+        encoding="utf-8-sig",
+    )
+    csv_parse = time.time() - t0
+
+    blob, columns = build_bundle(df, schema)
+    os.makedirs(args.output_dir, exist_ok=True)
+    bin_file = f"{name}.bin.gz"
+    with gzip.open(os.path.join(args.output_dir, bin_file), "wb", compresslevel=9) as f:
+        f.write(blob)
+    manifest = {
+        "kind": args.kind,
+        "source": os.path.basename(args.csv),
+        "file": bin_file,
+        "rows": len(df),
+        "raw_bytes": len(blob),
+        "columns": columns,
+    }
+    manifest_path = os.path.join(args.output_dir, f"{name}.manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    t1 = time.time()
+    read_bundle(manifest_path)
+    bundle_parse = time.time() - t1
+
+    csv_size = os.path.getsize(args.csv)
+    bin_size = os.path.getsize(os.path.join(args.output_dir, bin_file))
+    print(f"📦 {name}: {len(df):,}행 × {len(columns)}컬럼")
+    print(
+        f"💾 CSV {csv_size / 1024:,.0f}KB → 번들 {bin_size / 1024:,.0f}KB ({csv_size / max(bin_size, 1):.1f}배 축소)"
+    )
+    print(f"⏱️ 파싱: CSV {csv_parse * 1000:.0f}ms → 번들 {bundle_parse * 1000:.0f}ms")
+    print(f"📁 저장 위치: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+건물 단위 엔티티 매칭 (네이버 ↔ 33m2)
+- 주소/건물명 정규화: 33m2 addr_lot = "시도 구 동 지번 건물명", 네이버 주소/매물제목/건물명
+- 33m2 방은 (동, 지번) 기준으로 정규 건물 id 부여
+- 정규 건물명의 문자 bigram 역색인 (동 단위 블로킹) → 네이버 매물마다 공유 bigram 수로 후보 추림
+- 건물명 자리에 지번이 들어온 매물은 (동, 지번)으로 직접 매칭
+- Dice 유사도 + 좌표 거리로 최종 판정, 미매칭 매물은 (동, 정규화 이름)으로 새 건물 id
+- 건물 테이블: 건물별 33m2 방 수/네이버 매물 수/평균 예약률/평균 요금/평균 월세
+실행: python building_resolver.py naver_20250808_final.csv reservation_4w_250808.csv
+"""
+
+import argparse, re, time, unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from proximity_join import haversine_m
+
+# 기본 설정 --------------------------------------------------------------------
+NGRAM = 2
+MIN_DICE = 0.5
+MAX_DISTANCE_M = 400.0
+BUILDING_FILE = "buildings.csv"
+MAPPING_FILE = "building_map.csv"
+GENERIC_WORDS = [
+    "도시형생활주택",
+    "주상복합",
+    "오피스텔",
+    "아파트",
+    "레지던스",
+    "빌딩",
+    "빌라",
+]
+LOT_PATTERN = re.compile(r"^산?\d+(-\d+)?$")
+DONG_PATTERN = re.compile(r".+(동|가|읍|면|리)$")
+WING_PATTERN = re.compile(r"([a-z]|\d+)동$")  # "102동", "A동"
+
+
+# 정규화 -----------------------------------------------------------------------
+def normalize_name(text) -> str:
+    if not isinstance(text, str):
+        return ""
+    s = unicodedata.normalize("NFKC", text).lower()
+    s = re.sub(r"\(.*?\)|\[.*?\]", "", s)
+    s = re.sub(r"[^0-9a-z가-힣]", "", s)
+    for word in GENERIC_WORDS:
+        s = s.replace(word, "")
+    return WING_PATTERN.sub("", s) if len(s) > 3 else s
+
+
+def ngrams(name: str, n: int = NGRAM) -> Set[str]:
+    if len(name) <= n:
+        return {name} if name else set()
+    return {name[i : i + n] for i in range(len(name) - n + 1)}
+
+
+def split_addr_lot(addr) -> Tuple[str, str, str]:
+    """'서울특별시 강남구 역삼동 823-26 강남역두산위브센티움' → (동, 지번, 건물명)"""
+    tokens = str(addr).split() if isinstance(addr, str) else []
+    for i, tok in enumerate(tokens):
+        if LOT_PATTERN.match(tok):
+            dong = tokens[i - 1] if i > 0 else ""
+            return dong, tok, " ".join(tokens[i + 1 :])
+    return "", "", ""
+
+
+def naver_dong(addr) -> str:
+    tokens = str(addr).split() if isinstance(addr, str) else []
+    for tok in reversed(tokens):
+        if DONG_PATTERN.match(tok):
+            return tok
+    return ""
+
+
+# 역색인 -----------------------------------------------------------------------
+class NgramIndex:
+    """(동, bigram) → 건물 id 목록"""
+
+    def __init__(self):
+        self.postings: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self.gram_count: Dict[int, int] = {}
+
+    def add(self, bid: int, dong: str, name: str):
+        grams = ngrams(name)
+        self.gram_count[bid] = len(grams)
+        for g in grams:
+            self.postings[(dong, g)].append(bid)
+
+    def best(self, dong: str, name: str) -> Tuple[Optional[int], float, List[int]]:
+        """(최고 후보, Dice, 동점 후보들)"""
+        grams = ngrams(name)
+        if not grams:
+            return None, 0.0, []
+        hits = Counter()
+        for g in grams:
+            hits.update(self.postings.get((dong, g), ()))
+        if not hits:
+            return None, 0.0, []
+        scored = [
+            (2 * shared / (len(grams) + self.gram_count[bid]), bid)
+            for bid, shared in hits.items()
+        ]
+        top = max(s for s, _ in scored)
+        return max(scored)[1], top, [bid for s, bid in scored if s == top]
+
+
+# 매칭 -------------------------------------------------------------------------
+def resolve(naver: pd.DataFrame, rooms: pd.DataFrame):
+    # 1) 33m2: (동, 지번) → 정규 건물
+    parsed = rooms["addr_lot"].map(split_addr_lot)
+    rooms = rooms.assign(
+        dong=[p[0] or t for p, t in zip(parsed, rooms["town"].fillna(""))],
+        lot=[p[1] for p in parsed],
+        name_norm=[normalize_name(p[2]) for p in parsed],
+    )
+    rooms["bkey"] = np.where(
+        rooms["lot"] != "",
+        rooms["dong"] + "|" + rooms["lot"],
+        rooms["dong"] + "|" + rooms["name_norm"],
+    )
+    codes, keys = pd.factorize(rooms["bkey"])
+    rooms["building_id"] = codes
+
+    buildings = (
+        rooms.groupby("building_id")
+        .agg(
+            dong=("dong", "first"),
+            lot=("lot", "first"),
+            town=("town", "first"),
+            name=("name_norm", lambda s: s.mode().iat[0] if len(s.mode()) else ""),
+            lat=("lat", "mean"),
+            lng=("lng", "mean"),
+        )
+        .reset_index()
+    )
+
+    # 지번 주소의 동(법정동)과 town 이 다를 수 있어 양쪽 블록에 모두 등록
+    index = NgramIndex()
+    for row in buildings.itertuples(index=False):
+        if not row.name:
+            continue
+        for dong in {row.dong, row.town if isinstance(row.town, str) else row.dong}:
+            index.add(row.building_id, dong, row.name)
+
+    # 2) 네이버: 매물제목/건물명 → 같은 동 블록에서 최고 Dice 후보
+    b_lat = buildings["lat"].to_numpy(float)
+    b_lng = buildings["lng"].to_numpy(float)
+    next_id = len(buildings)
+    new_keys: Dict[str, int] = {}
+    assigned, scores = [], []
+    n_lat = pd.to_numeric(naver["위도"], errors="coerce").to_numpy(float)
+    n_lng = pd.to_numeric(naver["경도"], errors="coerce").to_numpy(float)
+    titles = naver["매물제목"].map(normalize_name)
+    wings = naver.get("건물명", pd.Series("", index=naver.index)).map(normalize_name)
+    dongs = naver["주소"].map(naver_dong)
+
+    # 건물명 대신 지번이 들어온 매물은 (동, 지번) 직접 조회
+    by_lot = {
+        (row.dong, row.lot): row.building_id
+        for row in buildings.itertuples(index=False)
+        if row.lot
+    }
+    raw_wings = naver.get("건물명", pd.Series("", index=naver.index)).fillna("")
+
+    for i, (title, wing, dong) in enumerate(zip(titles, wings, dongs)):
+        bid, dice = None, 0.0
+        lot_bid = by_lot.get((dong, raw_wings.iat[i].strip()))
+        if lot_bid is not None:
+            bid, dice = lot_bid, 1.0
+        for name in (title, wing) if bid is None else ():
+            cand, score, ties = index.best(dong, name)
+            if cand is None or score < dice:
+                continue
+            if len(ties) > 1 and not np.isnan(n_lat[i]):
+                d = haversine_m(n_lat[i], n_lng[i], b_lat[ties], b_lng[ties])
+                cand = ties[int(np.argmin(d))]
+            bid, dice = cand, score
+        if bid is not None and not np.isnan(n_lat[i]):
+            if haversine_m(n_lat[i], n_lng[i], b_lat[bid], b_lng[bid]) > MAX_DISTANCE_M:
+                bid = None
+        if bid is None or dice < MIN_DICE:
+            key = f"{dong}|{title}"
+            if key not in new_keys:
+                new_keys[key] = next_id
+                next_id += 1
+            bid, dice = new_keys[key], 0.0
+        assigned.append(bid)
+        scores.append(round(dice, 3))
+
+    naver = naver.assign(building_id=assigned, match_score=scores, dong=dongs)
+    return naver, rooms, buildings
+
+
+def building_table(naver: pd.DataFrame, rooms: pd.DataFrame, buildings: pd.DataFrame):
+    num = lambda s: pd.to_numeric(s, errors="coerce")
+    room_agg = (
+        rooms.assign(
+            using_fee=num(rooms["using_fee"]),
+            occupancy_rate_percent=num(rooms.get("occupancy_rate_percent")),
+        )
+        .groupby("building_id")
+        .agg(
+            rooms=("rid", "nunique"),
+            avg_using_fee=("using_fee", "mean"),
+            avg_occupancy=("occupancy_rate_percent", "mean"),
+        )
+    )
+    naver_agg = (
+        naver.assign(월세=num(naver["월세"]), 보증금=num(naver["보증금"]))
+        .groupby("building_id")
+        .agg(
+            naver_listings=("매물ID", "nunique"),
+            avg_rent=("월세", "mean"),
+            avg_deposit=("보증금", "mean"),
+            naver_name=("매물제목", "first"),
+            naver_dong=("dong", "first"),
+            naver_lat=("위도", lambda s: num(s).mean()),
+            naver_lng=("경도", lambda s: num(s).mean()),
+        )
+    )
+    table = buildings.set_index("building_id").join(room_agg, how="outer")
+    table = table.join(naver_agg, how="outer")
+    table["name"] = table["name"].fillna(table["naver_name"])
+    table["dong"] = table["dong"].fillna(table["naver_dong"])
+    table["lat"] = table["lat"].fillna(table["naver_lat"])
+    table["lng"] = table["lng"].fillna(table["naver_lng"])
+    table[["rooms", "naver_listings"]] = (
+        table[["rooms", "naver_listings"]].fillna(0).astype(int)
+    )
+    table = table.drop(columns=["naver_name", "naver_dong", "naver_lat", "naver_lng"])
+    return table.round(
+        {"avg_using_fee": 0, "avg_occupancy": 2, "avg_rent": 1, "avg_deposit": 1}
+    )
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="네이버 ↔ 33m2 건물 단위 매칭")
+    parser.add_argument("naver_csv")
+    parser.add_argument("room_csv", help="room_*.csv 또는 reservation_4w_*.csv")
+    parser.add_argument("--buildings", default=BUILDING_FILE)
+    parser.add_argument("--mapping", default=MAPPING_FILE)
+    args = parser.parse_args()
+
+    t0 = time.time()
+    naver = pd.read_csv(args.naver_csv, dtype=str, encoding="utf-8-sig")
+    rooms = pd.read_csv(args.room_csv, dtype={"rid": str}, encoding="utf-8-sig")
+    rooms = rooms.drop_duplicates(subset="rid", keep="last").reset_index(drop=True)
+
+    naver, rooms, buildings = resolve(naver, rooms)
+    table = building_table(naver, rooms, buildings)
+
+    mapping = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "source": "33m2",
+                    "id": rooms["rid"],
+                    "building_id": rooms["building_id"],
+                    "match_score": 1.0,
+                }
+            ),
+            pd.DataFrame(
+                {
+                    "source": "naver",
+                    "id": naver["매물ID"],
+                    "building_id": naver["building_id"],
+                    "match_score": naver["match_score"],
+                }
+            ),
+        ],
+        ignore_index=True,
+    )
+    mapping.to_csv(args.mapping, index=False, encoding="utf-8-sig")
+    table.to_csv(args.buildings, encoding="utf-8-sig")
+
+    matched = (naver["match_score"] > 0).sum()
+    both = ((table["rooms"] > 0) & (table["naver_listings"] > 0)).sum()
+    print(
+        f"🏢 33m2 건물 {len(buildings):,}개 | 전체 건물 {len(table):,}개 | 양쪽 모두 존재 {both:,}개"
+    )
+    print(f"🔗 네이버 {len(naver):,}개 중 {matched:,}개 33m2 건물에 매칭")
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+    print(f"📁 저장 위치: {args.buildings}, {args.mapping}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+카카오 지도 줌 레벨별 격자 클러스터 피라미드 생성
+- room / reservation / 네이버 스냅샷을 한 점 테이블로 합친 뒤 레벨 1 격자로 집계
+- 상위 레벨은 하위 레벨 클러스터의 합계(개수/합)를 2x2 로 묶어 계산 → 원본 재스캔 없음
+- 클러스터마다 개수, 평균 예약률, 평균 월세, 평균 주당 요금 미리 계산
+- 레벨/타일 단위 작은 JSON 으로 저장 → 지도는 화면에 보이는 타일만 요청
+실행: python cluster_pyramid.py --rooms room_250803.csv --reservation reservation_4w_250808.csv --naver naver_final.csv
+"""
+
+import argparse, json, os, time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+OUTPUT_DIR = "../next/public/clusters"
+MIN_LEVEL, MAX_LEVEL = 1, 14  # 카카오 지도 level (1 = 가장 확대)
+LEVEL1_CELL_DEG = 0.0002  # 레벨 1 격자 ≈ 20m, 레벨이 오를 때마다 2배
+TILE_CELLS = 64  # 타일 한 변의 격자 수
+CLUSTER_FIELDS = [
+    "lat",
+    "lng",
+    "count",
+    "rooms",
+    "naver",
+    "avg_occupancy",
+    "avg_rent",
+    "avg_fee",
+]
+SUM_COLUMNS = [
+    "count",
+    "rooms",
+    "naver",
+    "lat_sum",
+    "lng_sum",
+    "occ_sum",
+    "occ_n",
+    "rent_sum",
+    "rent_n",
+    "fee_sum",
+    "fee_n",
+]
+
+
+# 점 테이블 --------------------------------------------------------------------
+def read(path: str, usecols: List[str]) -> pd.DataFrame:
+    header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+    df = pd.read_csv(
+        path,
+        usecols=[c for c in usecols if c in header],
+        dtype={"rid": str},
+        encoding="utf-8-sig",
+    )
+    return df.reindex(columns=usecols)
+
+
+def load_points(rooms_csv: str, reservation_csv: str, naver_csv: str) -> pd.DataFrame:
+    room_cols = ["rid", "lat", "lng", "using_fee", "occupancy_rate_percent"]
+    frames = []
+    if reservation_csv:
+        frames.append(read(reservation_csv, room_cols))
+    if rooms_csv:
+        frames.append(read(rooms_csv, room_cols))
+
+    parts = []
+    if frames:
+        # reservation 우선, room 스냅샷에만 있는 방은 예약률 없이 추가
+        rooms = pd.concat(frames, ignore_index=True).drop_duplicates("rid")
+        parts.append(
+            pd.DataFrame(
+                {
+                    "lat": rooms["lat"],
+                    "lng": rooms["lng"],
+                    "rooms": 1,
+                    "naver": 0,
+                    "occ": rooms["occupancy_rate_percent"],
+                    "rent": np.nan,
+                    "fee": rooms["using_fee"],
+                }
+            )
+        )
+    if naver_csv:
+        naver = read(naver_csv, ["매물ID", "위도", "경도", "월세"])
+        naver = naver.drop_duplicates("매물ID")
+        parts.append(
+            pd.DataFrame(
+                {
+                    "lat": naver["위도"],
+                    "lng": naver["경도"],
+                    "rooms": 0,
+                    "naver": 1,
+                    "occ": np.nan,
+                    "rent": naver["월세"],
+                    "fee": np.nan,
+                }
+            )
+        )
+
+    points = pd.concat(parts, ignore_index=True)
+    for col in ["lat", "lng", "occ", "rent", "fee"]:
+        points[col] = pd.to_numeric(points[col], errors="coerce")
+    return points.dropna(subset=["lat", "lng"]).reset_index(drop=True)
+
+
+# 피라미드 ---------------------------------------------------------------------
+def base_level(points: pd.DataFrame) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "ix": np.floor(points["lng"] / LEVEL1_CELL_DEG).astype(np.int64),
+            "iy": np.floor(points["lat"] / LEVEL1_CELL_DEG).astype(np.int64),
+            "count": 1,
+            "rooms": points["rooms"],
+            "naver": points["naver"],
+            "lat_sum": points["lat"],
+            "lng_sum": points["lng"],
+            "occ_sum": points["occ"].fillna(0),
+            "occ_n": points["occ"].notna().astype(int),
+            "rent_sum": points["rent"].fillna(0),
+            "rent_n": points["rent"].notna().astype(int),
+            "fee_sum": points["fee"].fillna(0),
+            "fee_n": points["fee"].notna().astype(int),
+        }
+    )
+    return df.groupby(["ix", "iy"], as_index=False)[SUM_COLUMNS].sum()
+
+
+def parent_level(cells: pd.DataFrame) -> pd.DataFrame:
+    up = cells.assign(ix=cells["ix"] // 2, iy=cells["iy"] // 2)
+    return up.groupby(["ix", "iy"], as_index=False)[SUM_COLUMNS].sum()
+
+
+def to_clusters(cells: pd.DataFrame) -> pd.DataFrame:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = pd.DataFrame(
+            {
+                "lat": (cells["lat_sum"] / cells["count"]).round(6),
+                "lng": (cells["lng_sum"] / cells["count"]).round(6),
+                "count": cells["count"],
+                "rooms": cells["rooms"],
+                "naver": cells["naver"],
+                "avg_occupancy": (cells["occ_sum"] / cells["occ_n"]).round(1),
+                "avg_rent": (cells["rent_sum"] / cells["rent_n"]).round(1),
+                "avg_fee": (cells["fee_sum"] / cells["fee_n"]).round(0),
+            }
+        )
+    out["tx"] = cells["ix"] // TILE_CELLS
+    out["ty"] = cells["iy"] // TILE_CELLS
+    return out
+
+
+def write_level(level: int, clusters: pd.DataFrame, output_dir: str) -> List[List[int]]:
+    level_dir = os.path.join(output_dir, str(level))
+    os.makedirs(level_dir, exist_ok=True)
+    tiles = []
+    for (tx, ty), tile in clusters.groupby(["tx", "ty"]):
+        rows = tile[CLUSTER_FIELDS].astype(object).replace({np.nan: None})
+        with open(os.path.join(level_dir, f"{tx}_{ty}.json"), "w") as f:
+            json.dump(rows.values.tolist(), f, separators=(",", ":"))
+        tiles.append([int(tx), int(ty), int(tile["count"].sum())])
+    return tiles
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="줌 레벨별 클러스터 피라미드 생성")
+    parser.add_argument("--rooms", help="room_*.csv")
+    parser.add_argument("--reservation", help="reservation_4w_*.csv")
+    parser.add_argument("--naver", help="naver_properties_*_final.csv")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+    if not (args.rooms or args.reservation or args.naver):
+        parser.error("입력 CSV 를 하나 이상 지정하세요")
+
+    t0 = time.time()
+    points = load_points(args.rooms, args.reservation, args.naver)
+    print(
+        f"📂 점 {len(points):,}개 (33m2 {int(points['rooms'].sum()):,} / 네이버 {int(points['naver'].sum()):,})"
+    )
+
+    manifest = {
+        "fields": CLUSTER_FIELDS,
+        "level1_cell_deg": LEVEL1_CELL_DEG,
+        "tile_cells": TILE_CELLS,
+        "levels": {},
+    }
+    cells = base_level(points)
+    for level in range(MIN_LEVEL, MAX_LEVEL + 1):
+        if level > MIN_LEVEL:
+            cells = parent_level(cells)
+        cell_deg = LEVEL1_CELL_DEG * 2 ** (level - MIN_LEVEL)
+        tiles = write_level(level, to_clusters(cells), args.output_dir)
+        manifest["levels"][str(level)] = {
+            "cell_deg": cell_deg,
+            "tile_deg": cell_deg * TILE_CELLS,
+            "tiles": tiles,
+        }
+        print(f"🧱 레벨 {level:2d}: 클러스터 {len(cells):,}개 / 타일 {len(tiles):,}개")
+
+    with open(os.path.join(args.output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    print(f"📁 저장 위치: {args.output_dir} ({time.time() - t0:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
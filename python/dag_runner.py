@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+크롤 → 중복 제거 → 예약 확인 → 조인 → export 단계 실행기 (입력 해시 기반 건너뛰기)
+- 단계마다 명령/입력/출력/선행 단계 선언 (STAGES)
+- 입력 파일 내용 해시 + 명령으로 지문(fingerprint) 계산 → 지난 실행과 같고 출력이 있으면 건너뜀
+- 크롤 단계는 입력이 없으므로 max_age_hours 가 지나면 다시 실행
+- 선행 단계가 끝난 단계부터 병렬 실행 (예: 네이버 크롤 ∥ 33m2 크롤), 단계별 로그는 logs/<단계>.log
+실행: python dag_runner.py                    # 전체
+      python dag_runner.py profit_ranking     # 해당 단계와 선행 단계만
+      python dag_runner.py --dry-run / --force dedupe / --list
+"""
+
+import argparse, glob, hashlib, json, os, subprocess, sys, threading, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set
+
+# 기본 설정 --------------------------------------------------------------------
+STATE_FILE = ".dag_state.json"
+LOG_DIR = "logs"
+JOBS = 3
+HASH_BLOCK = 1 << 20
+ROOM_CSV = "metropolitan_officetel_complete.csv"
+DEDUP_CSV = "deduplicated_samsam_room_data.csv"
+RESERVATION_CSV = "room_reservation_4week_detailed.csv"
+NAVER_CSV = "naver_properties_*_final.csv"
+
+# 단계: 명령({단계명} = 해당 단계의 첫 출력 파일), 입력, 출력(glob 가능), 선행 단계
+STAGES: Dict[str, Dict] = {
+    "search_crawl": {
+        "cmd": ["samsam-crawler.py"],
+        "inputs": ["samsam-crawler.py"],
+        "outputs": [ROOM_CSV],
+        "max_age_hours": 24,
+    },
+    "naver_crawl": {
+        "cmd": ["naver-crawler.py"],
+        "stdin": "y\n",  # 실행 확인 프롬프트
+        "inputs": ["naver-crawler.py"],
+        "outputs": [NAVER_CSV],
+        "max_age_hours": 24,
+    },
+    "dedupe": {
+        "cmd": ["drop_duplicates.py", "{search_crawl}", "-o", DEDUP_CSV],
+        "inputs": ["{search_crawl}"],
+        "outputs": [DEDUP_CSV],
+        "after": ["search_crawl"],
+    },
+    "reservation_check": {
+        "cmd": ["samsam-resevation-check.py"],
+        "inputs": ["{dedupe}", "samsam-resevation-check.py"],
+        "outputs": [RESERVATION_CSV],
+        "after": ["dedupe"],
+    },
+    "proximity_join": {
+        "cmd": ["proximity_join.py", "{naver_crawl}", "{reservation_check}"],
+        "inputs": ["{naver_crawl}", "{reservation_check}"],
+        "outputs": ["naver_room_pairs.csv"],
+        "after": ["naver_crawl", "reservation_check"],
+    },
+    "building_resolver": {
+        "cmd": ["building_resolver.py", "{naver_crawl}", "{reservation_check}"],
+        "inputs": ["{naver_crawl}", "{reservation_check}"],
+        "outputs": ["buildings.csv", "building_map.csv"],
+        "after": ["naver_crawl", "reservation_check"],
+    },
+    "profit_ranking": {
+        "cmd": [
+            "profit_ranking.py",
+            "{proximity_join}",
+            "{naver_crawl}",
+            "{reservation_check}",
+        ],
+        "inputs": ["{proximity_join}", "{naver_crawl}", "{reservation_check}"],
+        "outputs": ["profit_rank/top*_town.csv"],
+        "after": ["proximity_join", "naver_crawl", "reservation_check"],
+    },
+    "export_bundle": {
+        "cmd": ["binary_export.py", "reservation", "{reservation_check}"],
+        "inputs": ["{reservation_check}"],
+        "outputs": [
+            "../next/public/bundle/room_reservation_4week_detailed.manifest.json"
+        ],
+        "after": ["reservation_check"],
+    },
+    "export_clusters": {
+        "cmd": [
+            "cluster_pyramid.py",
+            "--reservation",
+            "{reservation_check}",
+            "--naver",
+            "{naver_crawl}",
+        ],
+        "inputs": ["{reservation_check}", "{naver_crawl}"],
+        "outputs": ["../next/public/clusters/manifest.json"],
+        "after": ["reservation_check", "naver_crawl"],
+    },
+}
+
+
+# 파일/지문 --------------------------------------------------------------------
+def resolve_output(pattern: str) -> Optional[str]:
+    """glob 출력은 가장 최근 파일"""
+    if not glob.has_magic(pattern):
+        return pattern if os.path.exists(pattern) else None
+    matches = glob.glob(pattern)
+    return max(matches, key=os.path.getmtime) if matches else None
+
+
+class FileHasher:
+    """(경로, 크기, mtime) 가 같으면 이전 해시 재사용"""
+
+    def __init__(self, cache: Dict):
+        self.cache = cache
+
+    def __call__(self, path: str) -> str:
+        st = os.stat(path)
+        key = f"{st.st_size}:{st.st_mtime_ns}"
+        cached = self.cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                h.update(block)
+        self.cache[path] = [key, h.hexdigest()]
+        return h.hexdigest()
+
+
+# 실행기 -----------------------------------------------------------------------
+class DagRunner:
+    def __init__(self, stages: Dict[str, Dict], state_path: str = STATE_FILE):
+        self.stages = stages
+        self.state_path = state_path
+        self.state = {"stages": {}, "hashes": {}}
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.hasher = FileHasher(self.state["hashes"])
+        self.lock = threading.Lock()  # 단계 스레드들이 state 를 함께 갱신
+
+    def save_state(self):
+        with self.lock, open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=1)
+
+    def closure(self, targets: List[str]) -> List[str]:
+        """대상 단계 + 모든 선행 단계 (선언 순서 유지)"""
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.stages:
+                raise SystemExit(f"❌ 알 수 없는 단계: {name}")
+            needed.add(name)
+            stack.extend(self.stages[name].get("after", []))
+        return [n for n in self.stages if n in needed]
+
+    def substitute(self, text: str) -> str:
+        for name, stage in self.stages.items():
+            token = "{" + name + "}"
+            if token in text:
+                path = resolve_output(stage["outputs"][0])
+                if path is None:
+                    raise FileNotFoundError(f"{name} 출력 없음: {stage['outputs'][0]}")
+                text = text.replace(token, path)
+        return text
+
+    def fingerprint(self, name: str) -> str:
+        stage = self.stages[name]
+        h = hashlib.sha256(json.dumps(stage["cmd"]).encode("utf-8"))
+        for pattern in stage.get("inputs", []):
+            path = self.substitute(pattern)
+            with self.lock:
+                digest = self.hasher(path)
+            h.update(path.encode("utf-8"))
+            h.update(digest.encode("ascii"))
+        return h.hexdigest()
+
+    def is_current(self, name: str, fingerprint: str) -> bool:
+        stage = self.stages[name]
+        record = self.state["stages"].get(name)
+        if not record or record["fingerprint"] != fingerprint:
+            return False
+        if any(resolve_output(p) is None for p in stage["outputs"]):
+            return False
+        max_age = stage.get("max_age_hours")
+        return not max_age or time.time() - record["finished"] < max_age * 3600
+
+    def run_stage(self, name: str, force: bool, dry_run: bool) -> str:
+        stage = self.stages[name]
+        fingerprint = self.fingerprint(name)
+        if not force and self.is_current(name, fingerprint):
+            return "skipped"
+        cmd = [sys.executable] + [self.substitute(c) for c in stage["cmd"]]
+        if dry_run:
+            print(f"  📝 {name}: {' '.join(cmd[1:])}")
+            return "planned"
+
+        os.makedirs(LOG_DIR, exist_ok=True)
+        t0 = time.time()
+        with open(os.path.join(LOG_DIR, f"{name}.log"), "w", encoding="utf-8") as log:
+            proc = subprocess.run(
+                cmd,
+                input=stage.get("stdin"),
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+        if proc.returncode != 0:
+            return "failed"
+        # 실행 후 지문 다시 계산 (입력 파일이 크롤 스크립트 자신인 경우 등)
+        record = {
+            "fingerprint": self.fingerprint(name),
+            "finished": time.time(),
+            "seconds": round(time.time() - t0, 1),
+        }
+        with self.lock:
+            self.state["stages"][name] = record
+        return "done"
+
+    def run(
+        self, targets: List[str], jobs: int, force: Set[str], dry_run: bool
+    ) -> Dict[str, str]:
+        order = self.closure(targets or list(self.stages))
+        status: Dict[str, str] = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while len(status) < len(order):
+                for name in order:
+                    if name in status or name in running.values():
+                        continue
+                    deps = self.stages[name].get("after", [])
+                    if any(status.get(d) in ("failed", "blocked") for d in deps):
+                        status[name] = "blocked"
+                        print(f"⛔ {name}: 선행 단계 실패로 건너뜀")
+                        continue
+                    if all(d in status for d in deps):
+                        # dry-run 에서는 선행 단계가 다시 돌 예정이면 함께 실행 예정으로 표시
+                        if dry_run and any(status[d] == "planned" for d in deps):
+                            status[name] = "planned"
+                            print(f"  📝 {name}: (선행 단계 재실행 후)")
+                            continue
+                        print(f"▶️ {name} 시작")
+                        future = pool.submit(
+                            self.run_stage, name, name in force, dry_run
+                        )
+                        running[future] = name
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        status[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ {name}: {e}")
+                        status[name] = "failed"
+                    icon = {"done": "✅", "skipped": "⏭️", "failed": "❌"}.get(
+                        status[name], "📝"
+                    )
+                    print(f"{icon} {name}: {status[name]}")
+                    if not dry_run:
+                        self.save_state()
+        return status
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 단계 실행기")
+    parser.add_argument("targets", nargs="*", help="실행할 단계 (기본: 전체)")
+    parser.add_argument("-j", "--jobs", type=int, default=JOBS)
+    parser.add_argument(
+        "--force", nargs="*", default=[], help="지문과 무관하게 다시 실행"
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    runner = DagRunner(STAGES)
+    if args.list:
+        for name, stage in STAGES.items():
+            record = runner.state["stages"].get(name)
+            last = (
+                time.strftime("%m-%d %H:%M", time.localtime(record["finished"]))
+                if record
+                else "-"
+            )
+            after = ", ".join(stage.get("after", [])) or "-"
+            print(f"  {name:<18} 선행: {after:<45} 최근 실행: {last}")
+        return
+
+    t0 = time.time()
+    status = runner.run(args.targets, args.jobs, set(args.force), args.dry_run)
+    counts = {s: list(status.values()).count(s) for s in sorted(set(status.values()))}
+    print(f"\n📊 " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+    print(f"⏱️ 소요 시간: {time.time() - t0:.1f}초")
+    if "failed" in counts:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+room_*.csv / reservation_4w_*.csv 스트리밍 중복 제거 & 스냅샷 병합
+- 입력 파일 개수 제한 없음, chunk 단위로 읽음
+- rid 별로 crawl_timestamp 가 가장 최신인 행만 유지 (동률이면 뒤에 입력된 파일 우선)
+- 입력이 메모리 한도를 넘으면 rid 해시 기준 디스크 파티션으로 나눠 처리
+실행: python drop_duplicates.py room_250801.csv room_250803.csv -o room_merged.csv
+"""
+import argparse, os, tempfile, time
+from typing import List
+
 import pandas as pd
-from tqdm import tqdm
 
-# tqdm pandas 연동 설정
-tqdm.pandas()
 
-# 파일 경로
-input_file = "../next/kakaoMapViewer/public/reservation/reservation_4w_250903.csv"
-output_file = "deduplicated_data.csv"
+# 기본 설정 --------------------------------------------------------------------
+KEY_COLUMN = "rid"
+ORDER_COLUMN = "crawl_timestamp"
+CHUNK_SIZE = 50_000
+MAX_MEMORY_MB = 512  # 입력 합계가 이보다 크면 디스크 파티션 사용
+PARTITIONS = 16
+SEQ_COLUMN = "__seq"  # 입력 순서 (동률 처리용)
+TS_COLUMN = "__ts"
+
+
+# 헬퍼 -------------------------------------------------------------------------
+def read_header(path: str) -> List[str]:
+    return list(pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns)
+
+
+def iter_chunks(paths: List[str], columns: List[str], chunksize: int, order_by: str):
+    """모든 입력을 같은 컬럼 순서의 문자열 chunk 로 변환하여 순서대로 반환"""
+    seq = 0
+    for path in paths:
+        reader = pd.read_csv(
+            path, dtype=str, encoding="utf-8-sig", chunksize=chunksize
+        )
+        for chunk in reader:
+            chunk = chunk.reindex(columns=columns)
+            chunk[TS_COLUMN] = pd.to_numeric(chunk[order_by], errors="coerce").fillna(-1)
+            chunk[SEQ_COLUMN] = range(seq, seq + len(chunk))
+            seq += len(chunk)
+            yield path, chunk
+
+
+def keep_latest(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    df = df[df[key].notna()]
+    df = df.sort_values([TS_COLUMN, SEQ_COLUMN], kind="stable")
+    return df.drop_duplicates(subset=key, keep="last")
+
+
+def finalize(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    return df.sort_values(SEQ_COLUMN, kind="stable")[columns]
+
+
+class Throughput:
+    def __init__(self):
+        self.start = time.time()
+        self.rows = 0
+
+    def add(self, n: int, label: str):
+        self.rows += n
+        elapsed = time.time() - self.start
+        rate = self.rows / elapsed if elapsed > 0 else 0
+        print(
+            f"\r📥 {os.path.basename(label)[:30]:<30} | 누적 {self.rows:,}행 | {rate:,.0f} rows/sec",
+            end="",
+            flush=True,
+        )
+
+
+# 처리 모드 --------------------------------------------------------------------
+def dedupe_in_memory(chunks, key: str, columns: List[str], tp: Throughput) -> pd.DataFrame:
+    """chunk 마다 최신 행만 남기고, 누적 결과와 주기적으로 합쳐 압축"""
+    pending: List[pd.DataFrame] = []
+    for path, chunk in chunks:
+        tp.add(len(chunk), path)
+        pending.append(keep_latest(chunk, key))
+        if len(pending) >= 8:
+            pending = [keep_latest(pd.concat(pending, ignore_index=True), key)]
+    print()
+    if not pending:
+        return pd.DataFrame(columns=columns)
+    return finalize(keep_latest(pd.concat(pending, ignore_index=True), key), columns)
+
+
+def dedupe_partitioned(
+    chunks, key: str, columns: List[str], tp: Throughput, partitions: int, output: str
+) -> int:
+    """rid 해시로 디스크 파티션 분배 → 파티션별 중복 제거 후 순차 기록"""
+    written = 0
+    with tempfile.TemporaryDirectory(prefix="dedupe_") as tmp:
+        part_paths = [os.path.join(tmp, f"part_{i:03d}.csv") for i in range(partitions)]
+        started = set()
+        for path, chunk in chunks:
+            tp.add(len(chunk), path)
+            chunk = keep_latest(chunk, key)
+            buckets = pd.util.hash_pandas_object(chunk[key], index=False) % partitions
+            for part, group in chunk.groupby(buckets.to_numpy()):
+                group.to_csv(
+                    part_paths[part], mode="a", header=part not in started, index=False
+                )
+                started.add(part)
+        print()
+
+        header = True
+        for part in sorted(started):
+            df = pd.read_csv(part_paths[part], dtype=str)
+            df[TS_COLUMN] = pd.to_numeric(df[TS_COLUMN])
+            df[SEQ_COLUMN] = pd.to_numeric(df[SEQ_COLUMN])
+            df = finalize(keep_latest(df, key), columns)
+            df.to_csv(
+                output,
+                mode="w" if header else "a",
+                header=header,
+                index=False,
+                encoding="utf-8-sig" if header else "utf-8",
+            )
+            header = False
+            written += len(df)
+    return written
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="rid 기준 스트리밍 중복 제거 / 스냅샷 병합")
+    parser.add_argument("inputs", nargs="+", help="room_*.csv / reservation_4w_*.csv")
+    parser.add_argument("-o", "--output", default="deduplicated_data.csv")
+    parser.add_argument("--key", default=KEY_COLUMN)
+    parser.add_argument("--order-by", default=ORDER_COLUMN)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--max-memory-mb", type=int, default=MAX_MEMORY_MB)
+    parser.add_argument(
+        "--partitions", type=int, default=0, help="지정 시 크기와 무관하게 디스크 파티션 사용"
+    )
+    args = parser.parse_args()
+
+    # 모든 입력의 컬럼 합집합 (첫 등장 순서 유지)
+    columns: List[str] = []
+    for path in args.inputs:
+        columns += [c for c in read_header(path) if c not in columns]
+    if args.key not in columns:
+        raise SystemExit(f"❌ 키 컬럼 없음: {args.key}")
+    if args.order_by not in columns:
+        print(f"⚠️ {args.order_by} 컬럼 없음 - 입력 순서로 최신 판단")
+        columns_for_order = columns + [args.order_by]
+    else:
+        columns_for_order = columns
 
-# CSV 불러오기
-df = pd.read_csv(input_file)
+    total_mb = sum(os.path.getsize(p) for p in args.inputs) / 1024 / 1024
+    partitions = args.partitions or (PARTITIONS if total_mb > args.max_memory_mb else 0)
+    print(f"📂 입력 {len(args.inputs)}개 ({total_mb:,.1f}MB) | 모드: {'디스크 파티션 ' + str(partitions) + '개' if partitions else '메모리'}")
 
-# 중복 확인용 진행 표시
-print("중복 여부 검사 중...")
-duplicate_flags = df.duplicated(subset="rid", keep="first")
-for i in tqdm(range(len(df)), desc="중복 확인 진행 중"):
-    _ = duplicate_flags.iloc[i]  # 단순 진행률 표시 목적
+    tp = Throughput()
+    chunks = iter_chunks(args.inputs, columns_for_order, args.chunksize, args.order_by)
+    if partitions:
+        written = dedupe_partitioned(chunks, args.key, columns, tp, partitions, args.output)
+    else:
+        df = dedupe_in_memory(chunks, args.key, columns, tp)
+        df.to_csv(args.output, index=False, encoding="utf-8-sig")
+        written = len(df)
 
-# 중복 제거
-deduplicated_df = df.drop_duplicates(subset="rid", keep="first")
+    elapsed = time.time() - tp.start
+    print(f"\n✅ 중복 제거 완료: {tp.rows - written:,}개 중복 제거됨 ({tp.rows:,} → {written:,})")
+    print(f"⚡ 처리 속도: {tp.rows / elapsed if elapsed > 0 else 0:,.0f} rows/sec ({elapsed:.1f}초)")
+    print(f"📁 저장 위치: {args.output}")
 
-# 저장
-deduplicated_df.to_csv(output_file, index=False, encoding="utf-8-sig")
 
-# 결과 요약 출력
-print(f"\n✅ 중복 제거 완료: {len(df) - len(deduplicated_df)}개 중복 제거됨")
-print(f"📁 저장 위치: {output_file}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네이버 중개사 간 중복 매물 묶기
+- 같은 집을 여러 중개사(cpNm/rltrNm)가 서로 다른 매물ID(atclNo)로 올리는 경우를 하나로 합침
+- 블로킹 키: 정규화 건물명 + 층수정보 + 전용면적(0.5㎡ 반올림) + 보증금 + 월세 → 해시 버킷
+- 버킷 안에서만 좌표 거리(MAX_DISTANCE_M) 비교, 같은 중개사 매물끼리는 합치지 않음 (다른 호실)
+- 묶음마다 대표 매물 1개 + 중복매물수 / 중복매물ID / 중개사목록 컬럼
+실행: python listing_dedupe.py naver_properties_20250808_035438_final.csv
+"""
+
+import argparse, math, os, re, time, unicodedata
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# 기본 설정 --------------------------------------------------------------------
+MAX_DISTANCE_M = 30.0
+AREA_STEP = 0.5  # ㎡
+MISSING = {"", "N/A", "nan", "None"}
+EARTH_RADIUS_M = 6_371_000.0
+
+
+# 블로킹 -----------------------------------------------------------------------
+def clean(value) -> str:
+    text = "" if value is None else str(value).strip()
+    return "" if text in MISSING else text
+
+
+def normalize_building(prop: Dict) -> str:
+    name = clean(prop.get("건물명")) or clean(prop.get("매물제목"))
+    name = unicodedata.normalize("NFKC", name).lower()
+    return re.sub(r"[^0-9a-z가-힣]", "", name)
+
+
+def to_float(value) -> float:
+    try:
+        return float(clean(value))
+    except ValueError:
+        return float("nan")
+
+
+def block_key(prop: Dict) -> Tuple:
+    area = to_float(prop.get("전용면적"))
+    area_bucket = round(area / AREA_STEP) if area == area else None
+    return (
+        normalize_building(prop),
+        clean(prop.get("층수정보")),
+        area_bucket,
+        clean(prop.get("보증금")),
+        clean(prop.get("월세")),
+    )
+
+
+def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """스칼라 haversine (크롤러 import 시 numpy/pandas 로드 방지)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def broker_of(prop: Dict) -> str:
+    return f"{clean(prop.get('중개사무소명'))}|{clean(prop.get('공인중개사'))}"
+
+
+def completeness(prop: Dict) -> int:
+    return sum(1 for v in prop.values() if clean(v))
+
+
+# 묶기 -------------------------------------------------------------------------
+def cluster_block(members: List[Dict]) -> List[List[Dict]]:
+    """버킷 하나 안에서 좌표가 가깝고 중개사가 다른 매물끼리 묶음"""
+    clusters: List[Tuple[float, float, set, List[Dict]]] = []
+    for prop in members:
+        lat, lng = to_float(prop.get("위도")), to_float(prop.get("경도"))
+        broker = broker_of(prop)
+        for c_lat, c_lng, brokers, items in clusters:
+            if broker in brokers:
+                continue
+            if lat == lat and c_lat == c_lat:
+                if distance_m(lat, lng, c_lat, c_lng) > MAX_DISTANCE_M:
+                    continue
+            elif lat == lat or c_lat == c_lat:
+                continue  # 한쪽만 좌표가 있으면 판단 불가 → 합치지 않음
+            brokers.add(broker)
+            items.append(prop)
+            break
+        else:
+            clusters.append((lat, lng, {broker}, [prop]))
+    return [items for *_, items in clusters]
+
+
+def collapse_duplicates(properties: List[Dict]) -> List[Dict]:
+    """extract_property_info 결과 목록 → 묶음별 대표 매물 목록 (입력 순서 유지)"""
+    blocks: Dict[Tuple, List[Dict]] = defaultdict(list)
+    order: Dict[int, int] = {}
+    for i, prop in enumerate(properties):
+        blocks[block_key(prop)].append(prop)
+        order[id(prop)] = i
+
+    canonical = []
+    for key, members in blocks.items():
+        groups = cluster_block(members) if key[0] and len(members) > 1 else None
+        for items in groups or [[m] for m in members]:
+            rep = max(items, key=lambda p: (completeness(p), -order[id(p)]))
+            merged = dict(rep)
+            merged["중복매물수"] = len(items)
+            merged["중복매물ID"] = "|".join(str(p.get("매물ID", "")) for p in items)
+            merged["중개사목록"] = "|".join(
+                dict.fromkeys(clean(p.get("중개사무소명")) for p in items)
+            )
+            canonical.append((min(order[id(p)] for p in items), merged))
+    canonical.sort(key=lambda x: x[0])
+    return [merged for _, merged in canonical]
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="네이버 중개사 간 중복 매물 묶기")
+    parser.add_argument("naver_csv")
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    t0 = time.time()
+    df = pd.read_csv(args.naver_csv, dtype=str, encoding="utf-8-sig")
+    properties = df.to_dict(orient="records")
+    collapsed = collapse_duplicates(properties)
+
+    output = args.output or os.path.splitext(args.naver_csv)[0] + "_dedup.csv"
+    pd.DataFrame(collapsed).to_csv(output, index=False, encoding="utf-8-sig")
+    merged = sum(1 for p in collapsed if p["중복매물수"] > 1)
+    print(
+        f"🧹 {len(properties):,}개 → {len(collapsed):,}개 ({len(properties) - len(collapsed):,}개 중복, 묶음 {merged:,}개)"
+    )
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+    print(f"📁 저장 위치: {output}")
+
+
+if __name__ == "__main__":
+    main()
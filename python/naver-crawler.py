@@ -1,11 +1,14 @@
-import requests
+import httpx
 import json
 import time
 import random
-import pandas as pd
 from datetime import datetime
 import itertools
 
+from listing_dedupe import collapse_duplicates
+from profiling import profiled
+from transport import create_client
+
 
 class NaverRealEstateCrawler:
     def __init__(self):
@@ -40,8 +43,8 @@ class NaverRealEstateCrawler:
             "sort": "rank",
         }
 
-        # 세션 설정
-        self.session = requests.Session()
+        # 세션 설정 (공용 keep-alive 연결 풀)
+        self.session, self.http_stats = create_client(timeout=15.0)
 
     def get_headers(self):
         return {
@@ -50,10 +53,10 @@ class NaverRealEstateCrawler:
             "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
             "Referer": "https://m.land.naver.com/map",
             "X-Requested-With": "XMLHttpRequest",
-            "Connection": "keep-alive",
             "Cache-Control": "no-cache",
         }
 
+    @profiled()
     def extract_property_info(self, property_data):
         """매물 정보 추출 및 가공"""
         try:
@@ -105,6 +108,7 @@ class NaverRealEstateCrawler:
             print(f"⚠️ 매물 정보 추출 오류: {e}")
             return None
 
+    @profiled()
     def fetch_page(self, page):
         """단일 페이지 데이터 가져오기 - 안전한 순차 처리"""
         params = {**self.params, "page": page}
@@ -163,7 +167,7 @@ class NaverRealEstateCrawler:
                 print(f"✅ Page {page}: {len(processed_properties)}개 매물")
                 return processed_properties
 
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 print(f"❌ Page {page} 네트워크 오류 (시도 {attempt+1}): {e}")
                 if attempt < max_retries - 1:
                     wait_time = random.uniform(3, 8)
@@ -231,6 +235,7 @@ class NaverRealEstateCrawler:
 
         return all_properties
 
+    @profiled()
     def save_csv(self, properties, filename_suffix=""):
         """CSV 파일 저장"""
         if not properties:
@@ -243,6 +248,8 @@ class NaverRealEstateCrawler:
         filename += ".csv"
 
         try:
+            import pandas as pd  # 저장할 때만 로드 (시작 시간 단축)
+
             df = pd.DataFrame(properties)
             df.to_csv(filename, index=False, encoding="utf-8-sig")
 
@@ -282,12 +289,19 @@ if __name__ == "__main__":
     print(f"🎉 크롤링 완료!")
     print(f"📊 총 수집 매물: {len(properties)}개")
     print(f"⏱️ 소요 시간: {elapsed_time/60:.1f}분")
+    print(crawler.http_stats.summary())
     if len(properties) > 0:
         print(f"🚀 평균 속도: {len(properties)/(elapsed_time/60):.1f}개/분")
 
     # 최종 저장
     final_file = crawler.save_csv(properties, "final")
 
+    # 중개사 간 중복 매물을 묶은 대표 매물본 (지도/조인용)
+    if properties:
+        collapsed = collapse_duplicates(properties)
+        print(f"🧹 중개사 간 중복 묶기: {len(properties)}개 → {len(collapsed)}개")
+        crawler.save_csv(collapsed, "final_dedup")
+
     # 샘플 데이터 출력
     if properties:
         print(f"\n📋 샘플 데이터 (처음 3개):")
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네이버 매물 생애주기 / 가격 이력 추적 (매물ID = atclNo 기준 증분 병합)
+- 크롤 결과(naver_properties_<timestamp>_final.csv)를 실행 시각 순서대로 병합
+- 매물별: 최초/최근 발견 시각, 현재 활성 여부, 재등록 횟수, 최초/최고/현재 보증금(prc)·월세(rentPrc)
+- 가격 이력은 값이 바뀐 경우에만 한 줄씩 추가 → 전체 과거 CSV 재로드 없이 조회
+- 이전 실행에 있었는데 이번 실행에 없으면 내림(비활성), 다시 나타나면 재등록으로 기록
+- 노출 기간은 노출 구간 합 (내림 ~ 재등록 사이는 제외): 끝난 구간 days_listed + 현재 구간 listed_since 부터
+실행: python naver_tracker.py add naver_properties_20250808_035438_final.csv
+      python naver_tracker.py market --min-days 14
+      python naver_tracker.py drops --min-pct 5
+"""
+
+import argparse, json, os, re, time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+STORE_DIR = "naver_store"
+KEY_COLUMN = "매물ID"
+PRICE_COLUMNS = ["보증금", "월세"]
+# 최근 실행 기준으로 덮어쓰는 매물 속성
+ATTRIBUTE_COLUMNS = [
+    "매물제목",
+    "층수정보",
+    "위도",
+    "경도",
+    "전용면적",
+    "주소",
+    "매물유형",
+    "건물명",
+    "중개사무소명",
+    "공인중개사",
+]
+RUN_PATTERN = re.compile(r"(\d{8})_(\d{6})")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+STATE_COLUMNS = [
+    "first_seen",
+    "last_seen",
+    "active",
+    "listed_since",
+    "days_listed",
+    "relisted",
+    "price_changes",
+    "first_deposit",
+    "max_deposit",
+    "first_rent",
+    "max_rent",
+]
+
+
+# 헬퍼 -------------------------------------------------------------------------
+def run_time_of(path: str) -> str:
+    """파일명의 YYYYMMDD_HHMMSS, 없으면 수정 시각"""
+    match = RUN_PATTERN.search(os.path.basename(path))
+    if match:
+        stamp = datetime.strptime("".join(match.groups()), "%Y%m%d%H%M%S")
+    else:
+        stamp = datetime.fromtimestamp(os.path.getmtime(path))
+    return stamp.strftime(TIME_FORMAT)
+
+
+def days_between(start: pd.Series, end: pd.Series) -> pd.Series:
+    delta = pd.to_datetime(end) - pd.to_datetime(start)
+    return (delta.dt.total_seconds() / 86400).round(1)
+
+
+# 저장소 -----------------------------------------------------------------------
+class ListingTracker:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.listings_path = os.path.join(root, "listings.csv")
+        self.history_path = os.path.join(root, "price_history.csv")
+        self.runs_path = os.path.join(root, "runs.json")
+
+        self.runs: List[Dict] = []
+        if os.path.exists(self.runs_path):
+            with open(self.runs_path, encoding="utf-8") as f:
+                self.runs = json.load(f)
+        if os.path.exists(self.listings_path):
+            self.listings = pd.read_csv(
+                self.listings_path, dtype={KEY_COLUMN: str}, encoding="utf-8-sig"
+            ).set_index(KEY_COLUMN)
+            if "listed_since" not in self.listings:
+                # 이전 버전 저장소: 구간 정보가 없어 first_seen ~ last_seen 한 구간으로 간주
+                closed = ~self.listings["active"].astype(bool)
+                self.listings["listed_since"] = self.listings["first_seen"]
+                self.listings["days_listed"] = days_between(
+                    self.listings["first_seen"], self.listings["last_seen"]
+                ).where(closed, 0.0)
+        else:
+            self.listings = pd.DataFrame(
+                columns=ATTRIBUTE_COLUMNS + PRICE_COLUMNS + STATE_COLUMNS,
+                index=pd.Index([], name=KEY_COLUMN),
+            )
+        self.new_history: List[pd.DataFrame] = []
+
+    def load_run(self, path: str) -> pd.DataFrame:
+        df = pd.read_csv(path, dtype={KEY_COLUMN: str}, encoding="utf-8-sig")
+        df = df[df[KEY_COLUMN].notna() & (df[KEY_COLUMN] != "")]
+        for col in PRICE_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        df = df.drop_duplicates(subset=KEY_COLUMN, keep="last").set_index(KEY_COLUMN)
+        return df.reindex(columns=ATTRIBUTE_COLUMNS + PRICE_COLUMNS)
+
+    def add(self, path: str) -> Optional[Dict]:
+        source = {"file": os.path.basename(path), "size": os.path.getsize(path)}
+        if any(
+            r["file"] == source["file"] and r["size"] == source["size"]
+            for r in self.runs
+        ):
+            return None
+        seen_at = run_time_of(path)
+        if self.runs and seen_at < self.runs[-1]["seen_at"]:
+            raise ValueError(
+                f"{source['file']} 은 마지막 병합 실행({self.runs[-1]['seen_at']})보다 이전"
+            )
+
+        run = self.load_run(path)
+        old = self.listings
+        is_new = ~run.index.isin(old.index)
+        known = run.index[~is_new]
+
+        # 1) 신규 매물
+        fresh = run[is_new].copy()
+        fresh["first_seen"] = seen_at
+        fresh["listed_since"] = seen_at
+        fresh["days_listed"] = 0.0
+        fresh["relisted"] = 0
+        fresh["price_changes"] = 0
+        for col, name in [("보증금", "deposit"), ("월세", "rent")]:
+            fresh[f"first_{name}"] = fresh[col]
+            fresh[f"max_{name}"] = fresh[col]
+
+        # 2) 기존 매물: 가격 변경 / 재등록
+        cur = old.loc[known]
+        prices = run.loc[known, PRICE_COLUMNS]
+        changed = (
+            (prices.to_numpy() != cur[PRICE_COLUMNS].to_numpy())
+            & ~(prices.isna().to_numpy() & cur[PRICE_COLUMNS].isna().to_numpy())
+        ).any(axis=1)
+        relisted = ~cur["active"].astype(bool).to_numpy()
+
+        updated = cur.copy()
+        updated[ATTRIBUTE_COLUMNS + PRICE_COLUMNS] = run.loc[known]
+        updated["price_changes"] = cur["price_changes"] + changed
+        updated["relisted"] = cur["relisted"] + relisted
+        updated.loc[relisted, "listed_since"] = seen_at
+        updated["max_deposit"] = np.fmax(cur["max_deposit"], prices["보증금"])
+        updated["max_rent"] = np.fmax(cur["max_rent"], prices["월세"])
+
+        # 3) 이번 실행에 없는 활성 매물 → 내림
+        gone = old.index.difference(run.index)
+        dropped = old.loc[gone].copy()
+        newly_gone = dropped["active"].astype(bool)
+        # 끝난 노출 구간: listed_since ~ 마지막으로 보인 실행
+        dropped.loc[newly_gone, "days_listed"] += days_between(
+            dropped.loc[newly_gone, "listed_since"],
+            dropped.loc[newly_gone, "last_seen"],
+        )
+        dropped["active"] = False
+
+        for part in (fresh, updated):
+            part["last_seen"] = seen_at
+            part["active"] = True
+        self.listings = pd.concat(
+            [p for p in (dropped, updated, fresh) if len(p)]
+        ).sort_index()
+
+        history = pd.concat([fresh[PRICE_COLUMNS], prices[changed]])
+        if len(history):
+            self.new_history.append(
+                history.reset_index().assign(seen_at=seen_at)[
+                    [KEY_COLUMN, "seen_at"] + PRICE_COLUMNS
+                ]
+            )
+
+        entry = {
+            **source,
+            "seen_at": seen_at,
+            "rows": len(run),
+            "new": int(is_new.sum()),
+            "price_changed": int(changed.sum()),
+            "relisted": int(relisted.sum()),
+            "delisted": int(newly_gone.sum()),
+        }
+        self.runs.append(entry)
+        return entry
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        self.listings.to_csv(self.listings_path, encoding="utf-8-sig")
+        if self.new_history:
+            history = pd.concat(self.new_history, ignore_index=True)
+            exists = os.path.exists(self.history_path)
+            history.to_csv(
+                self.history_path,
+                mode="a",
+                header=not exists,
+                index=False,
+                encoding="utf-8" if exists else "utf-8-sig",
+            )
+            self.new_history = []
+        with open(self.runs_path, "w", encoding="utf-8") as f:
+            json.dump(self.runs, f, ensure_ascii=False, indent=1)
+
+    # 조회
+    def time_on_market(self) -> pd.DataFrame:
+        """매물별 노출 기간 = 끝난 구간 합 + 활성 매물의 현재 구간 (마지막 실행 시각까지)"""
+        df = self.listings.copy()
+        current = days_between(df["listed_since"], df["last_seen"])
+        active = df["active"].astype(bool)
+        df["days_on_market"] = df["days_listed"] + current.where(active, 0.0)
+        return df
+
+    def price_drops(self, min_pct: float = 0.0) -> pd.DataFrame:
+        """최고가 대비 현재 월세/보증금이 내려간 매물"""
+        df = self.listings
+        rent_drop = df["max_rent"] - df["월세"]
+        deposit_drop = df["max_deposit"] - df["보증금"]
+        pct = (rent_drop / df["max_rent"].replace(0, np.nan) * 100).fillna(0)
+        mask = ((rent_drop > 0) | (deposit_drop > 0)) & (pct >= min_pct)
+        out = df[mask].assign(
+            rent_drop=rent_drop[mask],
+            rent_drop_pct=pct[mask].round(1),
+            deposit_drop=deposit_drop[mask],
+        )
+        return out.sort_values(["rent_drop_pct", "deposit_drop"], ascending=False)
+
+    def history_of(self, listing_id: str) -> pd.DataFrame:
+        if not os.path.exists(self.history_path):
+            return pd.DataFrame(columns=[KEY_COLUMN, "seen_at"] + PRICE_COLUMNS)
+        history = pd.read_csv(
+            self.history_path, dtype={KEY_COLUMN: str}, encoding="utf-8-sig"
+        )
+        return history[history[KEY_COLUMN] == listing_id]
+
+
+# 메인 -------------------------------------------------------------------------
+REPORT_COLUMNS = ["매물제목", "주소", "first_seen", "last_seen", "active"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 매물 생애주기/가격 이력 추적")
+    parser.add_argument("--store", default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="크롤 결과 병합 (실행 시각 순서대로)")
+    add.add_argument("csvs", nargs="+")
+    market = sub.add_parser("market", help="노출 기간 조회")
+    market.add_argument("--min-days", type=float, default=0)
+    market.add_argument("--active", action="store_true", help="현재 활성 매물만")
+    market.add_argument("-o", "--output")
+    drops = sub.add_parser("drops", help="가격 인하 매물 조회")
+    drops.add_argument("--min-pct", type=float, default=0)
+    drops.add_argument("-o", "--output")
+    history = sub.add_parser("history", help="매물 하나의 가격 이력")
+    history.add_argument("listing_id")
+    args = parser.parse_args()
+
+    tracker = ListingTracker(args.store)
+    t0 = time.time()
+    if args.command == "add":
+        for path in sorted(args.csvs, key=run_time_of):
+            entry = tracker.add(path)
+            if entry is None:
+                print(f"⏭️ {os.path.basename(path)} 이미 병합됨")
+                continue
+            print(
+                f"➕ {entry['seen_at']}: {entry['rows']:,}개 | 신규 {entry['new']:,} / 가격변경 {entry['price_changed']:,} / 재등록 {entry['relisted']:,} / 내림 {entry['delisted']:,}"
+            )
+        tracker.save()
+        active = tracker.listings["active"].astype(bool).sum()
+        print(
+            f"🗂️ 누적 매물 {len(tracker.listings):,}개 (활성 {active:,}) | 실행 {len(tracker.runs)}회 → {args.store}"
+        )
+    elif args.command == "market":
+        df = tracker.time_on_market()
+        df = df[df["days_on_market"] >= args.min_days]
+        if args.active:
+            df = df[df["active"].astype(bool)]
+        df = df.sort_values("days_on_market", ascending=False)
+        print(
+            f"📅 {len(df):,}개 | 평균 노출 {df['days_on_market'].mean():.1f}일, 중앙값 {df['days_on_market'].median():.1f}일"
+        )
+        if args.output:
+            df.to_csv(args.output, encoding="utf-8-sig")
+            print(f"📁 저장 위치: {args.output}")
+        else:
+            print(df[REPORT_COLUMNS + ["days_on_market"]].head(20).to_string())
+    elif args.command == "drops":
+        df = tracker.price_drops(args.min_pct)
+        print(f"📉 가격 인하 매물 {len(df):,}개")
+        if args.output:
+            df.to_csv(args.output, encoding="utf-8-sig")
+            print(f"📁 저장 위치: {args.output}")
+        else:
+            cols = REPORT_COLUMNS + [
+                "max_rent",
+                "월세",
+                "rent_drop_pct",
+                "deposit_drop",
+            ]
+            print(df[cols].head(20).to_string())
+    else:
+        print(tracker.history_of(args.listing_id).to_string(index=False))
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+4주 예약률 세부 분해 (schedule_pattern → 추가 컬럼, HTTP 요청 없음)
+- schedule_pattern: 분석 시작일부터 28일, 날짜별 1글자 (b 예약 / d 호스트 차단 / 0 그 외 / - 응답 없음)
+- 모든 방의 패턴을 (방 × 28일) uint8 행렬로 만들어 한 번에 계산 (행 단위 루프 없음)
+- 주중/주말 예약률: 시작일 요일 기준으로 날짜별 요일 계산, 주말 = 토·일
+- 주차별 예약률: 1~4주차 (7일씩)
+- 근/원거리 예약률: 오늘부터 NEAR_DAYS 일 이내 vs 그 이후 (리드타임)
+- 예약(b)과 차단(d) 비율도 따로 (occupancy_rate_percent 는 둘 다 예약으로 셈)
+- 응답 없는 날짜(-)는 분모에서 제외, 해당 구간 날짜가 모두 없으면 빈 값
+실행: python occupancy_breakdown.py room_reservation_4week_detailed.csv [-o out.csv]
+"""
+
+import argparse, time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+WINDOW_DAYS = 28
+WEEKEND = (5, 6)  # 토, 일 (date.weekday())
+NEAR_DAYS = 14  # 리드타임 2주 이내 = 근거리
+RESERVED_CODES = b"bd"
+BOOKED_CODE = ord("b")
+BLOCKED_CODE = ord("d")
+MISSING_CODE = ord("-")
+BREAKDOWN_COLUMNS = (
+    ["occ_weekday_percent", "occ_weekend_percent"]
+    + [f"occ_week{i}_percent" for i in range(1, WINDOW_DAYS // 7 + 1)]
+    + ["occ_near_percent", "occ_far_percent", "booked_percent", "blocked_percent"]
+)
+
+
+# 계산 -------------------------------------------------------------------------
+def pattern_matrix(patterns: pd.Series) -> np.ndarray:
+    """문자열 패턴 → (n, WINDOW_DAYS) uint8, 길이가 다르거나 없으면 '-' 로 채움"""
+    padded = (
+        patterns.fillna("")
+        .astype(str)
+        .str.slice(0, WINDOW_DAYS)
+        .str.pad(WINDOW_DAYS, side="right", fillchar="-")
+    )
+    raw = "".join(padded).encode("ascii", errors="replace")
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(padded), WINDOW_DAYS)
+
+
+def masked_rate(hit: np.ndarray, known: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """mask (n, 28) 안의 known 날짜 중 hit 비율 (%)"""
+    num = (hit & mask).sum(axis=1)
+    den = (known & mask).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.round(np.where(den > 0, num / den * 100, np.nan), 2)
+
+
+def breakdown(patterns: pd.Series, start_dates: pd.Series) -> Dict[str, np.ndarray]:
+    codes = pattern_matrix(patterns)
+    known = codes != MISSING_CODE
+    reserved = np.isin(codes, np.frombuffer(RESERVED_CODES, dtype=np.uint8))
+    day = np.arange(WINDOW_DAYS)
+
+    # 방마다 시작 요일이 다를 수 있음 (여러 날에 걸친 실행)
+    start_wd = pd.to_datetime(start_dates, errors="coerce").dt.weekday.to_numpy()
+    start_wd = np.where(np.isnan(start_wd), 0, start_wd).astype(np.int64)
+    weekday = (start_wd[:, None] + day[None, :]) % 7
+    weekend = np.isin(weekday, WEEKEND)
+
+    out = {
+        "occ_weekday_percent": masked_rate(reserved, known, ~weekend),
+        "occ_weekend_percent": masked_rate(reserved, known, weekend),
+    }
+    for w in range(WINDOW_DAYS // 7):
+        mask = np.broadcast_to((day // 7) == w, codes.shape)
+        out[f"occ_week{w + 1}_percent"] = masked_rate(reserved, known, mask)
+    near = np.broadcast_to(day < NEAR_DAYS, codes.shape)
+    out["occ_near_percent"] = masked_rate(reserved, known, near)
+    out["occ_far_percent"] = masked_rate(reserved, known, ~near)
+    everything = np.ones_like(known)
+    out["booked_percent"] = masked_rate(codes == BOOKED_CODE, known, everything)
+    out["blocked_percent"] = masked_rate(codes == BLOCKED_CODE, known, everything)
+    return out
+
+
+def add_breakdown(df: pd.DataFrame) -> pd.DataFrame:
+    """reservation 표에 BREAKDOWN_COLUMNS 추가 (schedule_pattern 없으면 그대로)"""
+    if "schedule_pattern" not in df.columns or df.empty:
+        return df
+    cols = breakdown(df["schedule_pattern"], df["analysis_start_date"])
+    return df.assign(**cols)
+
+
+def add_breakdown_rows(rows: List[Dict]) -> List[Dict]:
+    """dict 행 버전 (csv.DictWriter 로 쓰는 곳), 빈 값은 ''"""
+    if not rows or not any("schedule_pattern" in r for r in rows):
+        return rows
+    frame = pd.DataFrame(
+        {
+            "schedule_pattern": [r.get("schedule_pattern") for r in rows],
+            "analysis_start_date": [r.get("analysis_start_date") for r in rows],
+        }
+    )
+    cols = breakdown(frame["schedule_pattern"], frame["analysis_start_date"])
+    extra = pd.DataFrame(cols).astype(object).where(lambda d: d.notna(), "")
+    return [{**r, **e} for r, e in zip(rows, extra.to_dict("records"))]
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="4주 예약률 세부 분해")
+    parser.add_argument("reservation_csv")
+    parser.add_argument("-o", "--output", help="기본: 입력 파일 덮어쓰기")
+    args = parser.parse_args()
+
+    df = pd.read_csv(
+        args.reservation_csv, dtype=str, encoding="utf-8-sig", keep_default_na=False
+    )
+    if "schedule_pattern" not in df.columns:
+        raise SystemExit(
+            "❌ schedule_pattern 컬럼 없음 (날짜별 상태를 보관한 실행 결과 필요)"
+        )
+    t0 = time.perf_counter()
+    df = add_breakdown(df.drop(columns=BREAKDOWN_COLUMNS, errors="ignore"))
+    elapsed = time.perf_counter() - t0
+
+    output = args.output or args.reservation_csv
+    df.to_csv(output, index=False, encoding="utf-8-sig")
+    print(f"🧮 {len(df):,}개 방 분해: {elapsed * 1000:.1f}ms")
+    print(df[BREAKDOWN_COLUMNS].describe().loc[["mean", "50%"]].round(1).to_string())
+    print(f"📁 저장 위치: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지역 × 유형별 예약률 롤업 큐브 (증분 유지)
+- 키: state × province × town × room_cnt × 평형 구간 × 분석일(analysis_start_date)
+- 셀: 개수, 합, 제곱합 + 히스토그램 (occupancy_rate_percent, using_fee)
+- 새 reservation 스냅샷은 셀 단위로 집계한 뒤 기존 큐브에 더하기만 함 (원본 재스캔 없음)
+- 이미 병합한 파일은 원장(.sources.json)으로 건너뜀
+실행: python occupancy_cube.py add reservation_4w_250808.csv
+      python occupancy_cube.py report --by state province
+"""
+
+import argparse, json, os, time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from room_table import key_column, load_room_table
+
+# 기본 설정 --------------------------------------------------------------------
+CUBE_FILE = "occupancy_cube.csv"
+KEYS = ["state", "province", "town", "room_cnt", "pyeong_bucket", "analysis_date"]
+PYEONG_EDGES = [0, 5, 8, 10, 13, 16, 20, 25, 30, 40, np.inf]
+OCC_EDGES = np.linspace(0, 100, 11)  # 10% 구간
+FEE_EDGES = [
+    0,
+    100_000,
+    150_000,
+    200_000,
+    250_000,
+    300_000,
+    400_000,
+    500_000,
+    700_000,
+    1_000_000,
+    np.inf,
+]
+MEASURES = {
+    "occ": ("occupancy_rate_percent", OCC_EDGES),
+    "fee": ("using_fee", FEE_EDGES),
+}
+
+
+def value_columns() -> List[str]:
+    cols = []
+    for m, (_, edges) in MEASURES.items():
+        cols += [f"{m}_n", f"{m}_sum", f"{m}_sumsq"]
+        cols += [f"{m}_h{i}" for i in range(len(edges) - 1)]
+    return cols
+
+
+VALUE_COLUMNS = value_columns()
+
+
+# 집계 -------------------------------------------------------------------------
+def snapshot_cells(path: str) -> pd.DataFrame:
+    """reservation 스냅샷 1개 → 셀 단위 합계"""
+    usecols = ["rid", "state", "province", "town", "room_cnt", "pyeong_size"]
+    usecols += ["analysis_start_date"] + [col for col, _ in MEASURES.values()]
+    df = load_room_table(path, usecols=usecols, dedupe=True)
+
+    keyed = pd.DataFrame(
+        {
+            "state": key_column(df["state"]),
+            "province": key_column(df["province"]),
+            "town": key_column(df["town"]),
+            "room_cnt": df["room_cnt"].fillna(-1).astype(int),
+            "pyeong_bucket": pd.cut(
+                df["pyeong_size"], PYEONG_EDGES, right=False
+            ).astype(str),
+            "analysis_date": key_column(df["analysis_start_date"]),
+        }
+    )
+    for m, (col, edges) in MEASURES.items():
+        v = pd.to_numeric(df[col], errors="coerce").to_numpy(float)
+        ok = ~np.isnan(v)
+        keyed[f"{m}_n"] = ok.astype(np.int64)
+        keyed[f"{m}_sum"] = np.where(ok, v, 0.0)
+        keyed[f"{m}_sumsq"] = np.where(ok, v * v, 0.0)
+        # 상한값(100%)은 마지막 구간에 포함
+        bins = np.clip(np.searchsorted(edges, v, side="right") - 1, 0, len(edges) - 2)
+        for i in range(len(edges) - 1):
+            keyed[f"{m}_h{i}"] = (ok & (bins == i)).astype(np.int64)
+
+    return keyed.groupby(KEYS, as_index=False, observed=True)[VALUE_COLUMNS].sum()
+
+
+class OccupancyCube:
+    def __init__(self, path: str = CUBE_FILE):
+        self.path = path
+        self.ledger_path = os.path.splitext(path)[0] + ".sources.json"
+        if os.path.exists(path):
+            self.cells = pd.read_csv(path, encoding="utf-8-sig", keep_default_na=False)
+        else:
+            self.cells = pd.DataFrame(columns=KEYS + VALUE_COLUMNS)
+        self.sources = []
+        if os.path.exists(self.ledger_path):
+            with open(self.ledger_path, encoding="utf-8") as f:
+                self.sources = json.load(f)
+
+    def add(self, path: str) -> bool:
+        source = {"file": os.path.basename(path), "size": os.path.getsize(path)}
+        if source in self.sources:
+            return False
+        new_cells = snapshot_cells(path)
+        parts = [self.cells, new_cells] if len(self.cells) else [new_cells]
+        merged = pd.concat(parts, ignore_index=True)
+        merged[VALUE_COLUMNS] = merged[VALUE_COLUMNS].apply(pd.to_numeric)
+        merged["room_cnt"] = merged["room_cnt"].astype(int)
+        self.cells = merged.groupby(KEYS, as_index=False)[VALUE_COLUMNS].sum()
+        self.sources.append(source)
+        return True
+
+    def save(self):
+        self.cells.to_csv(self.path, index=False, encoding="utf-8-sig")
+        with open(self.ledger_path, "w", encoding="utf-8") as f:
+            json.dump(self.sources, f, ensure_ascii=False, indent=1)
+
+    def rollup(self, by: List[str]) -> pd.DataFrame:
+        """원하는 차원으로 합친 뒤 평균/표준편차 계산 (히스토그램 컬럼은 합계 그대로)"""
+        agg = self.cells.groupby(by, as_index=False)[VALUE_COLUMNS].sum()
+        for m in MEASURES:
+            n = agg[f"{m}_n"].replace(0, np.nan)
+            mean = agg[f"{m}_sum"] / n
+            var = (agg[f"{m}_sumsq"] / n - mean**2).clip(lower=0)
+            agg[f"{m}_mean"] = mean.round(2)
+            agg[f"{m}_std"] = np.sqrt(var).round(2)
+        return agg
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="예약률 롤업 큐브")
+    parser.add_argument("--cube", default=CUBE_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="reservation 스냅샷 병합")
+    add.add_argument("csvs", nargs="+")
+    report = sub.add_parser("report", help="집계 조회")
+    report.add_argument("--by", nargs="+", default=["state", "province"], choices=KEYS)
+    report.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    cube = OccupancyCube(args.cube)
+    if args.command == "add":
+        for path in args.csvs:
+            t0 = time.time()
+            if cube.add(path):
+                print(f"➕ {os.path.basename(path)} 병합 ({time.time() - t0:.2f}초)")
+            else:
+                print(f"⏭️ {os.path.basename(path)} 이미 병합됨")
+        cube.save()
+        print(
+            f"🧊 큐브 셀 {len(cube.cells):,}개 | 스냅샷 {len(cube.sources)}개 → {args.cube}"
+        )
+    else:
+        agg = cube.rollup(args.by)
+        cols = args.by + ["occ_n", "occ_mean", "occ_std", "fee_mean", "fee_std"]
+        if args.output:
+            agg.to_csv(args.output, index=False, encoding="utf-8-sig")
+            print(f"📁 저장 위치: {args.output}")
+        else:
+            print(agg[cols].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+33m2 이력이 없는 네이버 매물의 예약률/매출 예측 (NumPy 전용, GPU 불필요)
+- 학습: reservation 스냅샷 → 고정 특성(위치 RBF + 평형/방수/요금/할인/슈퍼호스트)으로 릿지 회귀
+- 특성 공간이 고정이라 XᵀX, Xᵀy 누적만 저장 → 새 스냅샷은 통계에 더하기만 하면 재학습 완료
+- 모델 2개: 주당 요금 모델(위치/평형/방수) + 예약률 모델(요금·할인 포함)
+- 위치 RBF 격자(수도권) 밖의 방은 학습/채점에서 제외 (격자 밖은 다항항만 남아 외삽됨)
+- 채점: 네이버 매물마다 요금 추정 → 예약률 예측 → 월 매출, chunk 단위 벡터 연산
+실행: python occupancy_model.py train reservation_4w_250808.csv
+      python occupancy_model.py score naver_20250808_final.csv
+"""
+
+import argparse, json, os, time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+MODEL_FILE = "occupancy_model.npz"
+RIDGE_LAMBDA = 1.0
+CHUNK_SIZE = 50_000
+WEEKS_PER_MONTH = 4
+M2_PER_PYEONG = 3.3058
+# 수도권 위치 RBF 중심 (0.1° 격자) — 고정이어야 증분 학습 통계가 호환됨
+RBF_LATS = np.arange(37.1, 38.0, 0.1)
+RBF_LNGS = np.arange(126.5, 127.6, 0.1)
+RBF_SIGMA = 0.06
+GRID_MARGIN = 2 * RBF_SIGMA  # 격자 가장자리 중심에서 이만큼까지 허용
+LAT0, LNG0 = 37.5, 127.0
+
+
+# 특성 -------------------------------------------------------------------------
+def location_features(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    cy, cx = np.meshgrid(RBF_LATS, RBF_LNGS, indexing="ij")
+    d2 = (lat[:, None] - cy.ravel()[None, :]) ** 2 + (
+        lng[:, None] - cx.ravel()[None, :]
+    ) ** 2
+    dlat, dlng = lat - LAT0, lng - LNG0
+    poly = np.column_stack([dlat, dlng, dlat * dlng, dlat**2, dlng**2])
+    return np.hstack([np.exp(-d2 / (2 * RBF_SIGMA**2)), poly])
+
+
+def in_grid(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """RBF 격자 범위(+GRID_MARGIN) 안인지, NaN 은 False"""
+    return (
+        (lat >= RBF_LATS[0] - GRID_MARGIN)
+        & (lat <= RBF_LATS[-1] + GRID_MARGIN)
+        & (lng >= RBF_LNGS[0] - GRID_MARGIN)
+        & (lng <= RBF_LNGS[-1] + GRID_MARGIN)
+    )
+
+
+def base_features(lat, lng, pyeong, room_cnt) -> np.ndarray:
+    pyeong = np.nan_to_num(pyeong, nan=10.0)
+    room_cnt = np.nan_to_num(room_cnt, nan=1.0)
+    unit = np.column_stack(
+        [np.ones(len(lat)), np.log1p(pyeong), np.minimum(room_cnt, 4) / 4]
+    )
+    return np.hstack([unit, location_features(lat, lng)])
+
+
+def occupancy_features(base, fee, longterm, early, super_host) -> np.ndarray:
+    log_fee = np.log(np.clip(np.nan_to_num(fee, nan=300_000), 50_000, None)) - 12.5
+    return np.hstack(
+        [
+            base,
+            np.column_stack(
+                [
+                    log_fee,
+                    log_fee**2,
+                    np.nan_to_num(longterm) / 100,
+                    np.nan_to_num(early) / 100,
+                    np.nan_to_num(super_host).astype(float),
+                ]
+            ),
+        ]
+    )
+
+
+def to_float(series: pd.Series) -> np.ndarray:
+    values = pd.to_numeric(series, errors="coerce")
+    if series.dtype == object:  # "True"/"False" 플래그
+        flags = series.astype(str).str.lower().map({"true": 1.0, "false": 0.0})
+        values = values.fillna(flags)
+    return values.to_numpy(float)
+
+
+# 모델 -------------------------------------------------------------------------
+class RidgeStats:
+    """XᵀX / Xᵀy / n 누적 → 언제든 릿지 해 계산"""
+
+    def __init__(self, dim: int):
+        self.xtx = np.zeros((dim, dim))
+        self.xty = np.zeros(dim)
+        self.n = 0
+
+    def add(self, X: np.ndarray, y: np.ndarray):
+        ok = ~np.isnan(y) & np.isfinite(X).all(axis=1)
+        X, y = X[ok], y[ok]
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.n += len(y)
+
+    def solve(self, lam: float = RIDGE_LAMBDA) -> np.ndarray:
+        reg = lam * np.eye(len(self.xty))
+        reg[0, 0] = 0.0  # 절편은 규제하지 않음
+        return np.linalg.solve(self.xtx + reg, self.xty)
+
+
+class OccupancyModel:
+    def __init__(self, path: str = MODEL_FILE):
+        self.path = path
+        dim_base = base_features(*(np.zeros(1),) * 4).shape[1]
+        dim_occ = dim_base + 5
+        self.fee = RidgeStats(dim_base)
+        self.occ = RidgeStats(dim_occ)
+        self.discounts = np.zeros(3)  # 장기할인 합, 조기할인 합, 개수
+        self.sources: List[Dict] = []
+        if os.path.exists(path):
+            data = np.load(path, allow_pickle=False)
+            if data["fee_xtx"].shape == self.fee.xtx.shape:
+                self.fee.xtx, self.fee.xty = data["fee_xtx"], data["fee_xty"]
+                self.occ.xtx, self.occ.xty = data["occ_xtx"], data["occ_xty"]
+                self.fee.n, self.occ.n = int(data["fee_n"]), int(data["occ_n"])
+                self.discounts = data["discounts"]
+                self.sources = json.loads(str(data["sources"]))
+            else:
+                print("⚠️ 특성 구성이 바뀌어 기존 모델 통계를 폐기합니다")
+
+    def train(self, path: str) -> bool:
+        source = {"file": os.path.basename(path), "size": os.path.getsize(path)}
+        if source in self.sources:
+            return False
+        df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+        df = df.drop_duplicates(subset="rid", keep="last")
+        lat, lng = to_float(df["lat"]), to_float(df["lng"])
+        ok = in_grid(lat, lng)
+        if (~ok).any():
+            print(
+                f"⚠️ {os.path.basename(path)}: 격자 밖/좌표 없는 방 {(~ok).sum():,}개 제외"
+            )
+        df, lat, lng = df[ok], lat[ok], lng[ok]
+
+        fee = to_float(df["using_fee"])
+        longterm = to_float(df["longterm_discount_per"])
+        early = to_float(df["early_discount_per"])
+        base = base_features(
+            lat, lng, to_float(df["pyeong_size"]), to_float(df["room_cnt"])
+        )
+        self.fee.add(base, np.log(np.clip(fee, 50_000, None)))
+        X = occupancy_features(
+            base, fee, longterm, early, to_float(df["is_super_host"])
+        )
+        self.occ.add(X, to_float(df["occupancy_rate_percent"]))
+
+        self.discounts += [np.nansum(longterm), np.nansum(early), len(df)]
+        self.sources.append(source)
+        return True
+
+    def save(self):
+        np.savez(
+            self.path,
+            fee_xtx=self.fee.xtx,
+            fee_xty=self.fee.xty,
+            fee_n=self.fee.n,
+            occ_xtx=self.occ.xtx,
+            occ_xty=self.occ.xty,
+            occ_n=self.occ.n,
+            discounts=self.discounts,
+            sources=json.dumps(self.sources, ensure_ascii=False),
+        )
+
+    def score(self, df: pd.DataFrame, chunksize: int = CHUNK_SIZE) -> pd.DataFrame:
+        """네이버 매물(위도/경도/전용면적) → 예상주당요금, 예상예약률, 예상월매출"""
+        w_fee, w_occ = self.fee.solve(), self.occ.solve()
+        n = max(self.discounts[2], 1)
+        longterm_mean, early_mean = self.discounts[0] / n, self.discounts[1] / n
+
+        out = np.full((len(df), 3), np.nan)
+        lat_all, lng_all = to_float(df["위도"]), to_float(df["경도"])
+        pyeong_all = to_float(df["전용면적"]) / M2_PER_PYEONG
+        for s in range(0, len(df), chunksize):
+            lat, lng = lat_all[s : s + chunksize], lng_all[s : s + chunksize]
+            pyeong = pyeong_all[s : s + chunksize]
+            ok = in_grid(lat, lng)
+            # 방 수 정보가 없으므로 평형으로 추정
+            room_cnt = np.select([pyeong < 13, pyeong < 20], [1, 2], 3).astype(float)
+            base = base_features(lat[ok], lng[ok], pyeong[ok], room_cnt[ok])
+            fee = np.exp(base @ w_fee)
+            k = len(fee)
+            X = occupancy_features(
+                base,
+                fee,
+                np.full(k, longterm_mean),
+                np.full(k, early_mean),
+                np.zeros(k),
+            )
+            occ = np.clip(X @ w_occ, 0, 100)
+            block = out[s : s + chunksize]
+            block[ok] = np.column_stack([fee, occ, fee * WEEKS_PER_MONTH * occ / 100])
+
+        result = df.copy()
+        result["예상주당요금"] = np.round(out[:, 0], -3)
+        result["예상예약률"] = np.round(out[:, 1], 2)
+        result["예상월매출"] = np.round(out[:, 2], -3)
+        return result
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="네이버 매물 예약률 예측")
+    parser.add_argument("--model", default=MODEL_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="reservation 스냅샷으로 증분 학습")
+    train.add_argument("csvs", nargs="+")
+    score = sub.add_parser("score", help="네이버 CSV 채점")
+    score.add_argument("naver_csv")
+    score.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    model = OccupancyModel(args.model)
+    t0 = time.time()
+    if args.command == "train":
+        for path in args.csvs:
+            if model.train(path):
+                print(f"📚 {os.path.basename(path)} 학습 반영")
+            else:
+                print(f"⏭️ {os.path.basename(path)} 이미 반영됨")
+        model.save()
+        print(
+            f"🧠 누적 학습 표본 {model.occ.n:,}개 | 스냅샷 {len(model.sources)}개 → {args.model}"
+        )
+    else:
+        if model.occ.n == 0:
+            raise SystemExit("❌ 학습된 모델 없음 - train 먼저 실행하세요")
+        df = pd.read_csv(args.naver_csv, dtype=str, encoding="utf-8-sig")
+        scored = model.score(df)
+        output = args.output or os.path.splitext(args.naver_csv)[0] + "_scored.csv"
+        scored.to_csv(output, index=False, encoding="utf-8-sig")
+        print(
+            f"🏷️ {len(scored):,}개 채점 | 평균 예상예약률 {scored['예상예약률'].mean():.1f}%"
+        )
+        print(f"📁 저장 위치: {output}")
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
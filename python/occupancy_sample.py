@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+층화 표본 추출 예약률 추정 (구역별 예약률만 필요할 때 전체 방 대신 일부만 확인)
+- 층: province × town × room_cnt (--by 로 변경), 층마다 방 순서를 섞어 앞에서부터 확인
+- 라운드마다 층별 평균 / 95% 신뢰구간(t 분포 + 유한모집단 보정) 계산 → 반폭이 목표(--target, %p)보다 크면
+  필요한 표본 수(n = (t·s/h)² 보정)만큼 더 확인, 층의 방을 다 확인하면 종료
+- 결과: 층별 추정치 ± 오차 + 전체 층화 추정치, 실제 요청 수 / 전수 조사 요청 수
+  (응답이 하나도 없는 층은 추정치/신뢰구간을 비우고 따로 집계)
+- --replay 로 지난 reservation CSV 의 예약률을 응답 대신 사용 → 요청 없이 정확도/절감률 확인
+실행: python occupancy_sample.py deduplicated_samsam_room_data.csv --target 10
+      python occupancy_sample.py ../next/public/room/room_250803.csv \\
+          --replay ../next/public/reservation/reservation_4w_250808.csv
+"""
+
+import argparse, math, random, time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+STRATA = ["province", "town", "room_cnt"]
+TARGET_HALFWIDTH = 10.0  # 예약률 %p (95% 신뢰구간 반폭)
+MIN_SAMPLE = 5  # 층별 첫 라운드 표본 (층이 더 작으면 전수)
+MAX_GROWTH = (
+    2.0  # 라운드당 표본 최대 증가 배수 (분산 추정이 불안정한 초반 과대 추출 방지)
+)
+MAX_ROUNDS = 8
+PRIOR_WEIGHT = (
+    10  # 층 분산을 전체 층내 분산 쪽으로 당기는 가상 표본 수 (작은 층의 0 분산 방지)
+)
+Z95 = 1.959964
+SEED = 33
+
+
+# 통계 -------------------------------------------------------------------------
+def t_critical(df: int) -> float:
+    """양측 95% t 임계값 근사 (Cornish-Fisher, scipy 없이)"""
+    if df <= 0:
+        return float("inf")
+    z = Z95
+    return z + (z**3 + z) / (4 * df) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * df**2)
+
+
+def pooled_variance(strata: List["Stratum"]) -> float:
+    """층내 분산의 가중 평균 Σ(n_h-1)s_h² / Σ(n_h-1)"""
+    num = den = 0.0
+    for s in strata:
+        if len(s.values) >= 2:
+            num += float(np.var(s.values, ddof=1)) * (len(s.values) - 1)
+            den += len(s.values) - 1
+    return num / den if den else 0.0
+
+
+def shrunk_variance(values: List[float], prior: float) -> float:
+    """층 표본분산을 전체 층내 분산 prior 쪽으로 축소 (표본이 적을수록 prior 비중 큼)"""
+    n = len(values)
+    s2 = float(np.var(values, ddof=1)) if n >= 2 else 0.0
+    return ((n - 1) * s2 + PRIOR_WEIGHT * prior) / (n - 1 + PRIOR_WEIGHT)
+
+
+def interval(values: List[float], population: int, prior: float = 0.0) -> Dict:
+    """표본 평균, 95% 반폭 (축소 분산 + 유한모집단 보정)"""
+    n = len(values)
+    mean = float(np.mean(values)) if n else float("nan")
+    if n >= population:
+        return {"mean": mean, "halfwidth": 0.0, "var_mean": 0.0}
+    if n < 2:
+        return {"mean": mean, "halfwidth": float("inf"), "var_mean": float("inf")}
+    var_mean = shrunk_variance(values, prior) / n * (1 - n / population)
+    return {
+        "mean": mean,
+        "halfwidth": t_critical(n - 1) * math.sqrt(var_mean),
+        "var_mean": var_mean,
+    }
+
+
+def required_sample(
+    values: List[float], population: int, target: float, prior: float
+) -> int:
+    """반폭 target 에 필요한 표본 수 (축소 분산 기준, 유한모집단 보정)"""
+    n = len(values)
+    s2 = shrunk_variance(values, prior)
+    if s2 == 0:
+        return min(population, n * 2)
+    n0 = t_critical(max(n - 1, 1)) ** 2 * s2 / target**2
+    return min(population, math.ceil(n0 / (1 + n0 / population)))
+
+
+# 추출 -------------------------------------------------------------------------
+class Stratum:
+    def __init__(self, key, rows: List[Dict], rng: random.Random):
+        self.key = key
+        self.rows = rows[:]
+        rng.shuffle(self.rows)
+        self.values: List[float] = []
+        self.next = 0  # 다음에 확인할 방 위치
+        self.requests = 0
+
+    @property
+    def population(self) -> int:
+        return len(self.rows)
+
+    def exhausted(self) -> bool:
+        return self.next >= self.population
+
+    def draw(self, n: int) -> List[Dict]:
+        batch = self.rows[self.next : self.next + n]
+        self.next += len(batch)
+        return batch
+
+
+def sample_strata(
+    rows: List[Dict],
+    by: List[str],
+    measure: Callable[[Dict], Optional[float]],
+    target: float,
+    seed: int = SEED,
+) -> Tuple[List[Stratum], float]:
+    """층별로 반폭이 target 이하가 되거나 방을 다 볼 때까지 라운드 반복"""
+    rng = random.Random(seed)
+    groups: Dict = {}
+    for row in rows:
+        groups.setdefault(tuple(row.get(c, "") for c in by), []).append(row)
+    strata = [Stratum(k, v, rng) for k, v in sorted(groups.items())]
+
+    prior = 0.0
+    for rnd in range(1, MAX_ROUNDS + 1):
+        active = [
+            s
+            for s in strata
+            if not s.exhausted()
+            and (
+                not s.values
+                or interval(s.values, s.population, prior)["halfwidth"] > target
+            )
+        ]
+        if not active:
+            break
+        planned = 0
+        for s in active:
+            if not s.values:
+                want = min(MIN_SAMPLE, s.population)
+            else:
+                need = required_sample(s.values, s.population, target, prior)
+                want = min(need, math.ceil(len(s.values) * MAX_GROWTH)) - s.next
+            for row in s.draw(max(want, 1)):
+                value = measure(row)
+                s.requests += 1
+                planned += 1
+                if value is not None:
+                    s.values.append(value)
+        prior = pooled_variance(strata)
+        checked = sum(s.next for s in strata)
+        print(
+            f"🔁 라운드 {rnd}: 층 {len(active):,}개에서 {planned:,}개 확인 (누적 {checked:,} / {len(rows):,})"
+        )
+    return strata, prior
+
+
+# 결과 -------------------------------------------------------------------------
+def summarize(strata: List[Stratum], by: List[str], prior: float) -> pd.DataFrame:
+    """층별 추정치 (checked = 확인한 방, sampled = 응답이 있던 방)"""
+    records = []
+    for s in strata:
+        row = {
+            **dict(zip(by, s.key)),
+            "rooms": s.population,
+            "checked": s.next,
+            "sampled": len(s.values),
+        }
+        if s.values:
+            ci = interval(s.values, s.population, prior)
+            row |= {
+                "occupancy_mean": round(ci["mean"], 2),
+                "ci_low": round(max(ci["mean"] - ci["halfwidth"], 0.0), 2),
+                "ci_high": round(min(ci["mean"] + ci["halfwidth"], 100.0), 2),
+                "halfwidth": round(ci["halfwidth"], 2),
+                "var_mean": ci["var_mean"],
+            }
+        else:
+            # 응답이 하나도 없는 층 → 추정/신뢰구간 없음 (빈 칸)
+            row |= dict.fromkeys(
+                ["occupancy_mean", "ci_low", "ci_high", "halfwidth", "var_mean"],
+                np.nan,
+            )
+        records.append(row)
+    return pd.DataFrame(records)
+
+
+def overall(table: pd.DataFrame) -> Dict:
+    """층화 추정: Σ N_h ȳ_h / N, 분산 Σ (N_h/N)² Var(ȳ_h)"""
+    valid = table[table["sampled"] > 0]
+    w = valid["rooms"] / valid["rooms"].sum()
+    mean = float((w * valid["occupancy_mean"]).sum())
+    var = float((w**2 * valid["var_mean"].replace(np.inf, np.nan).fillna(0)).sum())
+    return {"mean": mean, "halfwidth": Z95 * math.sqrt(var)}
+
+
+def replay_measure(path: str) -> Callable[[Dict], Optional[float]]:
+    df = pd.read_csv(
+        path, usecols=["rid", "occupancy_rate_percent"], dtype={"rid": str}
+    ).drop_duplicates(subset="rid", keep="last")
+    known = dict(
+        zip(df["rid"], pd.to_numeric(df["occupancy_rate_percent"], errors="coerce"))
+    )
+    return lambda row: (
+        None if pd.isna(known.get(row["rid"], np.nan)) else float(known[row["rid"]])
+    )
+
+
+def live_measure(checker) -> Callable[[Dict], Optional[float]]:
+    analyzer = checker.StealthAnalyzer()
+    if (
+        not analyzer.setup_browser()
+        or not analyzer.login()
+        or not analyzer.extract_session()
+    ):
+        analyzer.close()
+        raise SystemExit("⛔ 초기화 실패")
+    analyzer.driver.quit()
+    analyzer.driver = None
+
+    def measure(row: Dict) -> Optional[float]:
+        req_fail = analyzer.req_fail
+        try:
+            res = analyzer.analyze_room(row)
+        except Exception as e:
+            print(f"\n❌ {row.get('room_name', 'Unknown')} 오류:{e}")
+            return None
+        time.sleep(random.uniform(checker.ROOM_DELAY_MIN, checker.ROOM_DELAY_MAX))
+        if analyzer.req_fail - req_fail >= res["months_analyzed"]:
+            return None  # 요청 실패를 0% 로 세지 않음
+        return res["occupancy_rate_percent"]
+
+    measure.analyzer = analyzer
+    return measure
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="층화 표본 예약률 추정")
+    parser.add_argument("rooms_csv")
+    parser.add_argument("--by", nargs="+", default=STRATA)
+    parser.add_argument(
+        "--target", type=float, default=TARGET_HALFWIDTH, help="95%% 반폭 (%%p)"
+    )
+    parser.add_argument("--replay", help="응답 대신 사용할 reservation CSV (요청 없음)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+
+    t0 = time.time()
+    rooms = pd.read_csv(args.rooms_csv, dtype=str, encoding="utf-8-sig").fillna("")
+    rooms = rooms.drop_duplicates(subset="rid", keep="last")
+    rows = rooms.to_dict(orient="records")
+    print(
+        f"📂 {args.rooms_csv}: 방 {len(rows):,}개 | 층 기준 {args.by} | 목표 ±{args.target}%p"
+    )
+
+    if args.replay:
+        measure = replay_measure(args.replay)
+        months = 2
+    else:
+        from pipeline import load_script
+
+        checker = load_script("samsam_reservation_check", "samsam-resevation-check.py")
+        measure = live_measure(checker)
+        months = len(checker.get_4week_date_range()[3])
+    try:
+        strata, prior = sample_strata(rows, args.by, measure, args.target, args.seed)
+    finally:
+        if not args.replay:
+            print("\n" + measure.analyzer.http_stats.summary())
+            measure.analyzer.close()
+
+    table = summarize(strata, args.by, prior)
+    total = overall(table)
+    checked = sum(s.requests for s in strata)
+    no_data = table["sampled"] == 0
+    wide = ~no_data & (table["halfwidth"] > args.target)
+    round_limit = wide & (table["checked"] < table["rooms"])
+    print(
+        f"\n📊 전체 층화 추정: {total['mean']:.1f}% ± {total['halfwidth']:.1f}%p "
+        f"| 층 {len(table):,}개 (라운드 한도로 목표 미달 {round_limit.sum():,}개, "
+        f"응답 부족 {(wide & ~round_limit).sum():,}개, 응답 없음 {no_data.sum():,}개)"
+    )
+    print(
+        f"🔌 확인 {checked:,}개 / {len(rows):,}개 = 요청 {checked * months:,} / {len(rows) * months:,} "
+        f"({checked / max(len(rows), 1) * 100:.1f}%)"
+    )
+    if args.replay:
+        # 전수 값과 비교 (replay 에서만 가능)
+        truth = pd.DataFrame(
+            {
+                **{c: [r.get(c, "") for r in rows] for c in args.by},
+                "occ": [measure(r) for r in rows],
+            }
+        ).dropna()
+        census = truth.groupby(args.by)["occ"].mean().rename("census").reset_index()
+        sampled = (table["sampled"] > 0) & (table["sampled"] < table["rooms"])
+        cmp = table[sampled].merge(census, on=args.by)
+        covered = (
+            (cmp["census"] >= cmp["ci_low"]) & (cmp["census"] <= cmp["ci_high"])
+        ).mean()
+        err = (cmp["occupancy_mean"] - cmp["census"]).abs()
+        print(
+            f"🎯 전수 대비: 평균 절대 오차 {err.mean():.2f}%p, 최대 {err.max():.2f}%p, "
+            f"표본 층 신뢰구간 포함률 {covered * 100:.1f}% | 전체 전수 평균 {truth['occ'].mean():.1f}%"
+        )
+
+    output = args.output or f"occupancy_estimate_{datetime.now():%y%m%d}.csv"
+    table.drop(columns="var_mean").to_csv(output, index=False, encoding="utf-8-sig")
+    print(f"⏱️ 소요 시간: {time.time() - t0:.1f}초")
+    print(f"📁 저장 위치: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+33m2 검색 → 중복 제거 → 예약률 확인 스트리밍 파이프라인
+- 생산자 스레드: MetropolitanCrawler 가 지역/세분화 키워드를 훑으면서 새 rid(전역 RidIndex 기준)를 바로 큐에 넣음
+- 소비자(메인 스레드): StealthAnalyzer 가 큐에서 꺼내 analyze_room → BATCH_SIZE 마다 ReservationStore 에
+  방 차원 + 좁은 사실 행 추가, 끝날 때 넓은 결과 CSV 1회 생성 (예약 확인 스크립트와 같은 저장/재실행 방식)
+- 큐 크기 제한(QUEUE_SIZE)으로 역압: 확인이 밀리면 검색이 대기 → 메모리 일정
+- drop_duplicates.py 실행/파일명 변경 없이 검색 시작 몇 분 뒤부터 예약률 결과가 나옴
+- 검색 결과도 배치마다 임시 JSON lines 에 추가 → 끝날 때 한 번 CSV 로 변환 (메모리에는 rid 인덱스만)
+실행: python pipeline.py --output reservation_4w_250808.csv
+"""
+
+import argparse, csv, importlib.util, json, math, os, queue, random, threading, time
+from datetime import date
+from typing import Dict, List
+
+from profiling import profiled
+from reservation_schema import ReservationStore
+
+# 기본 설정 --------------------------------------------------------------------
+QUEUE_SIZE = 200
+BATCH_SIZE = 30
+HERE = os.path.dirname(os.path.abspath(__file__))
+REGION_TYPES = {"서울특별시": "seoul", "인천광역시": "incheon"}
+_DONE = object()  # 생산 종료 신호
+
+
+def load_script(name: str, filename: str):
+    """하이픈 파일명 스크립트를 모듈로 로드 (__main__ 블록은 실행되지 않음)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# 생산자 -----------------------------------------------------------------------
+def csv_value(v):
+    """None / NaN → 빈 칸 (pandas to_csv 와 동일)"""
+    return "" if v is None or (isinstance(v, float) and math.isnan(v)) else v
+
+
+class SearchSpool:
+    """검색 행을 배치마다 임시 JSON lines 에 추가, 끝날 때 전체 컬럼으로 CSV 변환
+    (방마다 평면화 컬럼이 달라서 헤더는 마지막에 확정 - 메모리에는 컬럼 이름만 보관)"""
+
+    def __init__(self, output: str):
+        self.output = output
+        self.path = output + ".part.jsonl"
+        self.columns: Dict[str, None] = {}  # 순서 있는 집합
+        self.pending: List[Dict] = []
+        self.rows = 0
+        open(self.path, "w", encoding="utf-8").close()
+
+    def add(self, rooms: List[Dict]):
+        self.pending.extend(rooms)
+        if len(self.pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            for room in self.pending:
+                self.columns.update(dict.fromkeys(room))
+                f.write(json.dumps(room, ensure_ascii=False, default=str) + "\n")
+        self.rows += len(self.pending)
+        self.pending.clear()
+
+    @profiled("save_results_complete")
+    def finalize(self, rid_index) -> int:
+        """임시 파일 → 최종 CSV (rid 별 search_keywords / region_names 포함)"""
+        self.flush()
+        if self.rows:
+            columns = list(self.columns) + [
+                c for c in ("search_keywords", "region_names") if c not in self.columns
+            ]
+            with open(self.path, encoding="utf-8") as src, open(
+                self.output, "w", newline="", encoding="utf-8-sig"
+            ) as dst:
+                writer = csv.DictWriter(dst, fieldnames=columns, restval="")
+                writer.writeheader()
+                for line in src:
+                    room = rid_index.annotate([json.loads(line)])[0]
+                    writer.writerow({k: csv_value(v) for k, v in room.items()})
+        os.remove(self.path)
+        return self.rows
+
+
+def start_producer(crawler_mod, rooms_q: queue.Queue, stats: Dict) -> threading.Thread:
+    spool = SearchSpool(crawler_mod.OUTPUT_FILE)
+
+    class StreamingCrawler(crawler_mod.MetropolitanCrawler):
+        def collect_new_rooms(self, rooms, keyword, region_name):
+            new_rooms = super().collect_new_rooms(rooms, keyword, region_name)
+            spool.add(new_rooms)
+            for room in new_rooms:
+                rooms_q.put(room)  # 큐가 가득 차면 여기서 대기 (역압)
+            stats["produced"] += len(new_rooms)
+            return new_rooms
+
+    crawler = StreamingCrawler()
+
+    def run():
+        try:
+            areas = [
+                (region, area)
+                for region, names in crawler_mod.METROPOLITAN_AREAS.items()
+                for area in names
+            ]
+            for i, (region, area) in enumerate(areas, 1):
+                if stats["stop"]:
+                    break
+                crawler.process_area_with_subdivision(area, region)
+                print(
+                    f"\n🛰️ 검색 [{i}/{len(areas)}] {region} {area} | 누적 {stats['produced']:,}개"
+                )
+                if i < len(areas):
+                    crawler.adaptive_delay(REGION_TYPES.get(region, "gyeonggi"))
+        except Exception as e:
+            print(f"\n❌ 검색 스레드 오류: {e}")
+        finally:
+            try:
+                saved = spool.finalize(crawler.rid_index)
+                print(f"\n💾 검색 결과 {saved:,}개 → {crawler_mod.OUTPUT_FILE}")
+            except Exception as e:
+                print(f"\n❌ 검색 결과 저장 실패: {e} (임시 파일: {spool.path})")
+            rooms_q.put(_DONE)
+            crawler.close()
+
+    thread = threading.Thread(target=run, name="search", daemon=True)
+    thread.start()
+    return thread
+
+
+# 소비자 -----------------------------------------------------------------------
+class BatchWriter:
+    """(방 행, analyze_room 결과) 배치 → ReservationStore (방은 차원 등록, 결과는 사실 행)"""
+
+    def __init__(self, store: ReservationStore, snapshot: str):
+        self.store = store
+        self.snapshot = snapshot
+        self.rows = 0
+
+    @profiled("save_batch")
+    def write(self, rooms: List[Dict], results: List[Dict]):
+        if not results:
+            return
+        keys = self.store.add_rooms(rooms, self.snapshot)
+        self.store.add_facts(results, keys, self.snapshot)
+        self.rows += len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="검색 → 예약률 확인 스트리밍 파이프라인"
+    )
+    parser.add_argument(
+        "-o", "--output", help="결과 CSV (기본: 예약 확인 스크립트의 OUTPUT_FILE)"
+    )
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    args = parser.parse_args()
+
+    crawler_mod = load_script("samsam_crawler", "samsam-crawler.py")
+    checker_mod = load_script("samsam_reservation_check", "samsam-resevation-check.py")
+    output = args.output or checker_mod.OUTPUT_FILE
+
+    t0 = time.time()
+    rooms_q: queue.Queue = queue.Queue(maxsize=args.queue_size)
+    stats = {"produced": 0, "stop": False, "max_queue": 0}
+
+    # 로그인 먼저 → 실패하면 검색 요청/임시 파일 없이 종료
+    analyzer = checker_mod.StealthAnalyzer()
+    if (
+        not analyzer.setup_browser()
+        or not analyzer.login()
+        or not analyzer.extract_session()
+    ):
+        analyzer.close()
+        raise SystemExit("⛔ 초기화 실패")
+    analyzer.driver.quit()
+    analyzer.driver = None
+    producer = start_producer(crawler_mod, rooms_q, stats)
+
+    # 같은 날 다시 실행하면 같은 스냅샷에 이어서 저장 (view 는 rid 별 최신 run 만)
+    writer = BatchWriter(ReservationStore(), date.today().strftime("%y%m%d"))
+    rooms: List[Dict] = []
+    results: List[Dict] = []
+    first_result = None
+    checked = 0
+    try:
+        while True:
+            room = rooms_q.get()
+            if room is _DONE:
+                break
+            stats["max_queue"] = max(stats["max_queue"], rooms_q.qsize() + 1)
+            try:
+                res = analyzer.analyze_room(room)
+            except Exception as e:
+                print(f"\n❌ {room.get('room_name', 'Unknown')} 오류:{e}")
+                continue
+            checked += 1
+            rooms.append(room)
+            results.append(res)
+            if first_result is None:
+                first_result = time.time() - t0
+                print(f"\n⚡ 첫 예약률 결과: 시작 후 {first_result:.0f}초")
+            print(
+                f"\r🏠 확인 {checked:,} / 검색 {stats['produced']:,} | 대기 {rooms_q.qsize():3d} | "
+                f"{str(room.get('room_name', ''))[:25]:<25} | 4주:{res['occupancy_rate_percent']:5.1f}%",
+                end="",
+                flush=True,
+            )
+            if len(results) >= BATCH_SIZE:
+                writer.write(rooms, results)
+                rooms.clear()
+                results.clear()
+            time.sleep(
+                random.uniform(checker_mod.ROOM_DELAY_MIN, checker_mod.ROOM_DELAY_MAX)
+            )
+    except KeyboardInterrupt:
+        print("\n🛑 사용자 중단 - 검색도 현재 지역 후 종료")
+        stats["stop"] = True
+        # 생산자가 put 에서 막혀 있지 않도록 큐 비우기
+        while producer.is_alive():
+            try:
+                rooms_q.get(timeout=1)
+            except queue.Empty:
+                pass
+    finally:
+        writer.write(rooms, results)
+        print("\n" + analyzer.http_stats.summary())
+        analyzer.close()
+    # 호환 뷰: 지도/후속 스크립트용 넓은 결과 CSV (세부 분해 컬럼 포함)
+    exported = writer.store.export(output, writer.snapshot)
+
+    elapsed = time.time() - t0
+    print(f"\n✅ 완료! 검색 {stats['produced']:,}개 → 확인 {writer.rows:,}개")
+    if first_result is not None:
+        print(
+            f"⚡ 첫 결과까지 {first_result:.0f}초 | 큐 최대 {stats['max_queue']}/{args.queue_size}"
+        )
+    print(f"⏰ 총 소요시간: {int(elapsed // 60):02d}:{int(elapsed % 60):02d}")
+    print(f"📁 결과 파일 → {output} ({exported:,}행, 스냅샷 {writer.snapshot})")
+
+
+if __name__ == "__main__":
+    main()
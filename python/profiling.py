@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+크롤러/파이프라인 공용 구간 프로파일러 (선택 사항, 기본 꺼짐)
+- 이름 붙인 구간(fetch_month, analyze_room, fetch_area_rooms, flatten_room_data, extract_property_info, save_* 등)마다
+  호출 수 / wall / CPU(스레드) / sleep 시간 / 자식 구간 제외 self 시간 집계
+- 대기 = wall - CPU: sleep(요청 간격 딜레이) 과 나머지(네트워크/TLS/디스크 I/O 대기)로 나눠서 보고
+- PROFILE=cprofile: 스레드별 가장 바깥 구간 단위로 cProfile 누적 → <구간>.prof (snakeviz/pstats 로 확인)
+- PROFILE=memory: tracemalloc 으로 구간별 최대 추가 메모리(peak) 기록
+- 실행 종료 시 profiles/<스크립트>_<시각>/report.json 저장 + 표 출력
+사용: @profiled("fetch_month") / with stage("save_batch"): ...
+실행: PROFILE=1 python samsam-resevation-check.py          # 시간만
+      PROFILE=all python samsam-crawler.py                 # 시간 + cProfile + 메모리
+      python profiling.py profiles/<실행>/report.json [--prof analyze_room]
+"""
+
+import argparse, atexit, functools, json, os, sys, threading, time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# 기본 설정 --------------------------------------------------------------------
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+MODES = {m.strip() for m in os.getenv("PROFILE", "").lower().split(",") if m.strip()}
+ENABLED = bool(MODES) and not MODES <= {"0", "off"}
+USE_CPROFILE = ENABLED and bool(MODES & {"cprofile", "all"})
+USE_MEMORY = ENABLED and bool(MODES & {"memory", "all"})
+TOP_FUNCTIONS = 15
+
+
+# 집계 -------------------------------------------------------------------------
+class StageStats:
+    __slots__ = ("calls", "wall", "cpu", "sleep", "child_wall", "peak_bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = self.cpu = self.sleep = self.child_wall = 0.0
+        self.peak_bytes = 0
+
+    def as_dict(self) -> Dict:
+        wait = max(self.wall - self.cpu, 0.0)
+        return {
+            "calls": self.calls,
+            "wall_s": round(self.wall, 4),
+            "self_wall_s": round(self.wall - self.child_wall, 4),
+            "cpu_s": round(self.cpu, 4),
+            "wait_s": round(wait, 4),
+            "sleep_s": round(min(self.sleep, wait), 4),
+            "io_wait_s": round(max(wait - self.sleep, 0.0), 4),
+            "avg_ms": round(self.wall / self.calls * 1000, 2) if self.calls else 0,
+            "peak_kb": round(self.peak_bytes / 1024, 1),
+        }
+
+
+class _Frame:
+    """실행 중인 구간 1개 (스레드별 스택)"""
+
+    __slots__ = ("name", "wall0", "cpu0", "sleep", "child_wall", "mem0", "peak")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.sleep = self.child_wall = 0.0
+        self.mem0 = self.peak = 0
+        self.wall0 = time.perf_counter()
+        self.cpu0 = time.thread_time()
+
+
+class Profiler:
+    def __init__(self, script: str):
+        self.script = script
+        self.started = datetime.now()
+        self.wall0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+        self.stats: Dict[str, StageStats] = {}
+        self.profiles: Dict[str, "cProfile.Profile"] = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.run_dir = os.path.join(
+            PROFILE_DIR, f"{script}_{self.started.strftime('%Y%m%d_%H%M%S')}"
+        )
+        self._real_sleep = time.sleep
+
+    # -------- 구간 -----------------------
+    def stack(self) -> List[_Frame]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def enter(self, name: str):
+        stack = self.stack()
+        frame = _Frame(name)
+        if USE_MEMORY:
+            import tracemalloc
+
+            frame.mem0, peak = tracemalloc.get_traced_memory()
+            for parent in stack:  # reset 전에 지금까지의 peak 를 부모 구간에 반영
+                parent.peak = max(parent.peak, peak - parent.mem0)
+            tracemalloc.reset_peak()
+        if USE_CPROFILE and not stack:
+            # cProfile 은 스레드당 하나만 활성화 가능 → 가장 바깥 구간만
+            with self.lock:
+                if name not in self.profiles:
+                    import cProfile
+
+                    self.profiles[name] = cProfile.Profile()
+                prof = self.profiles[name]
+            try:
+                prof.enable()
+                self.local.prof = prof
+            except ValueError:
+                self.local.prof = None  # 다른 스레드가 같은 구간을 프로파일 중
+        stack.append(frame)
+
+    def exit(self):
+        stack = self.stack()
+        frame = stack.pop()
+        wall = time.perf_counter() - frame.wall0
+        cpu = time.thread_time() - frame.cpu0
+        if USE_MEMORY:
+            import tracemalloc
+
+            peak = max(tracemalloc.get_traced_memory()[1] - frame.mem0, frame.peak)
+            for parent in stack:
+                parent.peak = max(parent.peak, peak + frame.mem0 - parent.mem0)
+            frame.peak = peak
+        if stack:
+            stack[-1].child_wall += wall
+            stack[-1].sleep += frame.sleep
+        elif getattr(self.local, "prof", None) is not None:
+            self.local.prof.disable()
+            self.local.prof = None
+        with self.lock:
+            s = self.stats.setdefault(frame.name, StageStats())
+            s.calls += 1
+            s.wall += wall
+            s.cpu += cpu
+            s.sleep += frame.sleep
+            s.child_wall += frame.child_wall
+            s.peak_bytes = max(s.peak_bytes, frame.peak)
+
+    def sleep(self, seconds: float):
+        """time.sleep 대체: 현재 구간의 sleep 시간으로 기록"""
+        t0 = time.perf_counter()
+        try:
+            self._real_sleep(seconds)
+        finally:
+            stack = self.stack()
+            if stack:
+                stack[-1].sleep += time.perf_counter() - t0
+            else:
+                with self.lock:
+                    s = self.stats.setdefault("(구간 밖 sleep)", StageStats())
+                    s.calls += 1
+                    elapsed = time.perf_counter() - t0
+                    s.wall += elapsed
+                    s.sleep += elapsed
+
+    # -------- 보고서 ---------------------
+    def report(self) -> Dict:
+        with self.lock:
+            stages = {name: s.as_dict() for name, s in self.stats.items()}
+        wall = time.perf_counter() - self.wall0
+        cpu = time.process_time() - self.cpu0
+        return {
+            "script": self.script,
+            "argv": sys.argv,
+            "started": self.started.strftime("%Y-%m-%d %H:%M:%S"),
+            "modes": sorted(MODES),
+            "total": {
+                "wall_s": round(wall, 3),
+                "cpu_s": round(cpu, 3),
+                "wait_s": round(max(wall - cpu, 0.0), 3),
+            },
+            "stages": dict(
+                sorted(stages.items(), key=lambda kv: kv[1]["wall_s"], reverse=True)
+            ),
+        }
+
+    def write(self):
+        report = self.report()
+        if not report["stages"]:
+            return
+        os.makedirs(self.run_dir, exist_ok=True)
+        path = os.path.join(self.run_dir, "report.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        for name, prof in self.profiles.items():
+            prof.dump_stats(os.path.join(self.run_dir, f"{safe_name(name)}.prof"))
+        print_report(report)
+        print(f"📁 프로파일 보고서 → {path}")
+
+
+# 공개 API ---------------------------------------------------------------------
+_profiler: Optional[Profiler] = None
+
+
+def safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+def start(script: Optional[str] = None) -> Optional[Profiler]:
+    """PROFILE 이 켜져 있으면 프로파일러 시작 (첫 구간 진입 시 자동 호출)"""
+    global _profiler
+    if not ENABLED or _profiler is not None:
+        return _profiler
+    name = script or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+    _profiler = Profiler(safe_name(name) or "python")
+    if USE_MEMORY:
+        import tracemalloc
+
+        tracemalloc.start()
+    time.sleep = _profiler.sleep  # 스크립트들은 time.sleep(...) 으로 호출
+    atexit.register(_profiler.write)
+    return _profiler
+
+
+@contextmanager
+def stage(name: str):
+    """with stage("save_batch"): ... - PROFILE 이 꺼져 있으면 아무것도 하지 않음"""
+    if not ENABLED:
+        yield
+        return
+    prof = _profiler or start()
+    prof.enter(name)
+    try:
+        yield
+    finally:
+        prof.exit()
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """함수/메서드 데코레이터 - 꺼져 있으면 원래 함수를 그대로 반환 (오버헤드 없음)"""
+
+    def decorate(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            prof = _profiler or start()
+            prof.enter(label)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                prof.exit()
+
+        return wrapper
+
+    return decorate
+
+
+# 출력 -------------------------------------------------------------------------
+def print_report(report: Dict):
+    total = report["total"]
+    print(
+        f"\n⏱️ 프로파일 [{report['script']}] wall {total['wall_s']:.1f}s = "
+        f"CPU {total['cpu_s']:.1f}s + 대기 {total['wait_s']:.1f}s"
+    )
+    print(
+        f"  {'구간':<24}{'호출':>8}{'wall(s)':>10}{'self(s)':>10}{'CPU(s)':>9}"
+        f"{'sleep(s)':>10}{'I/O(s)':>9}{'평균(ms)':>10}{'peak(KB)':>10}"
+    )
+    for name, s in report["stages"].items():
+        print(
+            f"  {name[:24]:<24}{s['calls']:>8,}{s['wall_s']:>10.2f}{s['self_wall_s']:>10.2f}"
+            f"{s['cpu_s']:>9.2f}{s['sleep_s']:>10.2f}{s['io_wait_s']:>9.2f}"
+            f"{s['avg_ms']:>10.1f}{s['peak_kb']:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구간 프로파일 보고서 보기")
+    parser.add_argument("report", help="profiles/<실행>/report.json")
+    parser.add_argument("--prof", help="해당 구간 cProfile 상위 함수 출력")
+    parser.add_argument("--sort", default="cumulative", help="pstats 정렬 기준")
+    args = parser.parse_args()
+
+    with open(args.report, encoding="utf-8") as f:
+        print_report(json.load(f))
+    if args.prof:
+        import pstats
+
+        path = os.path.join(
+            os.path.dirname(args.report), f"{safe_name(args.prof)}.prof"
+        )
+        if not os.path.exists(path):
+            raise SystemExit(
+                f"❌ cProfile 덤프 없음: {path} (PROFILE=cprofile 로 실행)"
+            )
+        print(f"\n🔬 {args.prof} 상위 {TOP_FUNCTIONS}개 함수 ({args.sort})")
+        pstats.Stats(path).sort_stats(args.sort).print_stats(TOP_FUNCTIONS)
+
+
+if __name__ == "__main__":
+    main()
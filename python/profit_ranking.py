@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네이버 매물 ↔ 33m2 방 쌍별 수익성 랭킹
+- proximity_join.py 결과(매물ID, rid) 쌍 전체에 대해 벡터 연산으로 수익 계산
+- 예상 월 매출 = 주당 요금 × 4주 × 예약률 × (1 - 할인 가중치)
+- 순수익 = 예상 월 매출 - 네이버 월세 - 보증금 기회비용 (월세 없는 매물은 제외)
+- 같은 매물ID 는 그룹마다 가장 수익 높은 쌍 1개만 랭킹에 남김
+- province / town 별 상위 K개를 chunk 단위로 누적 갱신하여 지도용 랭킹 파일 저장
+실행: python profit_ranking.py naver_room_pairs.csv naver_final.csv reservation_4w_250808.csv
+"""
+
+import argparse, os, time
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from room_table import load_room_table
+
+# 기본 설정 --------------------------------------------------------------------
+OUTPUT_DIR = "profit_rank"
+TOP_K = 20
+CHUNK_SIZE = 200_000
+WEEKS_PER_MONTH = 4  # 지도(monthlyRevenue)와 동일 기준
+MANWON = 10_000  # 네이버 보증금/월세 단위 (만원)
+LONGTERM_SHARE = 0.5  # 장기 할인이 적용되는 예약 비중
+EARLY_SHARE = 0.2  # 조기 예약 할인이 적용되는 예약 비중
+DEPOSIT_RATE = 0.04  # 보증금 연 기회비용
+
+ROOM_COLUMNS = [
+    "rid",
+    "room_name",
+    "state",
+    "province",
+    "town",
+    "using_fee",
+    "longterm_discount_per",
+    "early_discount_per",
+    "occupancy_rate_percent",
+    "lat",
+    "lng",
+]
+NUMERIC_COLUMNS = ROOM_COLUMNS[5:]
+NAVER_COLUMNS = ["매물ID", "매물제목", "보증금", "월세", "위도", "경도"]
+GROUP_LEVELS = {
+    "province": ["state", "province"],
+    "town": ["state", "province", "town"],
+}
+
+
+# 로드 -------------------------------------------------------------------------
+def load_rooms(path: str) -> pd.DataFrame:
+    df = load_room_table(path, usecols=ROOM_COLUMNS, dedupe=True)
+    df = df.reindex(columns=ROOM_COLUMNS)
+    df["rid"] = df["rid"].astype(str)  # 쌍 테이블의 rid(문자열)와 join
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # 예약률 결측: 동 평균 → 구 평균 → 전체 평균 순으로 보간
+    occ = df["occupancy_rate_percent"]
+    df["occupancy_imputed"] = occ.isna()
+    for keys in GROUP_LEVELS["town"], GROUP_LEVELS["province"]:
+        occ = occ.fillna(
+            df.groupby(keys, dropna=False, observed=True)[occ.name].transform("mean")
+        )
+    df["occupancy_rate_percent"] = occ.fillna(occ.mean()).fillna(0)
+    return df.set_index("rid")
+
+
+def load_naver(path: str) -> pd.DataFrame:
+    df = pd.read_csv(
+        path, usecols=NAVER_COLUMNS, dtype={"매물ID": str}, encoding="utf-8-sig"
+    )
+    for col in ["보증금", "월세", "위도", "경도"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df.drop_duplicates(subset="매물ID", keep="last").set_index("매물ID")
+
+
+# 수익 계산 --------------------------------------------------------------------
+def score_pairs(pairs: pd.DataFrame, rooms: pd.DataFrame, naver: pd.DataFrame):
+    """쌍 테이블에 방/매물 속성을 붙이고 수익 지표를 벡터 연산으로 계산"""
+    df = pairs.join(rooms, on="rid", how="inner").join(naver, on="매물ID", how="inner")
+    # 월세 없는 매물은 비용을 알 수 없으므로 랭킹에서 제외 (0원 처리하면 최상위로 올라감)
+    df = df[df["월세"].notna()]
+
+    fee = df["using_fee"].fillna(0).to_numpy(float)
+    occ = df["occupancy_rate_percent"].to_numpy(float) / 100
+    discount = (
+        LONGTERM_SHARE * df["longterm_discount_per"].fillna(0).to_numpy(float)
+        + EARLY_SHARE * df["early_discount_per"].fillna(0).to_numpy(float)
+    ) / 100
+    rent = df["월세"].to_numpy(float) * MANWON
+    deposit_cost = df["보증금"].fillna(0).to_numpy(float) * MANWON * DEPOSIT_RATE / 12
+
+    revenue = fee * WEEKS_PER_MONTH * occ * (1 - np.clip(discount, 0, 1))
+    cost = rent + deposit_cost
+    df["expected_revenue"] = np.round(revenue)
+    df["monthly_cost"] = np.round(cost)
+    df["net_profit"] = np.round(revenue - cost)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["profit_rate"] = np.where(
+            cost > 0, np.round((revenue - cost) / cost * 100, 2), np.nan
+        )
+    return df
+
+
+def update_top_k(current: pd.DataFrame, chunk: pd.DataFrame, keys, k: int):
+    """기존 상위 K + 새 chunk → 그룹별 상위 K 유지 (매물ID 당 최고 쌍만)"""
+    merged = chunk if current is None else pd.concat([current, chunk])
+    merged = merged.sort_values("net_profit", ascending=False, kind="stable")
+    merged = merged.drop_duplicates(subset=keys + ["매물ID"], keep="first")
+    return merged.groupby(keys, sort=False, dropna=False, observed=True).head(k)
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="네이버 ↔ 33m2 쌍별 수익성 랭킹")
+    parser.add_argument("pairs_csv", help="proximity_join.py 결과")
+    parser.add_argument("naver_csv")
+    parser.add_argument("reservation_csv", help="reservation_4w_*.csv")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    t0 = time.time()
+    rooms = load_rooms(args.reservation_csv)
+    naver = load_naver(args.naver_csv)
+    print(
+        f"📂 33m2 {len(rooms):,}개 (예약률 보간 {int(rooms['occupancy_imputed'].sum()):,}개) | 네이버 {len(naver):,}개"
+    )
+
+    tops: Dict[str, pd.DataFrame] = {level: None for level in GROUP_LEVELS}
+    total = 0
+    for pairs in pd.read_csv(
+        args.pairs_csv,
+        dtype={"매물ID": str, "rid": str},
+        encoding="utf-8-sig",
+        chunksize=args.chunksize,
+    ):
+        scored = score_pairs(pairs, rooms, naver)
+        total += len(scored)
+        for level, keys in GROUP_LEVELS.items():
+            tops[level] = update_top_k(tops[level], scored, keys, args.top_k)
+        print(f"\r🧮 계산된 쌍: {total:,}개", end="", flush=True)
+    print()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for level, keys in GROUP_LEVELS.items():
+        top = tops[level]
+        if top is None or top.empty:
+            continue
+        top = top.sort_values(
+            keys + ["net_profit"], ascending=[True] * len(keys) + [False]
+        )
+        grouped = top.groupby(keys, dropna=False, observed=True)
+        top.insert(0, "rank", grouped.cumcount() + 1)
+        path = os.path.join(args.output_dir, f"top{args.top_k}_{level}.csv")
+        top.to_csv(path, index=False, encoding="utf-8-sig")
+        print(f"💾 {level} 랭킹: {path} ({len(top):,}행, {grouped.ngroups}개 그룹)")
+
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
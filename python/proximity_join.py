@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+네이버 매물 ↔ 33m2 방 근접 조인
+- 33m2 방 lat/lng 로 격자(그리드) 인덱스 구성 (셀 크기 = 반경)
+- 네이버 위도/경도 마다 주변 3x3 셀 후보만 꺼내 NumPy haversine 으로 반경 필터
+- 결과는 지도에서 바로 읽을 수 있는 (매물ID, rid, distance_m) 쌍 테이블
+실행: python proximity_join.py naver_properties_final.csv room_250803.csv --radius 50
+"""
+
+import argparse, time
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+RADIUS_M = 50.0
+CHUNK_SIZE = 20_000
+OUTPUT_FILE = "naver_room_pairs.csv"
+EARTH_RADIUS_M = 6_371_000.0
+METERS_PER_DEG_LAT = 111_320.0
+CELL_KEY_STRIDE = 1 << 32  # (위도 셀, 경도 셀) → int64 키
+
+
+# 유틸 함수 --------------------------------------------------------------------
+def haversine_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """배열 간 대원거리 (미터)"""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def load_points(path: str, id_col: str, lat_col: str, lng_col: str) -> pd.DataFrame:
+    df = pd.read_csv(
+        path,
+        usecols=[id_col, lat_col, lng_col],
+        dtype={id_col: str},
+        encoding="utf-8-sig",
+    )
+    df[lat_col] = pd.to_numeric(df[lat_col], errors="coerce")
+    df[lng_col] = pd.to_numeric(df[lng_col], errors="coerce")
+    return df.dropna(subset=[lat_col, lng_col]).reset_index(drop=True)
+
+
+# 그리드 인덱스 ----------------------------------------------------------------
+class GridIndex:
+    """셀 키로 정렬된 좌표 배열 + searchsorted 범위 조회"""
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, cell_m: float):
+        self.cell_lat = cell_m / METERS_PER_DEG_LAT
+        # 가장 고위도 기준 → 어느 셀도 반경보다 좁지 않음
+        ref_lat = np.radians(np.nanmax(np.abs(lat))) if len(lat) else 0.0
+        self.cell_lng = cell_m / (METERS_PER_DEG_LAT * np.cos(ref_lat))
+
+        keys = self.cell_keys(lat, lng)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        self.lat = lat
+        self.lng = lng
+
+    def cells(self, lat: np.ndarray, lng: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            np.floor(lat / self.cell_lat).astype(np.int64),
+            np.floor(lng / self.cell_lng).astype(np.int64),
+        )
+
+    def cell_keys(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        ci, cj = self.cells(lat, lng)
+        return ci * CELL_KEY_STRIDE + cj
+
+    def query_radius(
+        self, lat: np.ndarray, lng: np.ndarray, radius_m: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(질의 인덱스, 인덱스 내 좌표 인덱스, 거리) — 반경 이내 모든 쌍"""
+        ci, cj = self.cells(lat, lng)
+        q_parts, r_parts = [], []
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                keys = (ci + di) * CELL_KEY_STRIDE + (cj + dj)
+                start = np.searchsorted(self.sorted_keys, keys, side="left")
+                end = np.searchsorted(self.sorted_keys, keys, side="right")
+                counts = end - start
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                q_idx = np.repeat(np.arange(len(lat)), counts)
+                offsets = np.arange(total) - np.repeat(
+                    np.cumsum(counts) - counts, counts
+                )
+                q_parts.append(q_idx)
+                r_parts.append(self.order[np.repeat(start, counts) + offsets])
+
+        if not q_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+
+        q_idx = np.concatenate(q_parts)
+        r_idx = np.concatenate(r_parts)
+        dist = haversine_m(lat[q_idx], lng[q_idx], self.lat[r_idx], self.lng[r_idx])
+        keep = dist <= radius_m
+        return q_idx[keep], r_idx[keep], dist[keep]
+
+
+# 조인 -------------------------------------------------------------------------
+def proximity_join(
+    naver: pd.DataFrame,
+    rooms: pd.DataFrame,
+    radius_m: float = RADIUS_M,
+    chunksize: int = CHUNK_SIZE,
+) -> pd.DataFrame:
+    """naver(매물ID/위도/경도) × rooms(rid/lat/lng) → 반경 내 쌍 테이블"""
+    index = GridIndex(
+        rooms["lat"].to_numpy(float), rooms["lng"].to_numpy(float), radius_m
+    )
+    n_lat = naver["위도"].to_numpy(float)
+    n_lng = naver["경도"].to_numpy(float)
+    n_ids = naver["매물ID"].to_numpy()
+    r_ids = rooms["rid"].to_numpy()
+
+    parts = []
+    for s in range(0, len(naver), chunksize):
+        q_idx, r_idx, dist = index.query_radius(
+            n_lat[s : s + chunksize], n_lng[s : s + chunksize], radius_m
+        )
+        parts.append(
+            pd.DataFrame(
+                {
+                    "매물ID": n_ids[s + q_idx],
+                    "rid": r_ids[r_idx],
+                    "distance_m": np.round(dist, 1),
+                }
+            )
+        )
+
+    pairs = (
+        pd.concat(parts, ignore_index=True)
+        if parts
+        else pd.DataFrame(columns=["매물ID", "rid", "distance_m"])
+    )
+    return pairs.sort_values(["매물ID", "distance_m"], kind="stable").reset_index(
+        drop=True
+    )
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="네이버 매물 ↔ 33m2 방 근접 조인")
+    parser.add_argument("naver_csv")
+    parser.add_argument("room_csv", help="room_*.csv 또는 reservation_4w_*.csv")
+    parser.add_argument("--radius", type=float, default=RADIUS_M, help="반경 (미터)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    t0 = time.time()
+    naver = load_points(args.naver_csv, "매물ID", "위도", "경도")
+    rooms = load_points(args.room_csv, "rid", "lat", "lng")
+    print(f"📂 네이버 {len(naver):,}개 | 33m2 {len(rooms):,}개 | 반경 {args.radius:g}m")
+
+    pairs = proximity_join(naver, rooms, args.radius, args.chunksize)
+    pairs.to_csv(args.output, index=False, encoding="utf-8-sig")
+
+    matched = pairs["매물ID"].nunique()
+    print(
+        f"🔗 쌍 {len(pairs):,}개 | 매칭된 네이버 매물 {matched:,}개 | 매칭된 방 {pairs['rid'].nunique():,}개"
+    )
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+    print(f"📁 저장 위치: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+room / reservation / 네이버 로컬 조회 서버 (표준 라이브러리 http.server)
+- 최신 스냅샷을 한 번만 메모리에 올리고 위경도 정렬 인덱스 + 속성별 정렬 인덱스 유지
+- bbox + 범위 필터 + 정렬 + limit 질의를 가장 선택도가 높은 인덱스부터 좁혀서 처리
+- 폴더를 주기적으로 확인해 새 스냅샷이 생기면 백그라운드에서 로드 후 교체 (hot-swap)
+실행: python query_server.py --port 8033
+질의: /rooms?bbox=37.49,127.02,37.51,127.05&using_fee=200000:400000&sort=-occupancy_rate_percent&limit=50
+      /naver?bbox=37.49,127.02,37.51,127.05&월세=:80
+"""
+
+import argparse, glob, json, os, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+PUBLIC_DIR = "../next/public"
+DATASETS = {
+    # 이름: (파일 패턴 목록 - 앞쪽 우선, 위도, 경도, 정렬 인덱스 컬럼)
+    "rooms": (
+        ["reservation/reservation_4w_*.csv", "room/room_*.csv"],
+        "lat",
+        "lng",
+        ["using_fee", "occupancy_rate_percent", "pyeong_size", "room_cnt"],
+    ),
+    "naver": (
+        ["naver/naver_*final.csv"],
+        "위도",
+        "경도",
+        ["월세", "보증금", "전용면적"],
+    ),
+}
+POLL_SECONDS = 30
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 5_000
+
+
+# 인덱스 테이블 ----------------------------------------------------------------
+class IndexedTable:
+    """위도 정렬 인덱스(bbox) + 속성별 정렬 인덱스(범위)"""
+
+    def __init__(self, path: str, lat_col: str, lng_col: str, index_cols: List[str]):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        df = pd.read_csv(path, encoding="utf-8-sig", low_memory=False)
+        for col in [lat_col, lng_col] + index_cols:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+        self.df = df.dropna(subset=[lat_col, lng_col]).reset_index(drop=True)
+        self.lat = self.df[lat_col].to_numpy(float)
+        self.lng = self.df[lng_col].to_numpy(float)
+        self.lat_order = np.argsort(self.lat, kind="stable")
+        self.lat_sorted = self.lat[self.lat_order]
+
+        self.indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for col in index_cols:
+            if col not in self.df.columns:
+                continue
+            values = self.df[col].to_numpy(float)
+            order = np.argsort(values, kind="stable")  # NaN 은 맨 뒤
+            self.indexes[col] = (order, values[order])
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def bbox_candidates(self, bbox: Tuple[float, float, float, float]) -> np.ndarray:
+        s_lat, w_lng, n_lat, e_lng = bbox
+        lo = np.searchsorted(self.lat_sorted, s_lat, side="left")
+        hi = np.searchsorted(self.lat_sorted, n_lat, side="right")
+        idx = self.lat_order[lo:hi]
+        return idx[(self.lng[idx] >= w_lng) & (self.lng[idx] <= e_lng)]
+
+    def range_candidates(self, col: str, lo: Optional[float], hi: Optional[float]):
+        order, values = self.indexes[col]
+        values = values[: len(values) - np.isnan(values).sum()]  # NaN 제외
+        start = 0 if lo is None else np.searchsorted(values, lo, side="left")
+        end = len(values) if hi is None else np.searchsorted(values, hi, "right")
+        return order[start:end]
+
+    def query(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]],
+        ranges: Dict[str, Tuple[Optional[float], Optional[float]]],
+        sort: Optional[str],
+        limit: int,
+    ) -> Tuple[int, pd.DataFrame]:
+        # 1) 가장 좁은 후보 집합에서 시작
+        candidates = []
+        if bbox:
+            candidates.append(("bbox", self.bbox_candidates(bbox)))
+        for col, (lo, hi) in ranges.items():
+            candidates.append((col, self.range_candidates(col, lo, hi)))
+        if candidates:
+            start_key, idx = min(candidates, key=lambda c: len(c[1]))
+        else:
+            start_key, idx = None, np.arange(len(self.df))
+
+        # 2) 나머지 조건은 후보 위에서 벡터 마스크로 적용
+        mask = np.ones(len(idx), dtype=bool)
+        if bbox and start_key != "bbox":
+            s_lat, w_lng, n_lat, e_lng = bbox
+            lat, lng = self.lat[idx], self.lng[idx]
+            mask &= (lat >= s_lat) & (lat <= n_lat) & (lng >= w_lng) & (lng <= e_lng)
+        for col, (lo, hi) in ranges.items():
+            if col == start_key:
+                continue
+            values = self.df[col].to_numpy(float)[idx]
+            if lo is not None:
+                mask &= values >= lo
+            if hi is not None:
+                mask &= values <= hi
+        idx = idx[mask]
+        total = len(idx)
+
+        # 3) 정렬 + limit (부분 정렬)
+        if sort:
+            desc = sort.startswith("-")
+            col = sort.lstrip("-")
+            keys = self.df[col].to_numpy(float)[idx]
+            keys = np.where(np.isnan(keys), np.inf if not desc else -np.inf, keys)
+            keys = -keys if desc else keys
+            if len(idx) > limit:
+                part = np.argpartition(keys, limit - 1)[:limit]
+                idx, keys = idx[part], keys[part]
+            idx = idx[np.argsort(keys, kind="stable")]
+        else:
+            idx = np.sort(idx)
+        return total, self.df.iloc[idx[:limit]]
+
+
+class SnapshotStore:
+    """데이터셋별 최신 스냅샷 보관 + 폴링 교체"""
+
+    def __init__(self, public_dir: str):
+        self.public_dir = public_dir
+        self.tables: Dict[str, IndexedTable] = {}
+        self.lock = threading.Lock()
+
+    def latest_file(self, patterns: List[str]) -> Optional[str]:
+        for pattern in patterns:
+            files = sorted(glob.glob(os.path.join(self.public_dir, pattern)))
+            if files:
+                return files[-1]
+        return None
+
+    def refresh(self):
+        for name, (patterns, lat_col, lng_col, index_cols) in DATASETS.items():
+            path = self.latest_file(patterns)
+            current = self.tables.get(name)
+            if not path:
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+            except FileNotFoundError:  # 교체 중 잠깐 없는 파일 → 다음 주기에 재시도
+                continue
+            if current and current.path == path and current.mtime == mtime:
+                continue
+            try:
+                t0 = time.time()
+                table = IndexedTable(path, lat_col, lng_col, index_cols)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"❌ {name} 로드 실패 ({path}): {e}")
+                continue
+            # 참조만 교체 → 진행 중인 질의는 이전 테이블로 끝까지 처리
+            with self.lock:
+                self.tables[name] = table
+            print(
+                f"🔄 {name}: {os.path.basename(path)} {len(table):,}행 ({time.time() - t0:.2f}초)"
+            )
+
+    def watch(self, interval: int):
+        while True:
+            time.sleep(interval)
+            self.refresh()
+
+    def get(self, name: str) -> Optional[IndexedTable]:
+        with self.lock:
+            return self.tables.get(name)
+
+
+# HTTP -------------------------------------------------------------------------
+def parse_range(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """'100:200', '100:', ':200', '3' → (최소, 최대)"""
+    if ":" not in text:
+        return float(text), float(text)
+    lo, hi = text.split(":", 1)
+    return (float(lo) if lo else None), (float(hi) if hi else None)
+
+
+def make_handler(store: SnapshotStore):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def send_json(self, status: int, body: Dict):
+            data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            name = url.path.strip("/")
+            table = store.get(name)
+            if table is None:
+                return self.send_json(404, {"error": f"unknown dataset: {name}"})
+
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                bbox = None
+                if "bbox" in params:
+                    bbox = tuple(float(x) for x in params.pop("bbox").split(","))
+                    if len(bbox) != 4:
+                        raise ValueError("bbox = 남위도,서경도,북위도,동경도")
+                sort = params.pop("sort", None)
+                limit = min(int(params.pop("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+                if limit < 1:
+                    raise ValueError("limit 은 1 이상")
+                ranges = {}
+                for col, text in params.items():
+                    if col not in table.indexes:
+                        raise ValueError(f"인덱스 없는 컬럼: {col}")
+                    ranges[col] = parse_range(text)
+                if sort and sort.lstrip("-") not in table.df.columns:
+                    raise ValueError(f"정렬 컬럼 없음: {sort}")
+                if sort and not pd.api.types.is_numeric_dtype(
+                    table.df[sort.lstrip("-")]
+                ):
+                    raise ValueError(f"숫자 컬럼만 정렬 가능: {sort}")
+            except ValueError as e:
+                return self.send_json(400, {"error": str(e)})
+
+            t0 = time.perf_counter()
+            total, rows = table.query(bbox, ranges, sort, limit)
+            elapsed = (time.perf_counter() - t0) * 1000
+            rows = rows.astype(object).where(rows.notna(), None)
+            self.send_json(
+                200,
+                {
+                    "source": os.path.basename(table.path),
+                    "total": total,
+                    "returned": len(rows),
+                    "elapsed_ms": round(elapsed, 2),
+                    "rows": rows.to_dict(orient="records"),
+                },
+            )
+
+        def log_message(self, fmt, *args):
+            pass  # 요청마다 로그 출력 생략
+
+    return QueryHandler
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="로컬 조회 서버")
+    parser.add_argument("--public-dir", default=PUBLIC_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8033)
+    parser.add_argument("--poll", type=int, default=POLL_SECONDS)
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.public_dir)
+    store.refresh()
+    threading.Thread(target=store.watch, args=(args.poll,), daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    print(f"🚀 조회 서버: http://{args.host}:{args.port}/rooms , /naver")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 서버 종료")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예약률 결과 정규화 저장소 (좁은 사실 테이블 + 중복 제거된 차원 테이블)
+- facts.csv: 방 확인 1건 = snapshot, rid, room_key, crawl_key, run + 분석 구간/예약률/예약일 수/분석 시각
+  (run = 예약 확인기 실행 시작 시각, 가져온 CSV 는 빈 값)
+- rooms.csv: 방 속성(room_name, pic_main, addr_*, using_fee ...) 조합마다 1행, room_key = 속성 해시
+  → 같은 방을 여러 스냅샷에서 확인해도 속성이 안 바뀌면 한 번만 저장, 바뀌면 새 버전 1행
+- crawls.csv: 검색 시점 컬럼(crawl_datetime/timestamp, search_keyword, region_name) 조합 - 스냅샷당 수십 행
+- 호환 뷰: facts ⋈ rooms ⋈ crawls → 스냅샷별 원래 컬럼 순서/행 순서 그대로의 넓은 reservation_4w_*.csv
+  (같은 날 재실행으로 rid 가 여러 run 에 있으면 가장 늦은 run 의 행만, 가져온 CSV 행은 그대로)
+  (schedule_pattern 이 있는 스냅샷은 주중/주말·주차별·근/원거리 예약률 컬럼 추가)
+- 예약 확인기는 시작할 때 방 차원 1회 등록, 배치마다 facts 만 추가, 끝날 때 넓은 CSV 1회 생성
+실행: python reservation_schema.py import ../next/public/reservation/reservation_4w_*.csv
+      python reservation_schema.py view 250808 -o reservation_4w_250808.csv
+      python reservation_schema.py stats
+"""
+
+import argparse, csv, hashlib, json, os, re, time
+from typing import Dict, List, Optional, Tuple
+
+# 기본 설정 --------------------------------------------------------------------
+STORE_DIR = "reservation_store"
+FACT_COLUMNS = [
+    "analysis_start_date",
+    "analysis_end_date",
+    "occupancy_rate_percent",
+    "total_reserved_days",
+    "total_days_analyzed",
+    "months_analyzed",
+    "analysis_date",
+    "schedule_pattern",  # 날짜별 상태 (occupancy_breakdown.py)
+]
+CRAWL_COLUMNS = [
+    "crawl_datetime",
+    "crawl_timestamp",
+    "search_keyword",
+    "region_name",
+    "search_keywords",
+    "region_names",
+]
+KEY_COLUMNS = ["snapshot", "rid", "room_key", "crawl_key", "run"]
+KEY_LENGTH = 16
+
+
+# 행 변환 ----------------------------------------------------------------------
+def attr_key(attrs: Dict) -> str:
+    text = json.dumps(attrs, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+def split_row(row: Dict) -> Tuple[Dict, Dict]:
+    """넓은/입력 행 → (방 속성, 검색 시점 속성), 값은 문자열로 통일"""
+    room, crawl = {}, {}
+    for k, v in row.items():
+        if k in FACT_COLUMNS:
+            continue
+        # None / NaN(검색 결과 평면화 행) → 빈 값, 나머지는 문자열
+        (crawl if k in CRAWL_COLUMNS else room)[k] = (
+            "" if v is None or v != v else str(v)
+        )
+    room.setdefault("state", "")
+    return room, crawl
+
+
+def wide_row(row: Dict, facts: Dict) -> Dict:
+    """호환용: 입력 방 행 + 분석 필드 → 예전 analyze_room 결과와 같은 넓은 행"""
+    result = dict(row)
+    result.setdefault("state", "")
+    result.update({k: facts[k] for k in FACT_COLUMNS if k in facts})
+    return result
+
+
+def snapshot_id(path: str, rows: List[Dict]) -> str:
+    """reservation_4w_YYMMDD.csv → YYMMDD, 없으면 가장 이른 분석 시작일"""
+    m = re.search(r"(\d{6})", os.path.basename(path))
+    if m:
+        return m[1]
+    first = min(r.get("analysis_start_date", "") for r in rows) or time.strftime(
+        "%Y-%m-%d"
+    )
+    return first.replace("-", "")[2:]
+
+
+# 차원 테이블 ------------------------------------------------------------------
+class Dimension:
+    """속성 조합 → 해시 키, 처음 보는 조합만 CSV 에 추가"""
+
+    def __init__(self, path: str, key: str, columns: List[str]):
+        self.path = path
+        self.key = key
+        self.columns = columns  # manifest 와 같은 리스트 객체
+        self.known = set()
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                self.known = {r[key] for r in csv.DictReader(f)}
+
+    def register(self, attrs_list: List[Dict]) -> List[str]:
+        keys, new_rows = [], []
+        for attrs in attrs_list:
+            k = attr_key(attrs)
+            keys.append(k)
+            if k not in self.known:
+                self.known.add(k)
+                new_rows.append({self.key: k, **attrs})
+        if new_rows:
+            added = [
+                c
+                for c in dict.fromkeys(c for r in new_rows for c in r)
+                if c != self.key
+            ]
+            missing = [c for c in added if c not in self.columns]
+            if missing and os.path.exists(self.path):
+                # 새 컬럼이 생기면 기존 행을 새 헤더로 다시 씀
+                with open(self.path, newline="", encoding="utf-8-sig") as f:
+                    old = list(csv.DictReader(f))
+                os.remove(self.path)
+                self.columns.extend(missing)
+                append_csv(self.path, [self.key] + self.columns, old)
+            else:
+                self.columns.extend(missing)
+            append_csv(self.path, [self.key] + self.columns, new_rows)
+        return keys
+
+
+def append_csv(path: str, fieldnames: List[str], rows: List[Dict]):
+    header = not os.path.exists(path)
+    if not header:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            existing = next(csv.reader(f), [])
+        added = [c for c in fieldnames if c not in existing]
+        fieldnames = existing + added
+        if added:
+            # 컬럼이 늘어난 경우 (예: schedule_pattern 추가 전 facts.csv) 새 헤더로 다시 씀
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                old = list(csv.DictReader(f))
+            os.remove(path)
+            append_csv(path, fieldnames, old)
+    with open(path, "a", newline="", encoding="utf-8-sig" if header else "utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+# 저장소 -----------------------------------------------------------------------
+class ReservationStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.facts_path = os.path.join(root, "facts.csv")
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.manifest = {"room_columns": [], "crawl_columns": [], "snapshots": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.rooms = Dimension(
+            os.path.join(root, "rooms.csv"), "room_key", self.manifest["room_columns"]
+        )
+        self.crawls = Dimension(
+            os.path.join(root, "crawls.csv"),
+            "crawl_key",
+            self.manifest["crawl_columns"],
+        )
+        self.run = time.strftime("%Y-%m-%d %H:%M:%S")  # add_facts 로 쓰는 행의 실행 id
+
+    def save_manifest(self):
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+
+    # -------- 쓰기 -----------------------
+    def add_rooms(self, rows: List[Dict], snapshot: str) -> Dict[str, Tuple[str, str]]:
+        """입력 방 행들 → {rid: (room_key, crawl_key)}, 스냅샷 컬럼 순서 기록"""
+        rooms, crawls = zip(*(split_row(r) for r in rows)) if rows else ((), ())
+        room_keys = self.rooms.register(list(rooms))
+        crawl_keys = self.crawls.register(list(crawls))
+        meta = self.manifest["snapshots"].setdefault(snapshot, {"columns": []})
+        columns = list(dict.fromkeys(c for r in rows[:1] for c in r))
+        if "state" not in columns:
+            columns.append("state")
+        columns += [c for c in FACT_COLUMNS if c not in columns]
+        meta["columns"] = list(dict.fromkeys(meta["columns"] + columns))
+        self.save_manifest()
+        return {
+            str(r.get("rid", "")): (rk, ck)
+            for r, rk, ck in zip(rows, room_keys, crawl_keys)
+        }
+
+    def add_facts(
+        self, facts: List[Dict], keys: Dict[str, Tuple[str, str]], snapshot: str
+    ):
+        """facts: analyze_room 결과 (rid + FACT_COLUMNS)"""
+        rows = []
+        for f in facts:
+            room_key, crawl_key = keys[str(f["rid"])]
+            rows.append(
+                {
+                    **f,
+                    "snapshot": snapshot,
+                    "room_key": room_key,
+                    "crawl_key": crawl_key,
+                    "run": self.run,
+                }
+            )
+        append_csv(self.facts_path, KEY_COLUMNS + FACT_COLUMNS, rows)
+
+    def add_wide(self, rows: List[Dict], snapshot: str) -> int:
+        """넓은 결과 행(기존 reservation CSV) → 차원 + 사실 분리 저장 (행 순서 유지)"""
+        rooms, crawls = zip(*(split_row(r) for r in rows))
+        room_keys = self.rooms.register(list(rooms))
+        crawl_keys = self.crawls.register(list(crawls))
+        self.manifest["snapshots"][snapshot] = {"columns": list(rows[0])}
+        self.save_manifest()
+        facts = [
+            {
+                "snapshot": snapshot,
+                "rid": row.get("rid", ""),
+                "room_key": rk,
+                "crawl_key": ck,
+                **{k: row.get(k, "") for k in FACT_COLUMNS},
+            }
+            for row, rk, ck in zip(rows, room_keys, crawl_keys)
+        ]
+        append_csv(self.facts_path, KEY_COLUMNS + FACT_COLUMNS, facts)
+        return len(rows)
+
+    # -------- 읽기 -----------------------
+    def snapshots(self) -> List[str]:
+        return sorted(self.manifest["snapshots"])
+
+    def view(self, snapshot: Optional[str] = None):
+        """호환 뷰: 스냅샷(기본 최신)의 넓은 reservation 표 (원래 행/컬럼 순서)"""
+        import pandas as pd
+
+        snapshot = snapshot or self.snapshots()[-1]
+        read = lambda p: pd.read_csv(
+            p, dtype=str, encoding="utf-8-sig", keep_default_na=False
+        )
+        facts = read(self.facts_path)
+        facts = facts[facts["snapshot"] == snapshot]
+        if "run" in facts.columns:
+            # 같은 날 재실행: rid 마다 가장 늦은 run 의 행만 (가져온 CSV 의 중복 rid 는 유지)
+            run = facts["run"]
+            last = facts["rid"].map(facts[run != ""].groupby("rid")["run"].max())
+            facts = facts[(run == "") | (run == last)]
+        facts = facts.drop(columns="rid")
+        wide = facts.merge(read(self.rooms.path), on="room_key", how="left").merge(
+            read(self.crawls.path), on="crawl_key", how="left"
+        )
+        wide = wide.reindex(columns=self.manifest["snapshots"][snapshot]["columns"])
+        if "schedule_pattern" in wide.columns:
+            from occupancy_breakdown import add_breakdown
+
+            wide = add_breakdown(wide)
+        return wide
+
+    def export(self, output: str, snapshot: Optional[str] = None) -> int:
+        if not os.path.exists(self.facts_path):
+            return 0
+        wide = self.view(snapshot)
+        wide.to_csv(output, index=False, encoding="utf-8-sig")
+        return len(wide)
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="예약률 결과 정규화 저장소")
+    parser.add_argument("--store", default=STORE_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_import = sub.add_parser("import", help="넓은 reservation CSV 가져오기")
+    p_import.add_argument("csv", nargs="+")
+    p_view = sub.add_parser("view", help="호환 뷰 → 넓은 reservation CSV")
+    p_view.add_argument("snapshot", nargs="?", help="YYMMDD (기본: 최신)")
+    p_view.add_argument("-o", "--output")
+    sub.add_parser("stats")
+    args = parser.parse_args()
+
+    t0 = time.time()
+    store = ReservationStore(args.store)
+    if args.cmd == "import":
+        for path in args.csv:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                rows = list(csv.DictReader(f))
+            if not rows:
+                continue
+            snapshot = snapshot_id(path, rows)
+            if snapshot in store.manifest["snapshots"]:
+                print(f"⏭️ {path}: 스냅샷 {snapshot} 이미 있음")
+                continue
+            store.add_wide(rows, snapshot)
+            print(f"📥 {path}: {len(rows):,}행 → 스냅샷 {snapshot}")
+    elif args.cmd == "view":
+        snapshot = args.snapshot or store.snapshots()[-1]
+        output = args.output or f"reservation_4w_{snapshot}.csv"
+        rows = store.export(output, snapshot)
+        print(f"📁 {snapshot}: {rows:,}행 → {output}")
+    if args.cmd in ("import", "stats"):
+        sizes = {
+            name: os.path.getsize(path) / 1e6
+            for name, path in [
+                ("facts", store.facts_path),
+                ("rooms", store.rooms.path),
+                ("crawls", store.crawls.path),
+            ]
+            if os.path.exists(path)
+        }
+        print(
+            f"🗂️ 스냅샷 {len(store.snapshots())}개 | 방 버전 {len(store.rooms.known):,}개 | "
+            f"검색 시점 {len(store.crawls.known):,}개 | "
+            + " | ".join(f"{k} {v:.2f}MB" for k, v in sizes.items())
+        )
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+33m2 전역 rid 인덱스
+- 지역/세분화 키워드를 넘나드는 중복 rid 를 수집 시점에 바로 제거
+- rid 별로 발견된 (search_keyword, region_name) 조합을 모두 기록
+- 키워드 조합은 정수 id 로 인터닝 → rid 당 정수 하나만 보관 (수십만 rid 에도 메모리 일정)
+"""
+from typing import Dict, List, Tuple
+
+
+class RidIndex:
+    def __init__(self):
+        self._pairs: List[Tuple[str, str]] = []  # id → (search_keyword, region_name)
+        self._pair_ids: Dict[Tuple[str, str], int] = {}
+        self._first: Dict[int, int] = {}  # rid → 처음 발견된 조합 id
+        self._extra: Dict[int, List[int]] = {}  # 중복 rid 만 추가 조합 보관
+        self.duplicates = 0
+
+    def _pair_id(self, keyword: str, region_name: str) -> int:
+        key = (keyword, region_name)
+        pid = self._pair_ids.get(key)
+        if pid is None:
+            pid = len(self._pairs)
+            self._pairs.append(key)
+            self._pair_ids[key] = pid
+        return pid
+
+    def add(self, rid, keyword: str, region_name: str) -> bool:
+        """처음 보는 rid 면 True, 이미 수집된 rid 면 키워드만 기록하고 False"""
+        rid = int(rid)
+        pid = self._pair_id(keyword, region_name)
+        first = self._first.get(rid)
+        if first is None:
+            self._first[rid] = pid
+            return True
+
+        self.duplicates += 1
+        if first != pid:
+            extra = self._extra.setdefault(rid, [])
+            if pid not in extra:
+                extra.append(pid)
+        return False
+
+    def __contains__(self, rid) -> bool:
+        try:
+            return int(rid) in self._first
+        except (TypeError, ValueError):
+            return False
+
+    def __len__(self) -> int:
+        return len(self._first)
+
+    def pairs_of(self, rid) -> List[Tuple[str, str]]:
+        rid = int(rid)
+        if rid not in self._first:
+            return []
+        ids = [self._first[rid]] + self._extra.get(rid, [])
+        return [self._pairs[i] for i in ids]
+
+    def annotate(self, rooms: List[Dict]) -> List[Dict]:
+        """저장 직전 rid 별 전체 발견 키워드/지역을 '|' 구분 컬럼으로 추가"""
+        for room in rooms:
+            rid = room.get("rid")
+            if rid is None or rid not in self:
+                continue
+            pairs = self.pairs_of(rid)
+            room["search_keywords"] = "|".join(dict.fromkeys(k for k, _ in pairs))
+            room["region_names"] = "|".join(dict.fromkeys(r for _, r in pairs))
+        return rooms
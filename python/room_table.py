@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+room / reservation CSV 공용 압축 로더
+- 반복되는 문자열(state/province/town/search_keyword/region_name/분석일 등) → category (사전 + 코드)
+- 정수: rid/using_fee → Int32, 방·욕실 수/예약일 수 → Int8, crawl_timestamp → Int64 (결측 허용)
+- 실수: 평형/할인율/예약률/위경도 → float32
+- 플래그: is_new/is_super_host/reco_type_* → boolean
+- 스키마에 없는 컬럼은 고유값 비율이 낮으면 category, 아니면 문자열 그대로
+- 사용처: occupancy_cube.py(스냅샷 셀 집계), profit_ranking.py(방 테이블) - 필요한 컬럼만 usecols 로
+실행: python room_table.py ../next/public/reservation/reservation_4w_250808.csv
+"""
+
+import argparse, time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+CATEGORY_COLUMNS = [
+    "state",
+    "province",
+    "town",
+    "addr_lot",
+    "addr_street",
+    "search_keyword",
+    "region_name",
+    "search_keywords",
+    "region_names",
+    "crawl_datetime",
+    "analysis_start_date",
+    "analysis_end_date",
+]
+INT_COLUMNS: Dict[str, str] = {
+    "rid": "Int32",
+    "using_fee": "Int32",
+    "room_cnt": "Int8",
+    "bathroom_cnt": "Int8",
+    "cookroom_cnt": "Int8",
+    "sittingroom_cnt": "Int8",
+    "total_reserved_days": "Int8",
+    "total_days_analyzed": "Int8",
+    "months_analyzed": "Int8",
+    "crawl_timestamp": "Int64",
+}
+FLOAT_COLUMNS = [
+    "pyeong_size",
+    "longterm_discount_per",
+    "early_discount_per",
+    "occupancy_rate_percent",
+    "lat",
+    "lng",
+]
+BOOL_COLUMNS = ["is_new", "is_super_host", "reco_type_1", "reco_type_2"]
+DATETIME_COLUMNS = ["analysis_date"]
+CATEGORY_RATIO = 0.5  # 스키마 밖 컬럼: 고유값/행 비율이 이보다 낮으면 category
+BOOL_VALUES = {"true": True, "false": False, "1": True, "0": False}
+
+
+# 변환 -------------------------------------------------------------------------
+def to_bool(series: pd.Series) -> pd.Series:
+    return series.str.strip().str.lower().map(BOOL_VALUES).astype("boolean")
+
+
+def to_int(series: pd.Series, dtype: str) -> pd.Series:
+    values = pd.to_numeric(series, errors="coerce")
+    # 소수 값(예: "9.0")은 반올림 후 정수화, 범위를 넘으면 Int64 로 유지
+    values = values.round()
+    info = np.iinfo(dtype.lower())
+    if values.notna().any() and (values.min() < info.min or values.max() > info.max):
+        dtype = "Int64"
+    return values.astype(dtype)
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열 DataFrame → 스키마 타입 적용"""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in INT_COLUMNS:
+            out[col] = to_int(s, INT_COLUMNS[col])
+        elif col in FLOAT_COLUMNS:
+            out[col] = pd.to_numeric(s, errors="coerce").astype("float32")
+        elif col in BOOL_COLUMNS:
+            out[col] = to_bool(s)
+        elif col in DATETIME_COLUMNS:
+            out[col] = pd.to_datetime(s, errors="coerce")
+        elif col in CATEGORY_COLUMNS or s.nunique() < CATEGORY_RATIO * len(s):
+            out[col] = s.astype("category")
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def parse_dtypes(columns: List[str]) -> Dict[str, str]:
+    """read_csv 단계에서 바로 적용할 타입 (정수는 결측 때문에 float64 로 읽은 뒤 변환)"""
+    dtypes = {}
+    for col in columns:
+        if col in CATEGORY_COLUMNS:
+            dtypes[col] = "category"
+        elif col in FLOAT_COLUMNS:
+            dtypes[col] = "float32"
+        elif col in INT_COLUMNS:
+            dtypes[col] = "float64"
+        elif col in BOOL_COLUMNS:
+            dtypes[col] = "boolean"
+        else:
+            dtypes[col] = str
+    return dtypes
+
+
+def load_room_table(
+    path: str, usecols: Optional[List[str]] = None, dedupe: bool = False
+) -> pd.DataFrame:
+    """room_*.csv / reservation_4w_*.csv → 압축 타입 DataFrame"""
+    header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+    cols = [c for c in usecols if c in header] if usecols else list(header)
+    try:
+        # 빠른 경로: C 파서가 숫자/카테고리/불리언을 직접 생성
+        df = pd.read_csv(
+            path, usecols=cols, dtype=parse_dtypes(cols), encoding="utf-8-sig"
+        )[cols]
+    except (ValueError, TypeError):
+        # 숫자 칸에 문자열이 섞인 파일 등 → 문자열로 읽고 하나씩 변환
+        df = pd.read_csv(path, usecols=cols, dtype=str, encoding="utf-8-sig")[cols]
+        df = compact(df)
+    else:
+        for col in df.columns:
+            if col in INT_COLUMNS:
+                df[col] = to_int(df[col], INT_COLUMNS[col])
+            elif col in DATETIME_COLUMNS:
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+            elif df[col].dtype == object and df[col].nunique() < CATEGORY_RATIO * len(
+                df
+            ):
+                df[col] = df[col].astype("category")
+    if dedupe and "rid" in df.columns:
+        df = df.drop_duplicates(subset="rid", keep="last").reset_index(drop=True)
+    return df
+
+
+def key_column(series: pd.Series, missing: str = "") -> pd.Series:
+    """group-by 키용: 결측 → missing (category 는 코드 그대로 유지)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if missing not in series.cat.categories:
+            series = series.cat.add_categories([missing])
+        return series.fillna(missing)
+    return series.fillna(missing).astype(str)
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="room/reservation 압축 로더 비교")
+    parser.add_argument("csv")
+    parser.add_argument("--by", nargs="+", default=["state", "province", "town"])
+    args = parser.parse_args()
+
+    t0 = time.time()
+    raw = pd.read_csv(args.csv, dtype=str, encoding="utf-8-sig")
+    t_raw = time.time() - t0
+    t0 = time.time()
+    table = load_room_table(args.csv)
+    t_compact = time.time() - t0
+
+    print(f"📦 {args.csv}: {len(table):,}행 × {len(table.columns)}컬럼")
+    print(
+        f"💾 메모리: object {memory_mb(raw):.1f}MB → 압축 {memory_mb(table):.1f}MB "
+        f"({memory_mb(raw) / max(memory_mb(table), 1e-9):.1f}배)"
+    )
+    print(f"⏱️ 로드: object {t_raw * 1000:.0f}ms | 압축 {t_compact * 1000:.0f}ms")
+
+    # 대표 group-by 비교
+    raw_fee = pd.to_numeric(raw["using_fee"], errors="coerce")
+    t0 = time.perf_counter()
+    for _ in range(20):
+        raw_fee.groupby([raw[c] for c in args.by]).mean()
+    t_raw = (time.perf_counter() - t0) / 20
+    t0 = time.perf_counter()
+    for _ in range(20):
+        table.groupby(args.by, observed=True)["using_fee"].mean()
+    t_compact = (time.perf_counter() - t0) / 20
+    print(
+        f"🧮 group-by {args.by}: object {t_raw * 1000:.2f}ms → 압축 {t_compact * 1000:.2f}ms"
+    )
+    kinds = table.dtypes.astype(str).value_counts()
+    print("🏷️ " + ", ".join(f"{k} {v}" for k, v in kinds.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+마감 시간 기준 실행 계획 (요청 수 추정 → 작업자 수 / 건너뛸 방 결정 → 실행 중 조정)
+- 요청 수: 방 수 × get_4week_date_range 개월 수, 지역 수 + 세분화 예상 수(지난 크롤 결과), 네이버 페이지 수(지난 결과 / 페이지당 매물)
+- 요청당 시간: 프로파일 보고서(profiles/*/report.json, 없으면 기본값), 방당 시간은 지난 run 실측(.planner_history.json) 우선
+- 예약 확인은 작업자 수로 병렬화 (work_queue.py), 호스트 상한(req/s)을 넘지 않는 최대 작업자로도 부족하면
+  우선순위 낮은 방(지난 결과가 최근인 방)부터 건너뜀
+- run: 큐 등록 → 작업자 실행 → CHECK_INTERVAL 마다 진행률 확인, 뒤처지면 작업자 추가 / 상한이면 꼬리 작업 건너뜀
+  → 끝나면 결과 CSV export (큐에 끝나지 않은 작업이나 export 안 된 결과가 있으면 --reset 없이는 시작 안 함)
+- 검색/네이버 크롤러는 순차 스크립트라 예상 소요 시간과 마감 가능 여부만 출력
+실행: python run_planner.py plan --deadline 3h
+      python run_planner.py run --deadline 06:30 --ceiling 4
+"""
+
+import argparse, csv, glob, json, math, multiprocessing, os, re, time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pipeline import load_script
+from work_queue import (
+    MAX_RPS,
+    OUTPUT_CSV,
+    QUEUE_DB,
+    WorkQueue,
+    export_results,
+    run_worker,
+)
+
+# 기본 설정 --------------------------------------------------------------------
+HISTORY_FILE = ".planner_history.json"
+PROFILE_GLOB = "profiles/*/report.json"
+ROOM_CSV = "deduplicated_samsam_room_data.csv"
+SEARCH_CSV = "metropolitan_officetel_complete.csv"
+NAVER_CSV = "naver_properties_*_final.csv"
+NAVER_PAGE_SIZE = 20  # articleList 페이지당 매물 수
+# 요청 1건 응답 지연 기본값 (초) - 기록이 없을 때
+DEFAULT_LATENCY = {"fetch_month": 0.35, "fetch_area_rooms": 1.5, "fetch_page": 0.6}
+HOST_CEILING = MAX_RPS  # 33m2 요청 상한 (req/s) - 작업자도 실행 중 지킴
+MIN_REQUEST_GAP = 0.2  # StealthAnalyzer._pace
+MAX_WORKERS = 8
+CHECK_INTERVAL = 60.0  # 초
+RATE_WINDOW = 300.0  # 최근 처리 속도 계산 구간 (초)
+BEHIND_RATIO = 0.9  # 필요한 속도의 90% 미만이면 뒤처진 것으로 판단
+SAFETY = 1.1  # 계획 여유
+
+
+# 입력 -------------------------------------------------------------------------
+def parse_deadline(text: str, now: Optional[datetime] = None) -> datetime:
+    """'3h' / '90m' / '1h30m' / '06:30'(다음 도래 시각) → datetime"""
+    now = now or datetime.now()
+    m = re.fullmatch(r"(\d{1,2}):(\d{2})", text)
+    if m:
+        target = now.replace(hour=int(m[1]), minute=int(m[2]), second=0, microsecond=0)
+        return target if target > now else target + timedelta(days=1)
+    m = re.fullmatch(r"(?:(\d+)h)?(?:(\d+)m)?", text)
+    if not m or not any(m.groups()):
+        raise SystemExit(f"❌ 마감 시간 형식 오류: {text} (예: 3h, 90m, 06:30)")
+    return now + timedelta(hours=int(m[1] or 0), minutes=int(m[2] or 0))
+
+
+def count_rows(path: str) -> int:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+def newest(pattern: str) -> Optional[str]:
+    matches = [p for p in glob.glob(pattern) if "temp_" not in p]
+    return max(matches, key=os.path.getmtime) if matches else None
+
+
+def fmt(seconds: float) -> str:
+    seconds = max(int(seconds), 0)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+# 지연 시간 기록 ---------------------------------------------------------------
+def load_history() -> Dict:
+    if os.path.exists(HISTORY_FILE):
+        with open(HISTORY_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_history(history: Dict):
+    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=1)
+
+
+def profiled_latency(stage: str) -> Optional[float]:
+    """가장 최근 프로파일 보고서에서 구간 1회당 sleep 제외 시간"""
+    reports = sorted(glob.glob(PROFILE_GLOB), key=os.path.getmtime, reverse=True)
+    for path in reports:
+        with open(path, encoding="utf-8") as f:
+            s = json.load(f)["stages"].get(stage)
+        if s and s["calls"]:
+            return (s["wall_s"] - s["sleep_s"]) / s["calls"]
+    return None
+
+
+def latency(stage: str) -> Tuple[float, str]:
+    value = profiled_latency(stage)
+    if value is not None:
+        return value, "프로파일"
+    return DEFAULT_LATENCY[stage], "기본값"
+
+
+# 추정 -------------------------------------------------------------------------
+def estimate_reservation(checker, rooms: int, history: Dict) -> Dict:
+    """방 1개 = months × (응답 + 월간 딜레이) + 방 간 딜레이 (작업자 1명 기준)"""
+    months = len(checker.get_4week_date_range()[3])
+    lat, source = latency("fetch_month")
+    month_delay = (checker.MONTH_DELAY_MIN + checker.MONTH_DELAY_MAX) / 2
+    room_delay = (checker.ROOM_DELAY_MIN + checker.ROOM_DELAY_MAX) / 2
+    per_request = max(lat + month_delay, MIN_REQUEST_GAP)
+    per_room = history.get("seconds_per_room") or months * per_request + room_delay
+    return {
+        "rooms": rooms,
+        "months": months,
+        "requests": rooms * months,
+        "latency": lat,
+        "latency_source": source,
+        "seconds_per_room": per_room,
+        "worker_rps": months / per_room,  # 작업자 1명의 요청 속도
+        "seconds": rooms * per_room,
+    }
+
+
+def estimate_search(crawler) -> Dict:
+    """지역 수 + 지난 결과에서 세분화된 지역의 세분화 키워드 수"""
+    areas = [a for names in crawler.METROPOLITAN_AREAS.values() for a in names]
+    subdivided = set()
+    if os.path.exists(SEARCH_CSV):
+        with open(SEARCH_CSV, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                keyword = row.get("search_keyword") or ""
+                if " " in keyword:
+                    subdivided.add(keyword.split(" ", 1)[0])
+    else:
+        subdivided = set(crawler.DISTRICT_SUBDIVISIONS)  # 기록 없음 → 최악의 경우
+    subs = sum(len(crawler.DISTRICT_SUBDIVISIONS.get(a, [])) for a in subdivided)
+    lat, source = latency("fetch_area_rooms")
+    delay = (crawler.REQUEST_DELAY_MIN + crawler.REQUEST_DELAY_MAX) / 2 + 0.3
+    requests = len(areas) + subs
+    return {
+        "areas": len(areas),
+        "subdivided_areas": len(subdivided),
+        "requests": requests,
+        "latency": lat,
+        "latency_source": source,
+        "seconds": requests * (lat + delay),
+    }
+
+
+def estimate_naver() -> Dict:
+    last = newest(NAVER_CSV)
+    listings = count_rows(last) if last else 0
+    pages = math.ceil(listings / NAVER_PAGE_SIZE) + 1 if listings else None
+    lat, source = latency("fetch_page")
+    return {
+        "last_file": last,
+        "pages": pages,
+        "requests": pages,
+        "latency": lat,
+        "latency_source": source,
+        "seconds": pages * (lat + 2.25) if pages else None,  # 페이지 전 1.5~3초 대기
+    }
+
+
+# 계획 -------------------------------------------------------------------------
+def max_workers(worker_rps: float, ceiling: float) -> int:
+    return max(1, min(MAX_WORKERS, int(ceiling / worker_rps)))
+
+
+def plan_workers(est: Dict, available: float, ceiling: float) -> Dict:
+    """마감 안에 끝낼 최소 작업자 수, 상한으로도 부족하면 처리 가능한 방 수"""
+    limit = max_workers(est["worker_rps"], ceiling)
+    needed = math.ceil(est["seconds"] * SAFETY / max(available, 1))
+    workers = min(max(needed, 1), limit)
+    capacity = max(int(available / SAFETY / est["seconds_per_room"] * workers), 0)
+    keep = min(est["rooms"], capacity)
+    return {
+        "workers": workers,
+        "max_workers": limit,
+        "keep": keep,
+        "skip": est["rooms"] - keep,
+        "eta": keep * est["seconds_per_room"] / workers,  # 건너뛰지 않는 방 기준
+    }
+
+
+def prioritize(rows: List[Dict], previous: Optional[str]) -> List[Dict]:
+    """지난 결과가 없는 방 → 지난 분석이 오래된 방 순 (건너뛸 때는 뒤에서부터)"""
+    analyzed: Dict[str, str] = {}
+    if previous and os.path.exists(previous):
+        with open(previous, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                analyzed[row.get("rid", "")] = row.get("analysis_date") or ""
+    return sorted(
+        rows, key=lambda r: (r["rid"] in analyzed, analyzed.get(r["rid"], ""))
+    )
+
+
+def print_plan(res: Dict, search: Dict, naver: Dict, plan: Dict, deadline: datetime):
+    left = (deadline - datetime.now()).total_seconds()
+    print(f"🎯 마감: {deadline:%m-%d %H:%M} (남은 시간 {fmt(left)})")
+    print(
+        f"📐 예약 확인: 방 {res['rooms']:,}개 × {res['months']}개월 = {res['requests']:,} 요청 | "
+        f"응답 {res['latency'] * 1000:.0f}ms ({res['latency_source']}) | 방당 {res['seconds_per_room']:.2f}초"
+    )
+    print(
+        f"   작업자 1명 {fmt(res['seconds'])} → 작업자 {plan['workers']}명 (상한 {plan['max_workers']}명) "
+        f"예상 {fmt(plan['eta'])}"
+        + (f" (방 {plan['keep']:,}개 기준)" if plan["skip"] else "")
+    )
+    if plan["skip"]:
+        print(
+            f"   ⚠️ 상한으로도 부족 → 방 {plan['skip']:,}개 건너뜀 (지난 결과가 최근인 방부터)"
+        )
+    print(
+        f"📐 33m2 검색: 지역 {search['areas']} + 세분화 {search['requests'] - search['areas']} "
+        f"({search['subdivided_areas']}개 지역) = {search['requests']} 요청 | 예상 {fmt(search['seconds'])}"
+        + (" ⚠️ 마감 초과" if search["seconds"] > left else "")
+    )
+    if naver["pages"]:
+        print(
+            f"📐 네이버: 약 {naver['pages']:,} 페이지 ({os.path.basename(naver['last_file'])} 기준) | "
+            f"예상 {fmt(naver['seconds'])}"
+            + (" ⚠️ 마감 초과" if naver["seconds"] > left else "")
+        )
+    else:
+        print("📐 네이버: 지난 결과 없음 - 페이지 수 추정 불가")
+
+
+# 실행 중 조정 -----------------------------------------------------------------
+def seconds_per_room(spans: List[Tuple[str, int, float, float]]) -> Optional[float]:
+    """작업자별 첫 커밋 ~ 마지막 커밋 간격 / 그 사이 방 수 (로그인, 중간 투입 전, 끝난 뒤 대기 제외)"""
+    busy = sum(last - first for _, _, first, last in spans)
+    rooms = sum(n - 1 for _, n, _, _ in spans)
+    return busy / rooms if rooms > 0 and busy > 0 else None
+
+
+def run_reservation(
+    rows: List[Dict],
+    plan: Dict,
+    deadline: datetime,
+    db: str,
+    history: Dict,
+    output: str,
+    reset: bool = False,
+    ceiling: float = HOST_CEILING,
+):
+    q = WorkQueue(db)
+    unfinished, unexported = q.remaining(), q.unexported()
+    if (unfinished or unexported) and not reset:
+        q.close()
+        raise SystemExit(
+            f"⛔ {db} 에 이전 실행이 남아 있음 (남은 작업 {unfinished:,}개, export 안 된 결과 {unexported:,}개)\n"
+            f"   work_queue.py work / export 로 마무리하거나 --reset 으로 삭제 후 실행"
+        )
+    q.reset()
+    q.enqueue(rows)  # 우선순위 순서 = 큐 순서
+    q.skip_tail(plan["skip"])
+    t0 = time.time()
+    procs: List[multiprocessing.Process] = []
+
+    def spawn():
+        p = multiprocessing.Process(target=run_worker, args=(db, len(procs), ceiling))
+        p.start()
+        procs.append(p)
+
+    for _ in range(plan["workers"]):
+        spawn()
+    print(f"🚀 작업자 {len(procs)}명 시작")
+    try:
+        while any(p.is_alive() for p in procs):
+            time.sleep(CHECK_INTERVAL)
+            now = time.time()
+            left = deadline.timestamp() - now
+            remaining = q.remaining()
+            window = min(RATE_WINDOW, now - t0)
+            rate = q.done_since(now - window) / window if window > 0 else 0.0
+            needed = remaining / left if left > 0 else float("inf")
+            alive = sum(p.is_alive() for p in procs)
+            print(
+                f"\n📊 남은 방 {remaining:,} | 속도 {rate * 60:.1f}/분 (필요 {needed * 60:.1f}/분) | "
+                f"작업자 {alive}명 | 남은 시간 {fmt(left)}"
+            )
+            if not remaining or rate <= 0 or rate >= needed * BEHIND_RATIO:
+                continue
+            if alive < plan["max_workers"]:
+                spawn()
+                print(f"⏩ 뒤처짐 → 작업자 추가 ({alive + 1}명)")
+            else:
+                # 상한 도달 → 지금 속도로 끝낼 수 없는 만큼 꼬리 작업 건너뜀
+                excess = remaining - int(rate * max(left, 0) / SAFETY)
+                skipped = q.skip_tail(excess)
+                print(f"⏭️ 작업자 상한 → 방 {skipped:,}개 건너뜀")
+    except KeyboardInterrupt:
+        print("\n🛑 사용자 중단 - 작업자 종료 대기")
+    for p in procs:
+        p.join()
+
+    done = q.done_since(t0)
+    elapsed = time.time() - t0
+    per_room = seconds_per_room(q.worker_spans(t0))
+    if per_room:
+        # 다음 계획용: 작업자 1명 기준 방당 초
+        history["seconds_per_room"] = round(per_room, 3)
+        save_history(history)
+    print(f"\n✅ 완료 {done:,}개 | 소요 {fmt(elapsed)} | 상태 {q.counts()}")
+    export_results(q, output)
+    q.close()
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="마감 시간 기준 실행 계획")
+    parser.add_argument("cmd", choices=["plan", "run"])
+    parser.add_argument("--deadline", required=True, help="3h / 90m / 06:30")
+    parser.add_argument("--rooms", default=ROOM_CSV, help="예약 확인 입력 CSV")
+    parser.add_argument(
+        "--ceiling",
+        type=float,
+        default=HOST_CEILING,
+        help="33m2 호스트 요청 상한 (req/s, 전체 작업자 합계)",
+    )
+    parser.add_argument("--db", default=QUEUE_DB)
+    parser.add_argument("-o", "--output", default=OUTPUT_CSV, help="run 결과 CSV")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="큐 DB 에 남은 이전 작업/결과를 삭제하고 실행",
+    )
+    args = parser.parse_args()
+
+    deadline = parse_deadline(args.deadline)
+    history = load_history()
+    checker = load_script("samsam_reservation_check", "samsam-resevation-check.py")
+    crawler = load_script("samsam_crawler", "samsam-crawler.py")
+
+    rows = []
+    if os.path.exists(args.rooms):
+        with open(args.rooms, newline="", encoding="utf-8-sig") as f:
+            rows = [r for r in csv.DictReader(f) if r.get("rid")]
+    res = estimate_reservation(checker, len(rows), history)
+    available = (deadline - datetime.now()).total_seconds()
+    if available <= 0:
+        raise SystemExit(f"⛔ 마감 시간이 이미 지남: {deadline:%m-%d %H:%M}")
+    plan = plan_workers(res, available, args.ceiling)
+    print_plan(res, estimate_search(crawler), estimate_naver(), plan, deadline)
+
+    if args.cmd == "run":
+        if not rows:
+            raise SystemExit(f"❌ 입력 CSV 없음: {args.rooms}")
+        rows = prioritize(rows, checker.OUTPUT_FILE)
+        run_reservation(
+            rows,
+            plan,
+            deadline,
+            args.db,
+            history,
+            args.output,
+            args.reset,
+            args.ceiling,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ import time, random, json
 from datetime import datetime
 from typing import Dict, List, Set, Tuple
 import pandas as pd
-import httpx
 
+from profiling import profiled
+from rid_index import RidIndex
+from transport import create_client
 
 # ---- 설정 ----
 SEARCH_URL = "https://33m2.co.kr/app/room/search"
@@ -1104,10 +1106,11 @@ USER_AGENTS = [
 
 class MetropolitanCrawler:
     def __init__(self):
-        self.http_client = httpx.Client(timeout=30.0)
+        self.http_client, self.http_stats = create_client(timeout=30.0)
         self.all_fields_discovered = set()
         self.failed_areas = []
         self.total_processed = 0
+        self.rid_index = RidIndex()  # 지역 간 중복 rid 전역 관리
 
     def get_random_headers(self) -> Dict[str, str]:
         """랜덤 헤더 생성 (차단 방지)"""
@@ -1137,6 +1140,7 @@ class MetropolitanCrawler:
         time.sleep(delay)
         print(" ✓")
 
+    @profiled()
     def discover_fields(self, rooms: List[Dict]) -> Set[str]:
         """응답 데이터에서 모든 필드 발견"""
         discovered_fields = set()
@@ -1155,6 +1159,7 @@ class MetropolitanCrawler:
 
         return discovered_fields
 
+    @profiled()
     def flatten_room_data(self, room: Dict) -> Dict:
         """방 데이터를 평면화 (모든 중첩 필드 포함)"""
         try:
@@ -1176,6 +1181,7 @@ class MetropolitanCrawler:
             print(f"    ⚠️ 데이터 평면화 실패: {e}")
             return room
 
+    @profiled()
     def fetch_area_rooms(self, keyword: str, region_type: str = "normal") -> List[Dict]:
         """지역별 오피스텔&아파트 매물 수집"""
         self.http_client.headers.update(self.get_random_headers())
@@ -1254,13 +1260,7 @@ class MetropolitanCrawler:
 
         # 1000개 미만이면 그대로 반환
         if len(area_rooms) < 1000:
-            processed_rooms = []
-            for room in area_rooms:
-                flattened_room = self.flatten_room_data(room)
-                flattened_room["search_keyword"] = area
-                flattened_room["region_name"] = region_name
-                processed_rooms.append(flattened_room)
-            return processed_rooms
+            return self.collect_new_rooms(area_rooms, area, region_name)
 
         # 1000개 이상이면 세분화
         print(f"  🔄 {area} 세분화 시작...")
@@ -1272,33 +1272,33 @@ class MetropolitanCrawler:
             for subdivision in subdivisions:
                 sub_keyword = f"{area} {subdivision}"
                 sub_rooms = self.fetch_area_rooms(sub_keyword, region_type)
-
-                for room in sub_rooms:
-                    flattened_room = self.flatten_room_data(room)
-                    flattened_room["search_keyword"] = sub_keyword
-                    flattened_room["region_name"] = region_name
-                    all_rooms.append(flattened_room)
+                all_rooms.extend(
+                    self.collect_new_rooms(sub_rooms, sub_keyword, region_name)
+                )
 
                 # 세분화 간 딜레이
                 self.adaptive_delay(region_type)
         else:
             print(f"    ⚠️  {area} 세분화 정보 없음 - 원본 데이터 사용")
-            for room in area_rooms:
-                flattened_room = self.flatten_room_data(room)
-                flattened_room["search_keyword"] = area
-                flattened_room["region_name"] = region_name
-                all_rooms.append(flattened_room)
-
-        # 중복 제거 (rid 기준)
-        unique_rooms = {}
-        for room in all_rooms:
-            rid = room.get("rid")
-            if rid and rid not in unique_rooms:
-                unique_rooms[rid] = room
+            all_rooms = self.collect_new_rooms(area_rooms, area, region_name)
 
-        final_rooms = list(unique_rooms.values())
-        print(f"  ✅ {area} 최종: {len(final_rooms)}개 (중복 제거)")
-        return final_rooms
+        print(f"  ✅ {area} 최종: {len(all_rooms)}개 (중복 제거)")
+        return all_rooms
+
+    def collect_new_rooms(
+        self, rooms: List[Dict], keyword: str, region_name: str
+    ) -> List[Dict]:
+        """전역 rid 인덱스 기준으로 처음 보는 매물만 평면화하여 반환"""
+        new_rooms = []
+        for room in rooms:
+            rid = room.get("rid") if isinstance(room, dict) else None
+            if not rid or not self.rid_index.add(rid, keyword, region_name):
+                continue
+            flattened_room = self.flatten_room_data(room)
+            flattened_room["search_keyword"] = keyword
+            flattened_room["region_name"] = region_name
+            new_rooms.append(flattened_room)
+        return new_rooms
 
     def close(self):
         """리소스 정리"""
@@ -1309,13 +1309,18 @@ class MetropolitanCrawler:
             pass
 
 
-def save_results_complete(all_rooms: List[Dict]):
+@profiled()
+def save_results_complete(all_rooms: List[Dict], rid_index: RidIndex = None):
     """완전한 결과 저장"""
     try:
         if not all_rooms:
             print("❌ 저장할 데이터 없음")
             return
 
+        # rid 별 전체 발견 키워드/지역 기록 (search_keywords, region_names)
+        if rid_index is not None:
+            rid_index.annotate(all_rooms)
+
         df = pd.json_normalize(all_rooms)
 
         print(f"📊 발견된 총 필드 수: {len(df.columns)}개")
@@ -1437,7 +1442,7 @@ def main():
                     # 중간 저장 (10개 지역마다)
                     if current_count % 10 == 0:
                         print(f"\n    💾 중간 저장: {len(all_rooms):,}개 매물")
-                        save_results_complete(all_rooms)
+                        save_results_complete(all_rooms, crawler.rid_index)
 
                     # 지역 간 딜레이
                     if current_count < total_areas:
@@ -1472,6 +1477,8 @@ def main():
         print(f"\n\n📊 수집 완료!")
         print(f"🏙️ 처리 완료: {current_count}개 기초자치단체")
         print(f"🏢 총 매물 수: {len(all_rooms):,}개")
+        print(f"🔁 지역 간 중복 제거: {crawler.rid_index.duplicates:,}건")
+        print(crawler.http_stats.summary())
         print(f"📋 발견된 필드 수: {len(crawler.all_fields_discovered)}개")
         print(f"⏰ 총 소요시간: {int(total_time//60):02d}:{int(total_time%60):02d}")
 
@@ -1495,7 +1502,7 @@ def main():
                 print(f"  📍 {region}: {count:,}개")
 
         # 최종 저장
-        save_results_complete(all_rooms)
+        save_results_complete(all_rooms, crawler.rid_index)
 
         # 발견된 주요 필드 출력
         if crawler.all_fields_discovered:
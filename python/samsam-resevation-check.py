@@ -4,22 +4,20 @@
 33m2 월별 예약률 분석기a
 - 4주만 분석 (state 필드 포함, .env 관리)
 - 입력 CSV의 모든 필드를 결과 CSV 헤더에 그대로 반영
+- 빠른 시작: selenium/webdriver_manager 는 로그인할 때만 로드, 드라이버 경로와 SESSION 쿠키 캐시
+- 결과는 reservation_store/ 에 좁은 사실 행만 배치 저장, 끝날 때 넓은 결과 CSV 를 한 번 생성
+- 날짜별 상태를 schedule_pattern(28자)으로 보관 → 주중/주말·주차별·근/원거리 예약률 컬럼 (추가 요청 없음)
 """
-import time, random, os
+import csv, json, time, random, os
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Tuple, Set
-import pandas as pd
-import httpx
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
+from profiling import profiled
+from reservation_schema import ReservationStore
+from transport import create_client, pooled_headers
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+# selenium / webdriver_manager 는 브라우저 로그인이 필요할 때만 import (빠른 시작)
 
 
 # .env 로드 --------------------------------------------------------------------
@@ -39,10 +37,16 @@ OUTPUT_FILE = "room_reservation_4week_detailed.csv"
 
 
 RESERVED_STATUSES = {"disable", "booking"}
+# schedule_pattern 문자: 예약(booking) b, 호스트 차단(disable) d, 그 외 상태 0, 응답 없음 -
+STATUS_CODES = {"booking": "b", "disable": "d"}
+MISSING_CODE = "-"
 ROOM_DELAY_MIN, ROOM_DELAY_MAX = 0.2, 0.5
 MONTH_DELAY_MIN, MONTH_DELAY_MAX = 0.07, 0.15
 BATCH_SIZE = 30
 START_INDEX = 9700  # 재시작 인덱스
+DRIVER_CACHE_FILE = ".chromedriver_path"  # ChromeDriverManager 결과 경로 캐시
+SESSION_CACHE_FILE = ".session_cache.json"  # 로그인 SESSION 쿠키 재사용
+SESSION_MAX_AGE = 6 * 3600  # 초
 
 
 # 헤더 후보 --------------------------------------------------------------------
@@ -285,17 +289,30 @@ def get_4week_date_range() -> Tuple[date, date, List[str], List[Tuple[int, int]]
     return today, end_date, dates, months
 
 
+def schedule_pattern(dates: List[str], statuses: Dict[str, str]) -> str:
+    """분석 구간 날짜별 상태 → 한 글자씩 (occupancy_breakdown.py 에서 벡터 처리)"""
+    return "".join(
+        STATUS_CODES.get(statuses[d], "0") if d in statuses else MISSING_CODE
+        for d in dates
+    )
+
+
 # 주요 클래스 ------------------------------------------------------------------
 class StealthAnalyzer:
     def __init__(self):
         self.driver = None
         self.http = None
+        self.http_stats = None
         self.session_cookie = ""
         self.req_total = self.req_fail = 0
         self.last_req = 0.0
 
     # -------- 브라우저 초기화 -------------
     def setup_browser(self) -> bool:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
         opts = Options()
         opts.add_argument("--no-sandbox")
         opts.add_argument("--disable-dev-shm-usage")
@@ -310,9 +327,15 @@ class StealthAnalyzer:
         )
 
         try:
-            self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()), options=opts
-            )
+            try:
+                self.driver = webdriver.Chrome(
+                    service=Service(resolve_driver_path()), options=opts
+                )
+            except Exception:
+                # 캐시된 드라이버가 Chrome 버전과 안 맞으면 다시 받기
+                self.driver = webdriver.Chrome(
+                    service=Service(resolve_driver_path(refresh=True)), options=opts
+                )
             self.driver.execute_script(
                 "Object.defineProperty(navigator,'webdriver',{get:()=>undefined});"
                 "Object.defineProperty(navigator,'languages',{get:()=>['ko-KR','ko','en']});"
@@ -324,6 +347,10 @@ class StealthAnalyzer:
 
     # -------- 로그인 ---------------------
     def login(self) -> bool:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         self.driver.get(LOGIN_URL)
         time.sleep(random.uniform(1.0, 2.0))
         try:
@@ -351,10 +378,50 @@ class StealthAnalyzer:
         if not self.session_cookie:
             print("❌ SESSION 쿠키 미발견")
             return False
-        # httpx 클라이언트
-        self.http = httpx.Client(timeout=30.0, cookies={"SESSION": self.session_cookie})
+        with open(SESSION_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"SESSION": self.session_cookie, "saved": time.time()}, f)
+        self.open_http()
         return True
 
+    def open_http(self):
+        # httpx 클라이언트 (keep-alive 연결 풀, HTTP2=1 이면 HTTP/2)
+        self.http, self.http_stats = create_client(
+            timeout=30.0, cookies={"SESSION": self.session_cookie}
+        )
+
+    # -------- 세션 재사용 ----------------
+    def reuse_session(self, rid) -> bool:
+        """저장된 SESSION 쿠키가 아직 유효하면 브라우저 로그인 생략"""
+        if not os.path.exists(SESSION_CACHE_FILE):
+            return False
+        with open(SESSION_CACHE_FILE, encoding="utf-8") as f:
+            cached = json.load(f)
+        if time.time() - cached.get("saved", 0) > SESSION_MAX_AGE:
+            return False
+        self.session_cookie = cached["SESSION"]
+        self.open_http()
+        today = date.today()
+        try:
+            r = self.http.post(
+                SCHEDULE_URL,
+                data={
+                    "rid": str(rid),
+                    "year": str(today.year),
+                    "month": f"{today.month:02d}",
+                },
+                headers={
+                    "Referer": f"{BASE_URL}/room/detail/{rid}",
+                    "Origin": BASE_URL,
+                },
+            )
+            if r.status_code == 200 and r.json().get("error_code", 0) == 0:
+                return True
+        except Exception:
+            pass
+        self.http.close()
+        self.http = None
+        return False
+
     # -------- 레이트리밋 ------------------
     def _pace(self):
         now = time.time()
@@ -363,9 +430,11 @@ class StealthAnalyzer:
         self.last_req = time.time()
 
     # -------- 월간 스케줄 -----------------
-    def fetch_month(self, rid: int, y: int, m: int) -> Set[str]:
+    @profiled()
+    def fetch_month(self, rid: int, y: int, m: int) -> Dict[str, str]:
+        """{날짜: 상태} - 실패 시 빈 dict"""
         self._pace()
-        hdr = random.choice(BROWSER_HEADERS) | {
+        hdr = pooled_headers(random.choice(BROWSER_HEADERS)) | {
             "Accept": "application/json, text/javascript, */*; q=0.01",
             "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
             "Referer": f"{BASE_URL}/room/detail/{rid}",
@@ -377,45 +446,43 @@ class StealthAnalyzer:
             r = self.http.post(SCHEDULE_URL, data=payload, headers=hdr)
             if r.status_code != 200:
                 self.req_fail += 1
-                return set()
+                return {}
             js = r.json()
             if js.get("error_code", 0) != 0:
                 self.req_fail += 1
-                return set()
+                return {}
             return {
-                d["date"]
+                d["date"]: d.get("status") or ""
                 for d in js.get("schedule_list", [])
-                if d.get("status") in RESERVED_STATUSES
+                if d.get("date")
             }
         except Exception:
             self.req_fail += 1
-            return set()
+            return {}
 
     # -------- 4주 분석 --------------------
+    @profiled()
     def analyze_room(self, row: Dict) -> Dict:
         rid = row["rid"]
         t0, t1, dates, months = get_4week_date_range()
-        reserved = set()
+        statuses: Dict[str, str] = {}
         for y, m in months:
-            reserved |= self.fetch_month(rid, y, m)
+            statuses.update(self.fetch_month(rid, y, m))
             time.sleep(random.uniform(MONTH_DELAY_MIN, MONTH_DELAY_MAX))
+        reserved = {d for d, st in statuses.items() if st in RESERVED_STATUSES}
         occ = round(len([d for d in dates if d in reserved]) / len(dates) * 100, 2)
-        result = row.copy()  # 원본 필드 모두 포함
-        # 필드 누락 대비 default set
-        result.setdefault("state", "")
-        # 추가 분석 필드
-        result.update(
-            {
-                "analysis_start_date": str(t0),
-                "analysis_end_date": str(t1),
-                "occupancy_rate_percent": occ,
-                "total_reserved_days": len(reserved & set(dates)),
-                "total_days_analyzed": len(dates),
-                "months_analyzed": len(months),
-                "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            }
-        )
-        return result
+        # 분석 필드만 반환 (방 속성은 reservation_store 의 방 차원 테이블에 1회 저장)
+        return {
+            "rid": rid,
+            "analysis_start_date": str(t0),
+            "analysis_end_date": str(t1),
+            "occupancy_rate_percent": occ,
+            "total_reserved_days": len(reserved & set(dates)),
+            "total_days_analyzed": len(dates),
+            "months_analyzed": len(months),
+            "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "schedule_pattern": schedule_pattern(dates, statuses),
+        }
 
     # -------- 정리 -----------------------
     def close(self):
@@ -426,15 +493,32 @@ class StealthAnalyzer:
 
 
 # 헬퍼 -------------------------------------------------------------------------
+def resolve_driver_path(refresh: bool = False) -> str:
+    """ChromeDriverManager().install() 결과를 캐시 (버전 확인/네트워크 생략)"""
+    if not refresh and os.path.exists(DRIVER_CACHE_FILE):
+        with open(DRIVER_CACHE_FILE, encoding="utf-8") as f:
+            path = f.read().strip()
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+        f.write(path)
+    return path
+
+
+@profiled()
 def load_rooms() -> List[Dict]:
-    df = pd.read_csv(CSV_INPUT_FILE, dtype=str)  # 모든 필드 문자열로 우선 로드
-    # 숫자형 필드는 후처리할 수도 있음
-    return df.to_dict(orient="records")
+    # 모든 필드 문자열로 로드 (pandas 없이 csv 모듈 - 시작 시간 단축)
+    with open(CSV_INPUT_FILE, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
 
 
-def save_batch(df: pd.DataFrame, header: bool):
-    mode = "w" if header else "a"
-    df.to_csv(OUTPUT_FILE, mode=mode, header=header, index=False, encoding="utf-8-sig")
+@profiled()
+def save_batch(store: ReservationStore, rows: List[Dict], keys: Dict, snapshot: str):
+    # 좁은 사실 행만 추가 (넓은 CSV 는 종료 시 store.export 로 1회 생성)
+    store.add_facts(rows, keys, snapshot)
 
 
 def progress(
@@ -461,17 +545,25 @@ if __name__ == "__main__":
     total = len(rooms)
     print(f"📂 입력 CSV: {CSV_INPUT_FILE} | 방 수: {total:,}")
     analyzer = StealthAnalyzer()
-    if (
-        not analyzer.setup_browser()
-        or not analyzer.login()
-        or not analyzer.extract_session()
-    ):
-        analyzer.close()
-        raise SystemExit("⛔ 초기화 실패")
-    analyzer.driver.quit()
-
+    first_rid = rooms[START_INDEX]["rid"] if START_INDEX < total else None
+    if first_rid and analyzer.reuse_session(first_rid):
+        print("♻️ 저장된 세션 재사용 - 브라우저 로그인 생략")
+    else:
+        if (
+            not analyzer.setup_browser()
+            or not analyzer.login()
+            or not analyzer.extract_session()
+        ):
+            analyzer.close()
+            raise SystemExit("⛔ 초기화 실패")
+        analyzer.driver.quit()
+        analyzer.driver = None
+
+    # 같은 날 재시작하면 같은 스냅샷에 이어서 저장
+    store = ReservationStore()
+    snapshot = date.today().strftime("%y%m%d")
+    keys = store.add_rooms(rooms, snapshot)
     results = []
-    header_written = False
     start_ts = time.time()
 
     for idx, row in enumerate(rooms[START_INDEX:], START_INDEX + 1):
@@ -481,17 +573,14 @@ if __name__ == "__main__":
             progress(
                 idx,
                 total,
-                res["room_name"],
+                row.get("room_name", ""),
                 res["occupancy_rate_percent"],
                 res["total_reserved_days"],
                 res["total_days_analyzed"],
                 analyzer,
             )
             if len(results) >= BATCH_SIZE or idx == total:
-                df = pd.DataFrame(results)
-                # 첫 저장 때만 헤더
-                save_batch(df, not header_written)
-                header_written = True
+                save_batch(store, results, keys, snapshot)
                 results.clear()
                 print()  # 줄바꿈
             if idx < total:
@@ -503,5 +592,9 @@ if __name__ == "__main__":
             print(f"\n❌ {row.get('room_name','Unknown')} 오류:{e}")
             continue
 
+    save_batch(store, results, keys, snapshot)  # 중단 시 남은 배치
+    print("\n" + analyzer.http_stats.summary())
     analyzer.close()
-    print(f"\n✅ 완료! 결과 파일 → {OUTPUT_FILE}")
+    # 호환 뷰: 지도/후속 스크립트용 넓은 결과 CSV
+    rows_out = store.export(OUTPUT_FILE, snapshot)
+    print(f"\n✅ 완료! 결과 파일 → {OUTPUT_FILE} ({rows_out:,}행, 스냅샷 {snapshot})")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+room_YYMMDD.csv 일별 스냅샷 델타 저장소
+- 방 내용(요금/할인/플래그 등)은 rid 별 행 해시로 비교 → 첫날 전체(base) + 이후 날짜별 변경분만 저장
+  (I = 신규, U = 내용 변경, D = 사라짐)
+- 매번 바뀌는 크롤 정보(crawl_datetime/timestamp, 검색 키워드/지역)는 날짜별 발견 목록으로 따로 저장
+- CHECKPOINT_EVERY 일마다 전체 상태를 다시 저장 → 복원 시 가장 가까운 체크포인트 + 델타 몇 개만 적용
+- 두 날짜 사이 변경 내역은 델타 파일만 읽어서 계산 (전체 CSV 비교 없음)
+실행: python snapshot_store.py add ../next/public/room/room_250801.csv ../next/public/room/room_250803.csv
+      python snapshot_store.py show 250803 -o room_250803.csv
+      python snapshot_store.py diff 250801 250803
+"""
+
+import argparse, json, os, re, time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# 기본 설정 --------------------------------------------------------------------
+STORE_DIR = "room_store"
+KEY_COLUMN = "rid"
+HASH_COLUMN = "__hash"
+OP_COLUMN = "__op"
+CHANGED_COLUMN = "__changed"
+# 같은 방이라도 크롤마다 바뀌는 컬럼 → 내용 해시에서 제외
+OCCURRENCE_COLUMNS = [
+    "crawl_datetime",
+    "crawl_timestamp",
+    "search_keyword",
+    "region_name",
+    "search_keywords",
+    "region_names",
+]
+CHECKPOINT_EVERY = 7
+DAY_PATTERN = re.compile(r"(\d{6})")
+
+
+# 헬퍼 -------------------------------------------------------------------------
+def day_of(path: str) -> str:
+    match = DAY_PATTERN.search(os.path.basename(path))
+    if not match:
+        raise ValueError(f"파일명에서 날짜(YYMMDD)를 찾을 수 없음: {path}")
+    return match.group(1)
+
+
+def row_hashes(content: pd.DataFrame) -> pd.Series:
+    hashed = pd.util.hash_pandas_object(content.fillna(""), index=False)
+    return hashed.astype("uint64").map("{:016x}".format)
+
+
+def read_table(path: str) -> pd.DataFrame:
+    return pd.read_csv(
+        path, dtype=str, encoding="utf-8-sig", keep_default_na=False, na_values=[""]
+    )
+
+
+# 저장소 -----------------------------------------------------------------------
+class SnapshotStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.manifest = {"columns": [], "days": []}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    # 파일 위치
+    def file(self, kind: str, day: str) -> str:
+        return os.path.join(self.root, f"{kind}_{day}.csv.gz")
+
+    @property
+    def days(self) -> List[str]:
+        return [d["day"] for d in self.manifest["days"]]
+
+    def content_columns(self) -> List[str]:
+        return [c for c in self.manifest["columns"] if c not in OCCURRENCE_COLUMNS]
+
+    def save_manifest(self):
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+
+    # 복원
+    def state(self, day: str) -> pd.DataFrame:
+        """해당 날짜의 rid 별 내용 상태 (rid 인덱스, 내용 컬럼 + 해시)"""
+        if day not in self.days:
+            raise KeyError(f"저장소에 없는 날짜: {day}")
+        entries = self.manifest["days"][: self.days.index(day) + 1]
+        start = max(i for i, e in enumerate(entries) if e["checkpoint"])
+        state = read_table(self.file("base", entries[start]["day"]))
+        state = state.set_index(KEY_COLUMN)
+        for entry in entries[start + 1 :]:
+            delta = read_table(self.file("delta", entry["day"])).set_index(KEY_COLUMN)
+            ops = delta.pop(OP_COLUMN)
+            delta = delta.drop(columns=[CHANGED_COLUMN])
+            state = state.drop(index=delta.index, errors="ignore")
+            state = pd.concat([state, delta[ops != "D"]])
+        return state
+
+    def snapshot(self, day: str) -> pd.DataFrame:
+        """원본 room_YYMMDD.csv 와 같은 행 순서/컬럼의 전체 스냅샷"""
+        state = self.state(day).drop(columns=[HASH_COLUMN])
+        seen = read_table(self.file("seen", day))
+        full = seen.join(state, on=KEY_COLUMN, how="left")
+        return full.reindex(columns=self.manifest["columns"])
+
+    # 추가
+    def add(self, path: str) -> Optional[Dict]:
+        day = day_of(path)
+        if day in self.days:
+            return None
+        if self.days and day < self.days[-1]:
+            raise ValueError(f"{day} 는 마지막 저장일 {self.days[-1]} 보다 이전 날짜")
+
+        df = read_table(path)
+        if not self.manifest["columns"]:
+            self.manifest["columns"] = list(df.columns)
+        else:
+            extra = [c for c in df.columns if c not in self.manifest["columns"]]
+            self.manifest["columns"] += extra
+        content_cols = self.content_columns()
+        df = df.reindex(columns=self.manifest["columns"])
+
+        os.makedirs(self.root, exist_ok=True)
+        seen_cols = [KEY_COLUMN] + [c for c in OCCURRENCE_COLUMNS if c in df.columns]
+        df[seen_cols].to_csv(self.file("seen", day), index=False, encoding="utf-8-sig")
+
+        content = df[content_cols].drop_duplicates(subset=KEY_COLUMN, keep="last")
+        content = content.set_index(KEY_COLUMN)
+        content[HASH_COLUMN] = row_hashes(content).to_numpy()
+
+        entry = {
+            "day": day,
+            "source": os.path.basename(path),
+            "rows": len(df),
+            "rooms": len(content),
+        }
+        checkpoint = not self.days or len(self.days) % CHECKPOINT_EVERY == 0
+        if self.days:
+            prev = self.state(self.days[-1]).reindex(columns=content.columns)
+            delta = self.compute_delta(prev, content)
+            delta.reset_index().to_csv(
+                self.file("delta", day), index=False, encoding="utf-8-sig"
+            )
+            for op, key in [("I", "inserts"), ("U", "updates"), ("D", "deletes")]:
+                entry[key] = int((delta[OP_COLUMN] == op).sum())
+        else:
+            entry.update(inserts=len(content), updates=0, deletes=0)
+        if checkpoint:
+            content.reset_index().to_csv(
+                self.file("base", day), index=False, encoding="utf-8-sig"
+            )
+        entry["checkpoint"] = checkpoint
+        self.manifest["days"].append(entry)
+        self.save_manifest()
+        return entry
+
+    @staticmethod
+    def compute_delta(prev: pd.DataFrame, cur: pd.DataFrame) -> pd.DataFrame:
+        inserted = cur.index.difference(prev.index)
+        deleted = prev.index.difference(cur.index)
+        common = cur.index.intersection(prev.index)
+        changed = common[
+            prev.loc[common, HASH_COLUMN].to_numpy()
+            != cur.loc[common, HASH_COLUMN].to_numpy()
+        ]
+
+        # 변경된 방은 어떤 컬럼이 바뀌었는지 함께 기록
+        cols = [c for c in cur.columns if c != HASH_COLUMN]
+        old = prev.loc[changed, cols].fillna("")
+        new = cur.loc[changed, cols].fillna("")
+        diff = old.to_numpy() != new.to_numpy()
+        changed_cols = ["|".join(c for c, d in zip(cols, row) if d) for row in diff]
+
+        parts = [
+            cur.loc[inserted].assign(**{OP_COLUMN: "I", CHANGED_COLUMN: ""}),
+            cur.loc[changed].assign(**{OP_COLUMN: "U", CHANGED_COLUMN: changed_cols}),
+            pd.DataFrame(
+                {OP_COLUMN: "D", CHANGED_COLUMN: ""},
+                index=pd.Index(deleted, name=KEY_COLUMN),
+            ),
+        ]
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return pd.DataFrame(
+                columns=[OP_COLUMN, CHANGED_COLUMN] + list(cur.columns),
+                index=pd.Index([], name=KEY_COLUMN),
+            )
+        delta = pd.concat(parts)
+        return delta[[OP_COLUMN, CHANGED_COLUMN] + list(cur.columns)]
+
+    # 비교
+    def diff(self, d1: str, d2: str) -> pd.DataFrame:
+        """d1 → d2 사이 순변경: rid, change(inserted/updated/deleted), changed_columns"""
+        days = self.days
+        for d in (d1, d2):
+            if d not in days:
+                raise KeyError(f"저장소에 없는 날짜: {d}")
+        if days.index(d1) >= days.index(d2):
+            raise ValueError("diff 는 이전 날짜 → 이후 날짜 순서로 지정")
+
+        first_op: Dict[str, str] = {}
+        last_op: Dict[str, str] = {}
+        columns: Dict[str, set] = {}
+        for day in days[days.index(d1) + 1 : days.index(d2) + 1]:
+            delta = read_table(self.file("delta", day))
+            for rid, op, changed in zip(
+                delta[KEY_COLUMN], delta[OP_COLUMN], delta[CHANGED_COLUMN].fillna("")
+            ):
+                first_op.setdefault(rid, op)
+                last_op[rid] = op
+                if changed:
+                    columns.setdefault(rid, set()).update(changed.split("|"))
+
+        rows = []
+        for rid, first in first_op.items():
+            last = last_op[rid]
+            if first == "I" and last == "D":
+                continue  # 기간 중에 생겼다가 사라짐
+            if first == "I":
+                change = "inserted"
+            elif last == "D":
+                change = "deleted"
+            else:
+                change = "updated"  # D 후 재등장(I)도 내용 변경으로 취급
+            rows.append((rid, change, "|".join(sorted(columns.get(rid, ())))))
+        return pd.DataFrame(rows, columns=[KEY_COLUMN, "change", "changed_columns"])
+
+    def disk_bytes(self) -> int:
+        return sum(
+            os.path.getsize(os.path.join(self.root, f)) for f in os.listdir(self.root)
+        )
+
+
+# 메인 -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="room 스냅샷 델타 저장소")
+    parser.add_argument("--store", default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="room_YYMMDD.csv 추가 (날짜 순서대로)")
+    add.add_argument("csvs", nargs="+")
+    show = sub.add_parser("show", help="특정 날짜 전체 스냅샷 복원")
+    show.add_argument("day")
+    show.add_argument("-o", "--output")
+    diff = sub.add_parser("diff", help="두 날짜 사이 변경 내역")
+    diff.add_argument("d1")
+    diff.add_argument("d2")
+    diff.add_argument("-o", "--output")
+    sub.add_parser("stats", help="날짜별 변경량")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    t0 = time.time()
+    if args.command == "add":
+        raw_bytes = 0
+        for path in sorted(args.csvs, key=day_of):
+            entry = store.add(path)
+            if entry is None:
+                print(f"⏭️ {os.path.basename(path)} 이미 저장됨")
+                continue
+            raw_bytes += os.path.getsize(path)
+            print(
+                f"➕ {entry['day']}: 방 {entry['rooms']:,}개 | 신규 {entry['inserts']:,} / 변경 {entry['updates']:,} / 삭제 {entry['deletes']:,}"
+            )
+        print(
+            f"💾 저장소 {store.disk_bytes() / 1024:,.0f}KB | 스냅샷 {len(store.days)}일 → {args.store}"
+        )
+    elif args.command == "show":
+        df = store.snapshot(args.day)
+        output = args.output or f"room_{args.day}.csv"
+        df.to_csv(output, index=False, encoding="utf-8-sig")
+        print(f"📄 {args.day}: {len(df):,}행 복원 → {output}")
+    elif args.command == "diff":
+        changes = store.diff(args.d1, args.d2)
+        counts = changes["change"].value_counts()
+        print(
+            f"🔀 {args.d1} → {args.d2}: "
+            + ", ".join(f"{k} {v:,}" for k, v in counts.items())
+        )
+        columns = changes["changed_columns"].str.split("|").explode()
+        top = columns[columns != ""].value_counts().head(10)
+        for col, n in top.items():
+            print(f"  ✏️ {col}: {n:,}개")
+        if args.output:
+            changes.to_csv(args.output, index=False, encoding="utf-8-sig")
+            print(f"📁 저장 위치: {args.output}")
+    else:
+        for e in store.manifest["days"]:
+            mark = "📌" if e["checkpoint"] else "  "
+            print(
+                f"{mark} {e['day']} {e['source']}: 방 {e['rooms']:,} | +{e['inserts']:,} ~{e['updates']:,} -{e['deletes']:,}"
+            )
+    print(f"⏱️ 소요 시간: {time.time() - t0:.2f}초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+세 크롤러 공용 HTTP 전송 계층 (httpx 연결 풀)
+- keep-alive 연결 풀 (max_connections / keepalive_expiry 조정) → 요청마다 TCP+TLS 핸드셰이크 반복 방지
+- 헤더 프로필의 "Connection: close" 등 hop-by-hop 헤더 제거 (요청 속도/헤더 회전은 그대로)
+- HTTP/2 다중화는 선택 사항: h2 패키지가 있으면 사용, 없으면 HTTP/1.1 keep-alive
+- httpcore trace 이벤트로 요청마다 새 연결/재사용 여부와 응답 헤더까지 지연 시간 집계
+사용: client, stats = create_client(cookies={...}) ... print(stats.summary())
+      HTTP2=1 python samsam-resevation-check.py
+"""
+
+import importlib.util, os, threading, time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+# 기본 설정 --------------------------------------------------------------------
+MAX_CONNECTIONS = 10
+MAX_KEEPALIVE = 5
+KEEPALIVE_EXPIRY = 60.0  # 초 - 방 사이 딜레이보다 넉넉하게
+TIMEOUT = 30.0
+USE_HTTP2 = os.getenv("HTTP2", "0") == "1"  # HTTP2=1 로 실행하면 HTTP/2 시도
+# 연결 재사용을 막는 hop-by-hop 헤더 (httpx 가 직접 관리)
+HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "upgrade"}
+
+
+# 통계 -------------------------------------------------------------------------
+class TransportStats:
+    """요청 수, 새 연결 수(TCP/TLS), 응답 헤더까지 지연 시간"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.http2_requests = 0
+        self.latencies: List[float] = []
+
+    def tracer(self):
+        """요청 1건용 trace 콜백 (httpx request.extensions['trace'])"""
+        start = time.perf_counter()
+
+        def trace(event: str, info: Dict):
+            if event == "connection.connect_tcp.complete":
+                with self.lock:
+                    self.new_connections += 1
+            elif event == "connection.start_tls.complete":
+                with self.lock:
+                    self.tls_handshakes += 1
+            elif event.endswith("receive_response_headers.complete"):
+                elapsed = time.perf_counter() - start
+                with self.lock:
+                    self.requests += 1
+                    self.latencies.append(elapsed)
+                    if event.startswith("http2."):
+                        self.http2_requests += 1
+
+        return trace
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def as_dict(self) -> Dict:
+        lat = sorted(self.latencies)
+        pick = lambda q: round(lat[int(q * (len(lat) - 1))] * 1000, 1) if lat else None
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": self.reused,
+            "reuse_rate": round(self.reused / self.requests, 3) if self.requests else 0,
+            "http2_requests": self.http2_requests,
+            "latency_p50_ms": pick(0.5),
+            "latency_p95_ms": pick(0.95),
+        }
+
+    def summary(self) -> str:
+        s = self.as_dict()
+        return (
+            f"🔌 요청 {s['requests']:,} | 새 연결 {s['new_connections']:,} (TLS {s['tls_handshakes']:,}) | "
+            f"재사용 {s['reuse_rate'] * 100:.1f}% | HTTP/2 {s['http2_requests']:,} | "
+            f"지연 p50 {s['latency_p50_ms']}ms / p95 {s['latency_p95_ms']}ms"
+        )
+
+
+# 클라이언트 -------------------------------------------------------------------
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def pooled_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """헤더 프로필에서 연결 재사용을 막는 hop-by-hop 헤더 제거"""
+    return {k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS}
+
+
+def create_client(
+    http2: Optional[bool] = None,
+    max_connections: int = MAX_CONNECTIONS,
+    max_keepalive: int = MAX_KEEPALIVE,
+    keepalive_expiry: float = KEEPALIVE_EXPIRY,
+    timeout: float = TIMEOUT,
+    stats: Optional[TransportStats] = None,
+    **kwargs,
+) -> Tuple[httpx.Client, TransportStats]:
+    """연결 풀 + 재사용 통계가 붙은 httpx.Client"""
+    http2 = USE_HTTP2 if http2 is None else http2
+    if http2 and not http2_available():
+        print(
+            "⚠️ h2 패키지 없음 - HTTP/1.1 keep-alive 로 진행 (pip install 'httpx[http2]')"
+        )
+        http2 = False
+    stats = stats or TransportStats()
+
+    def attach_trace(request: httpx.Request):
+        request.extensions["trace"] = stats.tracer()
+        for name in list(request.headers):
+            if name.lower() in HOP_HEADERS:
+                del request.headers[name]
+
+    client = httpx.Client(
+        http2=http2,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        event_hooks={"request": [attach_trace]},
+        **kwargs,
+    )
+    return client, stats
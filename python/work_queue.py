@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+예약률 확인 작업 큐 (SQLite WAL + 임대(lease) 방식, 여러 작업자 프로세스)
+- init: 입력 CSV 의 방(rid)을 큐에 등록 (이미 있는 rid 는 건너뜀 → 중단 후 재등록해도 안전)
+- work: 작업자 프로세스 N개 실행, 각자 브라우저 로그인으로 자기 SESSION 을 받아 analyze_room 수행
+- 작업자는 LEASE_BATCH 개씩 임대(lease_until = 지금 + LEASE_TTL) → 방마다 임대 연장 → 결과 커밋
+- 작업자가 죽으면 임대가 만료되어 다른 작업자가 다시 가져감, 실패는 MAX_ATTEMPTS 까지 재시도
+- 요청 예산: 모든 작업자가 요청 전에 DB 의 다음 요청 시각을 예약 → 작업자 수와 관계없이 합계 --max-rps 이하
+- WAL 은 같은 호스트의 프로세스 간 동시 접근용 (네트워크 파일시스템 위 공유는 지원하지 않음)
+실행: python work_queue.py init deduplicated_samsam_room_data.csv
+      python work_queue.py work -w 3 --max-rps 4
+      python work_queue.py status / export -o room_reservation_4week_detailed.csv
+"""
+
+import argparse, csv, json, multiprocessing, os, random, socket, sqlite3, time
+from typing import Dict, List, Tuple
+
+from reservation_schema import wide_row
+
+# 기본 설정 --------------------------------------------------------------------
+QUEUE_DB = "reservation_queue.db"
+INPUT_CSV = "deduplicated_samsam_room_data.csv"
+OUTPUT_CSV = "room_reservation_4week_detailed.csv"
+WORKERS = 2
+LEASE_BATCH = 5
+LEASE_TTL = 120.0  # 초 - 방 5개 확인(딜레이 포함)보다 넉넉하게
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 5.0  # 남은 작업이 모두 다른 작업자에게 임대 중일 때 대기
+MAX_CONSECUTIVE_FAILS = 5  # 연속 실패 시 세션 만료로 보고 작업자 종료
+MAX_RPS = 4.0  # 33m2 요청 상한 (req/s) - 같은 큐 DB 를 쓰는 모든 작업자 합계
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    rid TEXT UNIQUE NOT NULL,
+    row_json TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending / leased / done / failed / skipped
+    worker TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, lease_until);
+CREATE TABLE IF NOT EXISTS results (
+    rid TEXT PRIMARY KEY,
+    result_json TEXT NOT NULL,
+    worker TEXT,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL);
+"""
+
+
+# 큐 ---------------------------------------------------------------------------
+class WorkQueue:
+    def __init__(self, path: str = QUEUE_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, sql: str, params=()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, params)
+
+    def enqueue(self, rows: List[Dict]) -> int:
+        now = time.time()
+        self._write("BEGIN IMMEDIATE")
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO tasks (rid, row_json, updated) VALUES (?, ?, ?)",
+            (
+                (str(r["rid"]), json.dumps(r, ensure_ascii=False), now)
+                for r in rows
+                if r.get("rid")
+            ),
+        )
+        added = self.conn.total_changes - before
+        self._write("COMMIT")
+        return added
+
+    def reset(self):
+        self._write("BEGIN IMMEDIATE")
+        self._write("DELETE FROM tasks")
+        self._write("DELETE FROM results")
+        self._write("DELETE FROM meta")
+        self._write("COMMIT")
+
+    def lease(
+        self, worker: str, n: int = LEASE_BATCH, ttl: float = LEASE_TTL
+    ) -> List[Tuple[str, Dict]]:
+        """대기 중이거나 임대가 만료된 작업 n개를 이 작업자에게 임대"""
+        now = time.time()
+        self._write("BEGIN IMMEDIATE")  # 쓰기 잠금 → 작업자 간 중복 임대 방지
+        try:
+            # 마지막 시도 중에 작업자가 죽은 작업 → 다시 임대할 수 없으므로 failed
+            self._write(
+                """UPDATE tasks SET status = 'failed', lease_until = NULL,
+                   error = COALESCE(error, 'lease expired'), updated = ?
+                   WHERE status = 'leased' AND lease_until < ? AND attempts >= ?""",
+                (now, now, MAX_ATTEMPTS),
+            )
+            rows = self.conn.execute(
+                """SELECT seq, rid, row_json FROM tasks
+                   WHERE (status = 'pending' OR (status = 'leased' AND lease_until < ?))
+                     AND attempts < ?
+                   ORDER BY seq LIMIT ?""",
+                (now, MAX_ATTEMPTS, n),
+            ).fetchall()
+            self.conn.executemany(
+                """UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?,
+                   attempts = attempts + 1, updated = ? WHERE seq = ?""",
+                [(worker, now + ttl, now, seq) for seq, _, _ in rows],
+            )
+            self._write("COMMIT")
+        except Exception:
+            self._write("ROLLBACK")
+            raise
+        return [(rid, json.loads(row_json)) for _, rid, row_json in rows]
+
+    def renew(self, worker: str, rids: List[str], ttl: float = LEASE_TTL):
+        now = time.time()
+        self.conn.executemany(
+            """UPDATE tasks SET lease_until = ?, updated = ?
+               WHERE rid = ? AND worker = ? AND status = 'leased'""",
+            [(now + ttl, now, rid, worker) for rid in rids],
+        )
+
+    def complete(self, worker: str, rid: str, result: Dict) -> bool:
+        """임대를 가진 작업자만 커밋 (만료 후 다른 작업자가 가져갔으면 버림)"""
+        now = time.time()
+        self._write("BEGIN IMMEDIATE")
+        cur = self._write(
+            """UPDATE tasks SET status = 'done', lease_until = NULL, error = NULL, updated = ?
+               WHERE rid = ? AND worker = ? AND status = 'leased'""",
+            (now, rid, worker),
+        )
+        if cur.rowcount:
+            self._write(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (rid, json.dumps(result, ensure_ascii=False), worker, now),
+            )
+        self._write("COMMIT")
+        return bool(cur.rowcount)
+
+    def release(self, worker: str, rid: str, error: str):
+        """실패 → 다시 대기열로 (시도 횟수 초과 시 failed)"""
+        self._write(
+            """UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+               lease_until = NULL, error = ?, updated = ?
+               WHERE rid = ? AND worker = ? AND status = 'leased'""",
+            (MAX_ATTEMPTS, error[:200], time.time(), rid, worker),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        now = time.time()
+        rows = self.conn.execute(
+            """SELECT CASE WHEN status = 'leased' AND lease_until < ? AND attempts >= ?
+                                THEN 'failed'
+                           WHEN status = 'leased' AND lease_until < ? THEN 'expired'
+                           ELSE status END, COUNT(*)
+               FROM tasks GROUP BY 1""",
+            (now, MAX_ATTEMPTS, now),
+        ).fetchall()
+        return dict(rows)
+
+    def remaining(self) -> int:
+        """아직 결과가 나올 수 있는 작업 (마지막 시도 중인 임대 포함, 만료되면 제외)"""
+        return self.conn.execute(
+            """SELECT COUNT(*) FROM tasks
+               WHERE (status = 'pending' AND attempts < ?)
+                  OR (status = 'leased' AND (attempts < ? OR lease_until >= ?))""",
+            (MAX_ATTEMPTS, MAX_ATTEMPTS, time.time()),
+        ).fetchone()[0]
+
+    def skip_tail(self, n: int) -> int:
+        """대기열 뒤쪽(우선순위 낮은) 작업 n개를 skipped 로 표시 (마감 시간 부족 시)"""
+        if n <= 0:
+            return 0
+        cur = self._write(
+            """UPDATE tasks SET status = 'skipped', updated = ? WHERE seq IN (
+                   SELECT seq FROM tasks WHERE status = 'pending' ORDER BY seq DESC LIMIT ?)""",
+            (time.time(), n),
+        )
+        return cur.rowcount
+
+    def done_since(self, since: float) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM results WHERE finished >= ?", (since,)
+        ).fetchone()[0]
+
+    def worker_spans(self, since: float) -> List[Tuple[str, int, float, float]]:
+        """작업자별 (완료 수, 첫 커밋, 마지막 커밋) - 로그인/대기 시간 제외한 처리 구간"""
+        return self.conn.execute(
+            """SELECT worker, COUNT(*), MIN(finished), MAX(finished) FROM results
+               WHERE finished >= ? GROUP BY worker""",
+            (since,),
+        ).fetchall()
+
+    def workers(self) -> List[Tuple[str, int, float]]:
+        """작업자별 완료 수 / 마지막 커밋 시각"""
+        return self.conn.execute(
+            "SELECT worker, COUNT(*), MAX(finished) FROM results GROUP BY worker ORDER BY 2 DESC"
+        ).fetchall()
+
+    def mark_exported(self):
+        self._write(
+            "INSERT OR REPLACE INTO meta VALUES ('exported', ?)", (time.time(),)
+        )
+
+    def reserve_request(self, interval: float) -> float:
+        """공용 요청 예산: 다음 요청 시각을 예약하고 그때까지 기다릴 초를 반환"""
+        now = time.time()
+        self._write("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'next_request'"
+            ).fetchone()
+            slot = max(now, row[0] if row else 0.0)
+            self._write(
+                "INSERT OR REPLACE INTO meta VALUES ('next_request', ?)",
+                (slot + interval,),
+            )
+            self._write("COMMIT")
+        except Exception:
+            self._write("ROLLBACK")
+            raise
+        return slot - now
+
+    def unexported(self) -> int:
+        """마지막 export 이후 커밋된 결과 수"""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'exported'"
+        ).fetchone()
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM results WHERE finished > ?", (row[0] if row else 0,)
+        ).fetchone()[0]
+
+    def results(self) -> List[Dict]:
+        """입력 방 행 + 분석 필드 → 기존 넓은 reservation 행"""
+        rows = self.conn.execute(
+            """SELECT t.row_json, r.result_json FROM results r JOIN tasks t ON t.rid = r.rid
+               ORDER BY t.seq"""
+        ).fetchall()
+        return [wide_row(json.loads(row), json.loads(res)) for row, res in rows]
+
+
+# 작업자 -----------------------------------------------------------------------
+def worker_id(index: int) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:w{index}"
+
+
+def run_worker(db_path: str, index: int, max_rps: float = MAX_RPS):
+    """작업자 프로세스 1개: 자기 세션으로 로그인 → 임대 → analyze_room → 커밋"""
+    from pipeline import load_script
+
+    checker = load_script("samsam_reservation_check", "samsam-resevation-check.py")
+    # 작업자마다 세션 캐시 파일 분리 → 각자 다른 SESSION 쿠키 사용
+    checker.SESSION_CACHE_FILE = f".session_cache_w{index}.json"
+    me = worker_id(index)
+    q = WorkQueue(db_path)
+    analyzer = checker.StealthAnalyzer()
+
+    # 요청마다 공용 예산에서 시각 예약 후 기존 작업자별 간격(_pace)도 유지
+    own_pace = analyzer._pace
+
+    def shared_pace():
+        wait = q.reserve_request(1.0 / max_rps)
+        if wait > 0:
+            time.sleep(wait)
+        own_pace()
+
+    analyzer._pace = shared_pace
+
+    first = q.conn.execute(
+        "SELECT rid FROM tasks WHERE status != 'done' ORDER BY seq LIMIT 1"
+    ).fetchone()
+    if first and analyzer.reuse_session(first[0]):
+        print(f"♻️ [{me}] 저장된 세션 재사용")
+    else:
+        if (
+            not analyzer.setup_browser()
+            or not analyzer.login()
+            or not analyzer.extract_session()
+        ):
+            analyzer.close()
+            q.close()
+            print(f"⛔ [{me}] 로그인 실패 - 종료")
+            return
+        analyzer.driver.quit()
+        analyzer.driver = None
+
+    done = fails = 0
+    try:
+        while fails < MAX_CONSECUTIVE_FAILS:
+            batch = q.lease(me)
+            if not batch:
+                if q.remaining() == 0:
+                    break
+                time.sleep(POLL_INTERVAL)  # 남은 작업은 다른 작업자가 임대 중
+                continue
+            pending = [rid for rid, _ in batch]
+            for rid, row in batch:
+                if fails >= MAX_CONSECUTIVE_FAILS:
+                    break  # 남은 임대는 finally 에서 반환
+                q.renew(me, pending)
+                req_fail = analyzer.req_fail
+                try:
+                    res = analyzer.analyze_room(row)
+                except Exception as e:
+                    q.release(me, rid, str(e))
+                    fails += 1
+                    continue
+                finally:
+                    pending.remove(rid)
+                if analyzer.req_fail - req_fail >= res["months_analyzed"]:
+                    # 모든 월 요청 실패 → 0% 결과 대신 재시도 (세션 만료/차단 가능성)
+                    q.release(me, rid, "스케줄 요청 실패")
+                    fails += 1
+                    continue
+                fails = 0
+                if q.complete(me, rid, res):
+                    done += 1
+                print(
+                    f"🏠 [{me}] {done:,}개 | {str(row.get('room_name', ''))[:25]:<25} | "
+                    f"4주:{res['occupancy_rate_percent']:5.1f}%",
+                    flush=True,
+                )
+                time.sleep(
+                    random.uniform(checker.ROOM_DELAY_MIN, checker.ROOM_DELAY_MAX)
+                )
+        if fails >= MAX_CONSECUTIVE_FAILS:
+            print(f"\n⛔ [{me}] 연속 {fails}회 실패 - 세션 만료로 보고 종료")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # 남은 임대는 즉시 반환 (만료까지 기다리지 않도록)
+        q.conn.execute(
+            """UPDATE tasks SET status = 'pending', lease_until = NULL, attempts = attempts - 1
+               WHERE worker = ? AND status = 'leased'""",
+            (me,),
+        )
+        print(
+            f"\n✅ [{me}] 완료 {done:,}개 | {analyzer.http_stats.summary() if analyzer.http_stats else ''}"
+        )
+        analyzer.close()
+        q.close()
+
+
+# 메인 -------------------------------------------------------------------------
+def load_csv(path: str) -> List[Dict]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+def print_status(q: WorkQueue):
+    counts = q.counts()
+    total = sum(counts.values())
+    print(
+        f"📋 전체 {total:,} | "
+        + " | ".join(f"{k} {v:,}" for k, v in sorted(counts.items()))
+    )
+    for worker, n, last in q.workers():
+        print(
+            f"  👷 {worker:<40} {n:>7,}개  마지막 {time.strftime('%m-%d %H:%M:%S', time.localtime(last))}"
+        )
+
+
+def export_results(q: WorkQueue, output: str) -> int:
+    """완료 결과 → 넓은 reservation CSV (세부 분해 컬럼 포함)"""
+    from occupancy_breakdown import add_breakdown_rows
+
+    results = add_breakdown_rows(q.results())
+    fieldnames = list(dict.fromkeys(k for r in results for k in r))
+    with open(output, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(results)
+    q.mark_exported()
+    print(f"📁 {len(results):,}개 결과 → {output}")
+    missing = {k: v for k, v in q.counts().items() if k != "done" and v}
+    if missing:
+        print(f"⚠️ 결과 없는 방: {missing}")
+    return len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예약률 확인 작업 큐")
+    parser.add_argument("--db", default=QUEUE_DB)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_init = sub.add_parser("init", help="입력 CSV 의 방을 큐에 등록")
+    p_init.add_argument("csv", nargs="?", default=INPUT_CSV)
+    p_init.add_argument(
+        "--reset", action="store_true", help="기존 작업/결과 삭제 후 등록"
+    )
+    p_work = sub.add_parser("work", help="작업자 프로세스 실행")
+    p_work.add_argument("-w", "--workers", type=int, default=WORKERS)
+    p_work.add_argument(
+        "--offset", type=int, default=0, help="작업자 번호 시작값 (세션 캐시 파일 구분)"
+    )
+    p_work.add_argument(
+        "--max-rps",
+        type=float,
+        default=MAX_RPS,
+        help="전체 작업자 합계 요청 상한 (req/s)",
+    )
+    sub.add_parser("status")
+    p_export = sub.add_parser("export", help="결과를 예약률 CSV 로 저장")
+    p_export.add_argument("-o", "--output", default=OUTPUT_CSV)
+    args = parser.parse_args()
+
+    q = WorkQueue(args.db)
+    if args.cmd == "init":
+        if args.reset:
+            q.reset()
+        rows = load_csv(args.csv)
+        added = q.enqueue(rows)
+        print(f"📥 {args.csv}: {len(rows):,}행 → 새 작업 {added:,}개")
+        print_status(q)
+    elif args.cmd == "work":
+        t0 = time.time()
+        q.close()
+        procs = [
+            multiprocessing.Process(
+                target=run_worker, args=(args.db, i, args.max_rps), name=f"worker-{i}"
+            )
+            for i in range(args.offset, args.offset + args.workers)
+        ]
+        for p in procs:
+            p.start()
+        try:
+            for p in procs:
+                p.join()
+        except KeyboardInterrupt:
+            print("\n🛑 사용자 중단 - 작업자 종료 대기")
+            for p in procs:
+                p.join()
+        q = WorkQueue(args.db)
+        elapsed = time.time() - t0
+        print(f"\n⏰ 총 소요시간: {int(elapsed // 60):02d}:{int(elapsed % 60):02d}")
+        print_status(q)
+    elif args.cmd == "status":
+        print_status(q)
+    elif args.cmd == "export":
+        export_results(q, args.output)
+    q.close()
+
+
+if __name__ == "__main__":
+    main()